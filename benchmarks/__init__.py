@@ -0,0 +1,8 @@
+""" benchmarks/__init__.py
+
+    Offline benchmarks for the API client. Run a benchmark as a module from
+    the repository root, e.g.:
+
+        python -m benchmarks.bench_connection_pool
+
+"""
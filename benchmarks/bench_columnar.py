@@ -0,0 +1,78 @@
+""" benchmarks/bench_columnar.py
+
+    Compares converting a decoded daily time series to NumPy columns row by
+    row (float() and a date parse per value) with the vectorized conversion
+    in client/columnar.py.
+
+    Usage:
+        python -m benchmarks.bench_columnar [bars]
+
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy
+
+from client.columnar import series_columns, series_frame, pandas
+
+FIELDS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+ROUNDS = 20
+
+
+def make_series(bars):
+    """ Returns a "Time Series (Daily)" dict of `bars` days, newest first. """
+    rng = random.Random(0)
+    first = date(2025, 5, 16)
+    series = {}
+    for day in range(bars):
+        price = 100 + rng.random() * 50
+        series[(first - timedelta(days=day)).isoformat()] = {
+            "1. open": f"{price:.4f}",
+            "2. high": f"{price * 1.01:.4f}",
+            "3. low": f"{price * 0.99:.4f}",
+            "4. close": f"{price * 1.002:.4f}",
+            "5. volume": str(rng.randrange(1_000_000, 9_000_000)),
+        }
+    return series
+
+
+def naive_columns(series):
+    """ Row-by-row conversion through Python dicts and lists. """
+    timestamps = []
+    values = {key: [] for key in FIELDS}
+    for day in sorted(series):
+        timestamps.append(numpy.datetime64(date.fromisoformat(day), "D"))
+        bar = series[day]
+        for key in FIELDS:
+            values[key].append(float(bar[key]))
+    columns = {"timestamp": numpy.array(timestamps, dtype="datetime64[D]")}
+    for key in FIELDS:
+        columns[key.split(". ")[1]] = numpy.array(values[key])
+    return columns
+
+
+def timed(fn, series):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(series)
+    return (time.perf_counter() - start) / ROUNDS * 1000  # ms per series
+
+
+def main(bars=5000):
+    series = make_series(bars)
+    naive = naive_columns(series)
+    vectorized = series_columns(series)
+    assert all(numpy.array_equal(naive[name], vectorized[name])
+               for name in naive)
+
+    print(f"converting a {bars}-bar series to columns, ms per series")
+    print(f"  naive      {timed(naive_columns, series):8.2f}")
+    print(f"  vectorized {timed(series_columns, series):8.2f}")
+    if pandas is not None:
+        print(f"  DataFrame  {timed(series_frame, series):8.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,52 @@
+""" benchmarks/bench_connection_pool.py
+
+    Compares per-request latency with a pooled keep-alive session against a
+    fresh connection per call, using the local stand-in server.
+
+    The stand-in speaks plain HTTP on loopback, so the gap measured here is
+    only the TCP handshake; against BASE_URL every fresh connection also pays
+    a TLS handshake and the difference is much larger.
+
+    Usage:
+        python -m benchmarks.bench_connection_pool [requests]
+
+"""
+import statistics
+import sys
+import time
+
+from benchmarks.bench_load import percentile
+from benchmarks.stand_in_server import StandInServer
+from client.alpha_vantage_client import AlphaVantageClient
+
+
+def measure(client, requests_count):
+    """ Returns per-request latencies in milliseconds. """
+    latencies = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p99 = percentile(latencies, 0.99)
+    print(f"{label:<12} mean {statistics.mean(latencies):7.3f} ms  "
+          f"p50 {statistics.median(latencies):7.3f} ms  p99 {p99:7.3f} ms")
+
+
+def main(requests_count=500):
+    with StandInServer() as server:
+        with AlphaVantageClient(
+                "demo", base_url=server.url, keep_alive=False) as client:
+            measure(client, 10)  # Warm-up.
+            report("no pooling", measure(client, requests_count))
+        with AlphaVantageClient("demo", base_url=server.url) as client:
+            measure(client, 10)
+            report("pooled", measure(client, requests_count))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,59 @@
+""" benchmarks/bench_import.py
+
+    Measures the startup cost of the client: wall time of a fresh
+    interpreter importing each module, minus a bare interpreter, and which
+    heavy dependencies the import pulls in. Those should only load on first
+    use (see LAZY_DEPENDENCIES).
+
+    Usage:
+        python -m benchmarks.bench_import [runs]
+
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = (
+    "client.alpha_vantage_client",
+    "client.__main__",
+    "client.async_alpha_vantage_client",
+)
+# Imported only when a feature needs them.
+LAZY_DEPENDENCIES = ("requests", "urllib3", "numpy", "pandas", "orjson",
+                     "aiohttp")
+
+_PROBE = ("import sys, {module}; "
+          "print(','.join(name for name in {lazy!r} if name in sys.modules))")
+
+
+def loaded_dependencies(module):
+    """ Returns the LAZY_DEPENDENCIES a fresh import of `module` loads. """
+    output = subprocess.run(
+        [sys.executable, "-c",
+         _PROBE.format(module=module, lazy=LAZY_DEPENDENCIES)],
+        check=True, capture_output=True, text=True).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+def import_time(statement, runs):
+    """ Returns the median wall time of `python -c statement`, in ms. """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main(runs=10):
+    baseline = import_time("pass", runs)
+    print(f"{'bare interpreter':<36} {baseline:8.1f} ms")
+    for module in MODULES:
+        cost = import_time(f"import {module}", runs) - baseline
+        loaded = ", ".join(loaded_dependencies(module)) or "-"
+        print(f"{module:<36} {cost:+8.1f} ms  heavy: {loaded}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
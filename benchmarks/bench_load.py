@@ -0,0 +1,122 @@
+""" benchmarks/bench_load.py
+
+    Load test of the client against the local stand-in server: throughput
+    and p50/p95/p99 latency for single, batch and concurrent call patterns.
+
+    Caching is off, so every call reaches the server. The server adds
+    `latency` seconds per response to approximate the real round trip; the
+    default of 0 measures client overhead alone.
+
+    Usage:
+        python -m benchmarks.bench_load [calls] [latency] [workers]
+
+"""
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stand_in_server import StandInServer
+from client.alpha_vantage_client import AlphaVantageClient
+
+CURRENCIES = ("EUR", "JPY", "GBP", "CHF", "CAD", "AUD", "NZD", "SEK")
+
+
+def percentile(latencies, fraction):
+    """ Returns the nearest-rank percentile of sorted latencies. """
+    return latencies[max(0, math.ceil(fraction * len(latencies)) - 1)]
+
+
+def summarize(latencies, elapsed):
+    """ Returns throughput and latency percentiles of one run.
+
+    Args:
+        latencies (list): Per-call latencies in seconds.
+        elapsed (float): Wall-clock seconds of the whole run.
+
+    Returns:
+        dict: "calls", "throughput" (calls per second) and "p50", "p95",
+            "p99" (milliseconds).
+    """
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def _pairs(calls):
+    """ Returns `calls` distinct pairs; the stand-in quotes any code, and
+    batches fetch duplicates only once.
+    """
+    return [(CURRENCIES[index % len(CURRENCIES)], f"X{index:05d}")
+            for index in range(calls)]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run_single(client, calls):
+    """ Sequential calls, one at a time. """
+    start = time.perf_counter()
+    latencies = [_timed(client.get_currency_exchange_rate_response, *pair)
+                 for pair in _pairs(calls)]
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_batch(client, calls, workers):
+    """ One batch_call() over `workers` threads. """
+    result = client.batch_call(
+        client.CURRENCY_EXCHANGE_RATE, _pairs(calls), max_workers=workers)
+    if result.errors:
+        raise RuntimeError(f"{len(result.errors)} batch calls failed.")
+    return summarize([item.latency for item in result], result.elapsed)
+
+
+def run_concurrent(client, calls, workers):
+    """ `workers` threads sharing one client, each timing its calls. """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        latencies = list(executor.map(
+            lambda pair: _timed(
+                client.get_currency_exchange_rate_response, *pair),
+            _pairs(calls)))
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+
+def run(server_url, calls=200, workers=8):
+    """ Runs every pattern and returns {pattern: summary}. """
+    results = {}
+    with AlphaVantageClient("demo", base_url=server_url,
+                            pool_maxsize=workers,
+                            coalesce_requests=False) as client:
+        run_single(client, min(calls, 10))  # Warm-up.
+        results["single"] = run_single(client, calls)
+        results["batch"] = run_batch(client, calls, workers)
+        results["concurrent"] = run_concurrent(client, calls, workers)
+    return results
+
+
+def report(results):
+    print(f"{'pattern':<12}{'calls':>7}{'calls/s':>10}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for pattern, summary in results.items():
+        print(f"{pattern:<12}{summary['calls']:>7}"
+              f"{summary['throughput']:>10.1f}{summary['p50']:>9.3f}"
+              f"{summary['p95']:>9.3f}{summary['p99']:>9.3f}")
+
+
+def main(calls=200, latency=0.0, workers=8):
+    with StandInServer(latency=latency) as server:
+        report(run(server.url, int(calls), int(workers)))
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:4]))
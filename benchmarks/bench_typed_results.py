@@ -0,0 +1,70 @@
+""" benchmarks/bench_typed_results.py
+
+    Compares raw response dicts with the typed ExchangeRate / SymbolMatch
+    records: memory held per result and the cost of reading numeric fields.
+
+    Usage:
+        python -m benchmarks.bench_typed_results [results]
+
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.stand_in_server import (
+    EXCHANGE_RATE_RESPONSE, SYMBOL_SEARCH_RESPONSE)
+from client.models import ExchangeRate, SymbolMatch
+
+RATE_BODY = json.dumps(
+    EXCHANGE_RATE_RESPONSE["Realtime Currency Exchange Rate"])
+MATCH_BODY = json.dumps(SYMBOL_SEARCH_RESPONSE["bestMatches"][0])
+
+
+def memory_per_item(build, count):
+    """ Returns bytes allocated per item kept alive by build(). """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [build() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def timed(fn, count):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / count * 1e9  # ns per item
+
+
+def main(count=100_000):
+    # Each result is decoded from its own body, as it would be off the wire.
+    rate_dict = lambda: json.loads(RATE_BODY)  # noqa: E731
+    rate_typed = lambda: ExchangeRate.from_response(  # noqa: E731
+        json.loads(RATE_BODY))
+    match_dict = lambda: json.loads(MATCH_BODY)  # noqa: E731
+    match_typed = lambda: SymbolMatch.from_response(  # noqa: E731
+        json.loads(MATCH_BODY))
+
+    print(f"memory per result, {count} results held")
+    print(f"  exchange rate  dict {memory_per_item(rate_dict, count):7.0f} B"
+          f"   typed {memory_per_item(rate_typed, count):7.0f} B")
+    print(f"  symbol match   dict {memory_per_item(match_dict, count):7.0f} B"
+          f"   typed {memory_per_item(match_typed, count):7.0f} B")
+
+    dicts = [rate_dict() for _ in range(count)]
+    records = [rate_typed() for _ in range(count)]
+    print("reading rate, bid and ask as floats")
+    print("  dict  {:7.1f} ns/result".format(timed(lambda: [
+        (float(d["5. Exchange Rate"]), float(d["8. Bid Price"]),
+         float(d["9. Ask Price"])) for d in dicts], count)))
+    print("  typed {:7.1f} ns/result".format(timed(lambda: [
+        (r.rate, r.bid, r.ask) for r in records], count)))
+    print("building the record once, from a decoded dict")
+    print("  typed {:7.1f} ns/result".format(timed(lambda: [
+        ExchangeRate.from_response(d) for d in dicts], count)))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
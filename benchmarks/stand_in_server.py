@@ -0,0 +1,334 @@
+""" benchmarks/stand_in_server.py
+
+    Local stand-in for the Alpha Vantage /query endpoint.
+
+    Serves every registered function over HTTP/1.1 with keep-alive, so that
+    client behaviour can be measured without touching the real API. Latency,
+    per-key rate limiting, rejected keys and transient server errors can be
+    injected to load-test the client's error handling offline.
+
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+EXCHANGE_RATE_RESPONSE = {
+    "Realtime Currency Exchange Rate": {
+        "1. From_Currency Code": "USD",
+        "2. From_Currency Name": "United States Dollar",
+        "3. To_Currency Code": "EUR",
+        "4. To_Currency Name": "Euro",
+        "5. Exchange Rate": "0.92500000",
+        "6. Last Refreshed": "2025-05-16 08:00:00",
+        "7. Time Zone": "UTC",
+        "8. Bid Price": "0.92490000",
+        "9. Ask Price": "0.92510000"
+    }
+}
+
+SYMBOL_SEARCH_RESPONSE = {
+    "bestMatches": [
+        {
+            "1. symbol": "TSLA",
+            "2. name": "Tesla Inc",
+            "3. type": "Equity",
+            "4. region": "United States",
+            "5. marketOpen": "09:30",
+            "6. marketClose": "16:00",
+            "7. timezone": "UTC-04",
+            "8. currency": "USD",
+            "9. matchScore": "1.0000",
+        }
+    ]
+}
+
+RESPONSES = {
+    "CURRENCY_EXCHANGE_RATE": EXCHANGE_RATE_RESPONSE,
+    "SYMBOL_SEARCH": SYMBOL_SEARCH_RESPONSE,
+}
+
+# Required parameters, as the API checks them.
+REQUIRED_PARAMS = {
+    "CURRENCY_EXCHANGE_RATE": ("from_currency", "to_currency"),
+    "SYMBOL_SEARCH": ("keywords",),
+    "FX_DAILY": ("from_symbol", "to_symbol"),
+    "TIME_SERIES_DAILY": ("symbol",),
+}
+
+LAST_DAY = date(2025, 5, 16)  # Newest bar of generated series.
+COMPACT_BARS = 100
+FULL_BARS = 1000
+
+INVALID_CALL = ("Invalid API call. Please retry or visit the documentation "
+                "(https://www.alphavantage.co/documentation/).")
+INVALID_KEY = ("the parameter apikey is invalid or missing. Please claim "
+               "your free API key on (https://www.alphavantage.co/support/"
+               "#api-key).")
+RATE_LIMITED = ("Thank you for using Alpha Vantage! Our standard API rate "
+                "limit is {limit} requests per minute.")
+
+
+def _seed(*values):
+    """ Returns a stable integer seed for the given values. """
+    digest = hashlib.sha256("|".join(values).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def exchange_rate(from_currency, to_currency):
+    """ Returns an exchange rate response for any pair; the rate is
+    deterministic per pair.
+    """
+    rate = random.Random(_seed(from_currency, to_currency)).uniform(0.1, 2.0)
+    data = dict(EXCHANGE_RATE_RESPONSE["Realtime Currency Exchange Rate"])
+    data.update({
+        "1. From_Currency Code": from_currency,
+        "2. From_Currency Name": from_currency,
+        "3. To_Currency Code": to_currency,
+        "4. To_Currency Name": to_currency,
+        "5. Exchange Rate": f"{rate:.8f}",
+        "8. Bid Price": f"{rate * 0.9999:.8f}",
+        "9. Ask Price": f"{rate * 1.0001:.8f}",
+    })
+    return {"Realtime Currency Exchange Rate": data}
+
+
+def daily_series(function, symbol, bars, with_volume):
+    """ Returns a deterministic random-walk series: date-keyed bar dicts,
+    newest first, over weekdays ending at LAST_DAY.
+    """
+    rng = random.Random(_seed(function, symbol))
+    price = rng.uniform(1.0, 200.0)
+    days = []
+    day = LAST_DAY
+    while len(days) < bars:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    series = {}
+    for day in reversed(days):  # Walk forward in time.
+        open_ = price
+        close = max(0.01, open_ * (1 + rng.gauss(0, 0.01)))
+        bar = {
+            "1. open": f"{open_:.4f}",
+            "2. high": f"{max(open_, close) * 1.005:.4f}",
+            "3. low": f"{min(open_, close) * 0.995:.4f}",
+            "4. close": f"{close:.4f}",
+        }
+        if with_volume:
+            bar["5. volume"] = str(rng.randint(100000, 5000000))
+        series[day.isoformat()] = bar
+        price = close
+    return dict(reversed(series.items()))
+
+
+def series_csv(series):
+    """ Returns a series in the API's datatype=csv format. """
+    first = next(iter(series.values()), {})
+    columns = ["timestamp", "open", "high", "low", "close"]
+    keys = ["1. open", "2. high", "3. low", "4. close"]
+    if "5. volume" in first:
+        columns.append("volume")
+        keys.append("5. volume")
+    lines = [",".join(columns)]
+    for day, bar in series.items():
+        lines.append(",".join([day] + [bar[key] for key in keys]))
+    return "\r\n".join(lines) + "\r\n"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """ Answers GET /query like the API does for `function`. """
+
+    protocol_version = "HTTP/1.1"  # Required for keep-alive.
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second write waits on the client's delayed ACK on reused connections.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = urlparse(self.path)
+        query = {name: values[0]
+                 for name, values in parse_qs(url.query).items()}
+        if url.path != "/query":
+            self._send(404, {"Error Message": "Not found."})
+            return
+        stand_in = self.server.stand_in
+        status, body, content_type = stand_in.respond(query)
+        stand_in.delay()
+        self._send_body(status, body, content_type)
+
+    def _send(self, status, data):
+        self._send_body(status, json.dumps(data).encode("utf-8"),
+                        "application/json")
+
+    def _send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass  # Keep benchmark output clean.
+
+
+class StandInServer:
+    """ Runs the stand-in server on a background thread.
+
+    Every request is checked like the API does: an unknown function or a
+    missing parameter gets an "Error Message", a key outside `api_keys` an
+    invalid-key "Error Message", and a key over `requests_per_minute` an
+    "Information" rate-limit note, all with status 200. A share
+    `error_rate` of requests fails with HTTP 503 instead.
+
+    Usage:
+        with StandInServer(latency=0.05) as server:
+            client = AlphaVantageClient("demo", base_url=server.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 requests_per_minute=None, api_keys=None, error_rate=0.0,
+                 full_bars=FULL_BARS, seed=None, clock=time.monotonic):
+        """
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port; 0 picks a free one.
+            latency (float): Seconds added to every response.
+            jitter (float): Up to this many seconds added at random.
+            requests_per_minute (int): Per-key limit over a sliding minute;
+                None for no limit.
+            api_keys (iterable): Accepted keys; None accepts any.
+            error_rate (float): Share of requests answered with HTTP 503.
+            full_bars (int): Bars of an outputsize=full series.
+            seed (int): Seed for jitter and injected errors.
+            clock (callable): Monotonic time source for rate limiting.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_per_minute = requests_per_minute
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self.error_rate = error_rate
+        self.full_bars = full_bars
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = {}  # API key -> deque of recent call times.
+        self._bodies = {}  # Query tuple -> encoded body, built once.
+        self.stats = Counter()  # "requests", per function and per outcome.
+        self._httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/query"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def delay(self):
+        """ Sleeps for the configured latency plus jitter. """
+        seconds = self.latency
+        if self.jitter:
+            with self._lock:
+                seconds += self._random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def respond(self, query):
+        """ Returns (status, body bytes, content type) for a query. """
+        function = query.get("function", "")
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[function] += 1
+            outcome = self._check_locked(query)
+            self.stats[outcome] += 1
+        if outcome == "server_error":
+            return 503, b"Service Unavailable", "text/plain"
+        if outcome == "ok":
+            return self._body(function, query)
+        message = {
+            "invalid_call": ("Error Message", INVALID_CALL),
+            "invalid_key": ("Error Message", INVALID_KEY),
+            "rate_limited": ("Information", RATE_LIMITED.format(
+                limit=self.requests_per_minute)),
+        }[outcome]
+        return (200, json.dumps(dict([message])).encode("utf-8"),
+                "application/json")
+
+    def _check_locked(self, query):
+        if self.error_rate and self._random.random() < self.error_rate:
+            return "server_error"
+        required = REQUIRED_PARAMS.get(query.get("function"))
+        if required is None or any(not query.get(name) for name in required):
+            return "invalid_call"
+        api_key = query.get("apikey")
+        if not api_key or (self.api_keys is not None
+                           and api_key not in self.api_keys):
+            return "invalid_key"
+        if self.requests_per_minute is not None:
+            now = self._clock()
+            calls = self._calls.setdefault(api_key, deque())
+            while calls and now - calls[0] >= 60:
+                calls.popleft()
+            if len(calls) >= self.requests_per_minute:
+                return "rate_limited"
+            calls.append(now)
+        return "ok"
+
+    def _body(self, function, query):
+        """ Returns the success response, encoded once per query. """
+        cache_key = tuple(sorted(
+            (name, value) for name, value in query.items()
+            if name != "apikey"))
+        with self._lock:
+            body = self._bodies.get(cache_key)
+        if body is None:
+            body = self._build(function, query)
+            with self._lock:
+                self._bodies[cache_key] = body
+        return body
+
+    def _build(self, function, query):
+        if function == "CURRENCY_EXCHANGE_RATE":
+            data = exchange_rate(query["from_currency"].upper(),
+                                 query["to_currency"].upper())
+        elif function == "SYMBOL_SEARCH":
+            data = SYMBOL_SEARCH_RESPONSE
+        else:
+            bars = (self.full_bars if query.get("outputsize") == "full"
+                    else COMPACT_BARS)
+            if function == "FX_DAILY":
+                symbol = (query["from_symbol"].upper() + "/"
+                          + query["to_symbol"].upper())
+                series = daily_series(function, symbol, bars, False)
+                data = {"Time Series FX (Daily)": series}
+            else:
+                series = daily_series(
+                    function, query["symbol"].upper(), bars, True)
+                data = {"Time Series (Daily)": series}
+            if query.get("datatype") == "csv":
+                return 200, series_csv(series).encode("utf-8"), "text/csv"
+        return 200, json.dumps(data).encode("utf-8"), "application/json"
@@ -0,0 +1,98 @@
+""" client/__main__.py
+
+    Command-line entry point for one-off lookups:
+
+        python -m client rate USD EUR
+        python -m client search Tesla
+
+    Responses are kept in a persistent store, so repeated runs within a
+    function's TTL are answered from disk without calling the API (or even
+    importing requests). Results are printed as JSON.
+
+"""
+import argparse
+import json
+import os
+import sys
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.store import PersistentStore
+
+API_KEY_VARIABLE = "ALPHAVANTAGE_API_KEY"
+STORE_VARIABLE = "ALPHAVANTAGE_STORE"
+DEFAULT_STORE = os.path.join("~", ".cache", "alpha_vantage", "responses.bin")
+
+
+def build_parser():
+    """ Returns the argument parser of the CLI. """
+    parser = argparse.ArgumentParser(
+        prog="python -m client",
+        description="Query the Alpha Vantage API.")
+    parser.add_argument(
+        "--api-key", default=os.environ.get(API_KEY_VARIABLE),
+        help=f"API key; defaults to ${API_KEY_VARIABLE}.")
+    parser.add_argument(
+        "--store", default=os.environ.get(STORE_VARIABLE, DEFAULT_STORE),
+        help=f"Response store file; defaults to ${STORE_VARIABLE} or "
+             f"{DEFAULT_STORE}.")
+    parser.add_argument(
+        "--no-store", action="store_true",
+        help="Always call the API; do not read or write the store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rate = commands.add_parser("rate", help="Currency exchange rate.")
+    rate.add_argument("from_currency", help='Source currency, e.g. "USD".')
+    rate.add_argument("to_currency", help='Target currency, e.g. "EUR".')
+
+    search = commands.add_parser("search", help="Symbol search.")
+    search.add_argument("keywords", help='Keywords, e.g. "Tesla".')
+    return parser
+
+
+def _open_store(path):
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return PersistentStore(path)
+
+
+def run(args, out=sys.stdout):
+    """ Runs the parsed command and prints its result. """
+    store = None if args.no_store else _open_store(args.store)
+    try:
+        client = AlphaVantageClient(args.api_key, store=store)
+        with client:
+            if args.command == "rate":
+                result = client.get_currency_exchange_rate_response(
+                    args.from_currency, args.to_currency)
+            else:
+                result = client.get_symbol_search_response(args.keywords)
+    finally:
+        if store is not None:
+            store.close()
+    json.dump(result, out, indent=2)
+    out.write("\n")
+
+
+def main(argv=None):
+    """ Runs the CLI.
+
+    Returns:
+        int: Exit status; 1 for API, network or store errors.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error(f"an API key is required: --api-key or "
+                     f"${API_KEY_VARIABLE}")
+    try:
+        run(args)
+    except (ValueError, OSError) as err:  # RequestException is an OSError.
+        print(f"error: {err}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,39 @@
 
     Module for the API client implementation.
 
+    requests is imported on first use, not at module load: short-lived
+    jobs answered from the cache or store never pay for it. It is still
+    reachable as an attribute of this module, e.g. for
+    patch("client.alpha_vantage_client.requests.Session.get").
+
 """
-import requests
+import json
+import threading
+import time
+from datetime import timedelta
+
+from client import endpoints
+from client.batch import run_batch
+from client.cache import make_cache_key
+from client.columnar import FORMATS as COLUMNAR_FORMATS, to_columnar
+from client.decoding import ResponseDecoder
+from client.exceptions import (
+    InvalidApiKeyError, RateLimitTimeout, ThrottleError)
+from client.lazy_import import lazy_attributes
+from client.models import Bar, ExchangeRate, SymbolMatch
+from client.revalidate import Revalidator, flag_stale
+from client.single_flight import SingleFlight
+from client.streaming import iter_csv_bars, iter_json_bars
 
+_lazy, __getattr__ = lazy_attributes(globals(), {
+    "requests": "requests",
+    "HTTPAdapter": "requests.adapters:HTTPAdapter",
+})
 
-class AlphaVantageClient:
-    """ Wraps API interaction logic.  For each endpoint, API function, it is 
-    required to add a method. It encapsulats specific parameter request.
+
+class BaseAlphaVantageClient:
+    """ Constants, parameter handling and response validation shared by the
+    blocking and the asyncio client. Transport is left to subclasses.
 
     Function names are defined as constants.
     """
@@ -18,28 +44,425 @@ class AlphaVantageClient:
 
     ERROR_MESSAGE = "Error Message"
     INFORMATION_MESSAGE = "Information"
+    # Lower-case phrases marking an "Information" message as a throttle.
+    THROTTLE_MARKERS = ("rate limit", "call frequency")
+    # Lower-case phrases marking an "Error Message" as a rejected API key.
+    INVALID_KEY_MARKERS = ("apikey is invalid", "api key is invalid",
+                           "invalid api key")
 
     SHORT_TIMEOUT = 1  # Timeout to be used in request call.
 
-    # Function names
+    # Function names. Parameters, response keys, TTLs and costs live in
+    # the endpoint registry, client/endpoints.py; add new functions there.
 
     # Forex
-    CURRENCY_EXCHANGE_RATE = "CURRENCY_EXCHANGE_RATE"
-    CURRENCY_EXCHANGE_RATE_RESPONSE_KEY = "Realtime Currency Exchange Rate"
+    CURRENCY_EXCHANGE_RATE = endpoints.CURRENCY_EXCHANGE_RATE.function
+    CURRENCY_EXCHANGE_RATE_RESPONSE_KEY = (
+        endpoints.CURRENCY_EXCHANGE_RATE.response_key)
 
     # Core Stock APIs
-    SYMBOL_SEARCH = "SYMBOL_SEARCH"
-    SYMBOL_SEARCH_RESPONSE_KEY = "bestMatches"
+    SYMBOL_SEARCH = endpoints.SYMBOL_SEARCH.function
+    SYMBOL_SEARCH_RESPONSE_KEY = endpoints.SYMBOL_SEARCH.response_key
+
+    # Time series
+    FX_DAILY = endpoints.FX_DAILY.function
+    FX_DAILY_RESPONSE_KEY = endpoints.FX_DAILY.response_key
+    TIME_SERIES_DAILY = endpoints.TIME_SERIES_DAILY.function
+    TIME_SERIES_DAILY_RESPONSE_KEY = endpoints.TIME_SERIES_DAILY.response_key
 
-    # Add supported function names with contants below
+    OUTPUT_SIZES = endpoints.OUTPUT_SIZES
+    DATATYPES = endpoints.DATATYPES
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url=None, typed_results=False):
         if not api_key:
             raise ValueError("API key is required.")
         self.api_key = api_key
+        self.base_url = base_url or self.BASE_URL
+        self.typed_results = typed_results
+
+    @classmethod
+    def _check_response_data(cls, data):
+        """ Raises for error payloads the API returns with a 200 status.
+
+        Args:
+            data (dict): Decoded response body.
+
+        Raises:
+            ThrottleError: For a lone "Information" rate-limit message.
+            InvalidApiKeyError: For an "Error Message" rejecting the key.
+            ValueError: For another "Error Message", or any other
+                "Information" message that is the only content (e.g.
+                premium endpoint).
+        """
+        if cls.ERROR_MESSAGE in data:
+            message = data[cls.ERROR_MESSAGE]
+            error = (InvalidApiKeyError
+                     if cls._has_marker(message, cls.INVALID_KEY_MARKERS)
+                     else ValueError)
+            raise error(f"Alpha Vantage API Error: {message}")
+        elif cls.INFORMATION_MESSAGE in data:
+            if len(data.keys()) == 1:
+                message = data[cls.INFORMATION_MESSAGE]
+                error = (ThrottleError if cls._is_throttle_message(message)
+                         else ValueError)
+                raise error(f"Alpha Vantage API Info: {message}")
+
+    @classmethod
+    def _is_throttle_message(cls, message):
+        return cls._has_marker(message, cls.THROTTLE_MARKERS)
+
+    @staticmethod
+    def _has_marker(message, markers):
+        message = str(message).lower()
+        return any(marker in message for marker in markers)
+
+    @staticmethod
+    def _extract_response_data(data, function, response_key):
+        """ Returns data[response_key] or raises if it is missing. """
+        if response_key in data:
+            return data[response_key]
+        else:
+            raise ValueError(
+                f"Unexpected response structure for {function}.")
+
+    def _endpoint_result(self, endpoint, data):
+        """ Converts an endpoint's payload with its result method, if any.
+        """
+        if endpoint.result is None:
+            return data
+        return getattr(self, endpoint.result)(data)
+
+    def _exchange_rate_result(self, rate):
+        """ Returns the rate dict, or an ExchangeRate in typed mode. The
+        rate may already be a record cached by a typed client.
+        """
+        if isinstance(rate, ExchangeRate):
+            return rate if self.typed_results else rate.to_dict()
+        if self.typed_results:
+            return ExchangeRate.from_response(rate)
+        return rate
+
+    def _symbol_search_result(self, matches):
+        """ Returns the match dicts, or SymbolMatch records in typed mode.
+        The matches may already be records cached by a typed client.
+        """
+        if matches and isinstance(matches[0], SymbolMatch):
+            if self.typed_results:
+                return matches
+            return [match.to_dict() for match in matches]
+        if self.typed_results:
+            return [SymbolMatch.from_response(match) for match in matches]
+        return matches
+
+    def _time_series_result(self, series, columnar=None):
+        """ Returns the date-keyed bar dicts, Bar records (newest first) in
+        typed mode, or column arrays if `columnar` names a format.
+        """
+        if columnar is not None:
+            return to_columnar(series, columnar)
+        if self.typed_results:
+            return [Bar.from_response(day, values)
+                    for day, values in series.items()]
+        return series
+
+    @staticmethod
+    def _check_columnar(columnar):
+        """ Raises ValueError for an unknown columnar format. """
+        if columnar is not None and columnar not in COLUMNAR_FORMATS:
+            raise ValueError(
+                f"columnar must be one of {', '.join(COLUMNAR_FORMATS)}.")
+
+    @classmethod
+    def _with_datatype(cls, params, datatype):
+        """ Adds datatype to time series params; "json" is the API default
+        and is left out.
+
+        Raises:
+            ValueError: For an unsupported datatype.
+        """
+        if datatype not in cls.DATATYPES:
+            raise ValueError(
+                f"datatype must be one of {', '.join(cls.DATATYPES)}.")
+        if datatype != "json":
+            params["datatype"] = datatype
+        return params
+
+
+class AlphaVantageClient(BaseAlphaVantageClient):
+    """ Wraps API interaction logic. Endpoint methods are generated from
+    the registry in client/endpoints.py; functions needing extra behaviour
+    (local symbol index, columnar or streamed series) define their method
+    here and build their parameters from the registry.
+
+    Function names are defined as constants.
+    """
+
+    # Connection pool
+    POOL_CONNECTIONS = 10  # Number of per-host pools kept by the session.
+    POOL_MAXSIZE = 10  # Max connections kept alive per host.
+
+    # Batch calls; matches POOL_MAXSIZE so workers never wait on the pool.
+    BATCH_MAX_WORKERS = POOL_MAXSIZE
+
+    STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when streaming.
+
+    def __init__(self, api_key=None, base_url=None,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, cache=None,
+                 rate_limiter=None, rate_limit_timeout=None,
+                 coalesce_requests=True, typed_results=False, decoder=None,
+                 symbol_index=None, store=None, retry_policy=None,
+                 adaptive_timeout=None, instrumentation=None, key_pool=None,
+                 max_staleness=None):
+        """
+        Args:
+            api_key (str): Alpha Vantage API key; optional with key_pool.
+            base_url (str): Overrides BASE_URL, e.g. for a local stand-in.
+            pool_connections (int): Number of per-host pools to cache.
+            pool_maxsize (int): Max connections kept alive per host.
+            pool_block (bool): Block when the pool is exhausted instead of
+                opening (and discarding) an extra connection.
+            keep_alive (bool): Reuse connections between calls. When False
+                every call asks the server to close the connection.
+            cache (ResponseCache): Optional response cache, see
+                client/cache.py. Successful responses are served from it
+                until their per-function TTL expires.
+            rate_limiter (RateLimiter): Optional limiter for the API key, see
+                client/rate_limit.py. Requests wait for a free slot instead
+                of being fired into the API's throttle.
+            rate_limit_timeout (float): Max seconds to wait for a slot;
+                None waits as long as needed.
+            coalesce_requests (bool): Let concurrent identical requests
+                share one HTTP call and its result or exception.
+            typed_results (bool): Return ExchangeRate / SymbolMatch records
+                (client/models.py) instead of raw response dicts. With a
+                cache, records are built once per response and cached.
+            decoder: JSON decoder backend, see client/decoding.py. Defaults
+                to ResponseDecoder (Response.json()); FastJSONDecoder decodes
+                the raw bytes with orjson if available and only keeps
+                the response key the endpoint uses and API messages.
+            symbol_index (SymbolIndex): Optional local index, see
+                client/symbol_index.py. Symbol searches it answers with
+                confidence skip the API; API results are added to it.
+            store (PersistentStore): Optional on-disk store, see
+                client/store.py. Fresh-enough stored responses are served
+                instead of calling the API, also after a restart.
+            retry_policy (RetryPolicy): Retries transient network and 5XX
+                failures with jittered backoff, see client/retry.py.
+            adaptive_timeout (AdaptiveTimeout): Derives per-function
+                timeouts from observed latency instead of SHORT_TIMEOUT.
+            instrumentation (Instrumentation): Receives per-phase timings
+                and counters for every call, see client/instrumentation.py.
+            key_pool (KeyPool): Spreads calls over several API keys, each
+                with its own rate limiter, see client/key_pool.py. Replaces
+                rate_limiter.
+            max_staleness (float): Enables stale-while-revalidate for
+                endpoints that allow it (exchange rates). Cache entries up
+                to this many seconds past their TTL are returned at once,
+                flagged stale, and refreshed in the background; older ones
+                block for a fresh response. Requires a cache supporting
+                get_stale(), such as ResponseCache.
+
+        Raises:
+            ValueError: If no API key is provided, both rate_limiter and
+                key_pool are, or max_staleness is given without a suitable
+                cache.
+        """
+        if max_staleness is not None and not hasattr(cache, "get_stale"):
+            raise ValueError("max_staleness requires a cache with get_stale().")
+        if key_pool is not None:
+            if rate_limiter is not None:
+                raise ValueError("Pass either rate_limiter or key_pool.")
+            api_key = api_key or key_pool.api_keys[0]
+        super().__init__(api_key, base_url, typed_results)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.rate_limit_timeout = rate_limit_timeout
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        self.decoder = decoder if decoder is not None else ResponseDecoder()
+        self.symbol_index = symbol_index
+        self.store = store
+        self.retry_policy = retry_policy
+        self.adaptive_timeout = adaptive_timeout
+        self.instrumentation = instrumentation
+        self.key_pool = key_pool
+        self.max_staleness = max_staleness
+        # Its worker threads start with the first background refresh.
+        self._revalidator = (
+            Revalidator() if max_staleness is not None else None)
+        # The session (and requests) is created on the first API call.
+        self._session_options = (
+            pool_connections, pool_maxsize, pool_block, keep_alive)
+        self._http_session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def _session(self):
+        """ The pooled session shared by all endpoint methods. """
+        if self._http_session is None:
+            with self._session_lock:
+                if self._http_session is None:
+                    self._http_session = self._create_session(
+                        *self._session_options)
+        return self._http_session
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, pool_block,
+                        keep_alive):
+        """ Creates the pooled session shared by all endpoint methods. """
+        session = _lazy("requests").Session()
+        adapter = _lazy("HTTPAdapter")(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self):
+        """ Closes all pooled connections and waits for background
+        refreshes to finish.
+        """
+        if self._revalidator is not None:
+            self._revalidator.close()
+        if self._http_session is not None:
+            self._http_session.close()
 
-    def _make_request(self, params):
-        """ Helper to make a request and return data.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def coalesced_requests(self):
+        """ int: Calls answered by another thread's identical request. """
+        if self._single_flight is None:
+            return 0
+        return self._single_flight.coalesced
+
+    def _make_request(self, params, response_key=None):
+        """ Helper to make a request and return data, using the cache if one
+        is configured, then the persistent store. Concurrent identical
+        requests are coalesced.
+
+        Args:
+            params (dict): Request parameters.
+            response_key (str): Key of the payload the caller will use; the
+                decoder may drop the rest.
+
+        Returns: 
+            dict: The API response data as a dictionary if successful.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or unexpected response structure.
+        """
+        if (self.cache is None and self._single_flight is None
+                and self.store is None):
+            return self._send_request(params, response_key)
+
+        key = make_cache_key(params)
+        if self.cache is not None:
+            data = self.cache.get(key)
+            instrumentation = self._instrumentation()
+            if instrumentation is not None:
+                instrumentation.count(
+                    params.get("function"),
+                    "cache_misses" if data is None else "cache_hits")
+            if data is not None:
+                return data
+
+        return self._load(key, params, response_key)
+
+    def _load(self, key, params, response_key):
+        """ Loads from the store or the API, coalescing identical calls. """
+        if self._single_flight is None:
+            return self._load_and_cache(key, params, response_key)
+        return self._single_flight.do(
+            key, self._load_and_cache, key, params, response_key)
+
+    def _load_and_cache(self, key, params, response_key):
+        stored = None if self.store is None else self.store.get(key)
+        if stored is None:
+            return self._save(
+                key, params, self._send_request(params, response_key))
+        # Cache a stored response only for what is left of its lifetime.
+        data, timestamp = stored
+        if self.cache is not None:
+            data = self._cached_form(params, data)
+            self.cache.set(key, data, age=self.store.age(timestamp))
+        return data
+
+    def _save(self, key, params, data):
+        """ Writes a response fetched from the API to the store and the
+        cache; returns it in cached form.
+        """
+        if self.store is not None:
+            self.store.put(key, data)
+        if self.cache is not None:
+            data = self._cached_form(params, data)
+            self.cache.set(key, data)
+        return data
+
+    def _cached_form(self, params, data):
+        """ Returns the response as the cache keeps it: in typed mode, the
+        payload of endpoints with cache_result is converted here, once,
+        instead of on every cache hit. The store keeps the raw response.
+        """
+        if not self.typed_results:
+            return data
+        endpoint = endpoints.ENDPOINTS.get(params.get("function"))
+        if (endpoint is None or not endpoint.cache_result
+                or endpoint.response_key not in data):
+            return data
+        payload = self._endpoint_result(
+            endpoint, data[endpoint.response_key])
+        return {**data, endpoint.response_key: payload}
+
+    def refresh(self, params, response_key=None):
+        """ Fetches a response from the API, skipping the cache and the
+        store, and writes it to both. Used to renew entries before they
+        expire.
+
+        Args:
+            params (dict): Request parameters, including "function".
+            response_key (str): Key of the payload the caller will use; the
+                decoder may drop the rest.
+
+        Returns:
+            dict: The API response data.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or unexpected response structure.
+        """
+        data = self._send_request(params, response_key)
+        if self.store is not None or self.cache is not None:
+            self._save(make_cache_key(params), params, data)
+        return data
+
+    def _send_request(self, params, response_key=None):
+        """ Sends the request, retrying transient failures if a retry policy
+        is configured.
+
+        Args: Parameter list
+
+        Returns: 
+            dict: The API response data as a dictionary if successful.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or unexpected response structure.
+        """
+        if self.retry_policy is None:
+            return self._send_once(params, response_key)
+        return self.retry_policy.call(self._send_once, params, response_key)
+
+    def _send_once(self, params, response_key=None):
+        """ Sends one request, waiting on the rate limiter or key pool if one
+        is configured.
 
         Args: Parameter list
 
@@ -48,82 +471,494 @@ class AlphaVantageClient:
 
         Raises:
             requests.exceptions.RequestException: For network or HTTP errors.
+            RateLimitTimeout: If the rate limiter has no slot in time.
+            ThrottleError: If the API reports the rate limit was hit.
             ValueError: For API errors or unexpected response structure.
         """
+        if self.key_pool is not None:
+            return self._send_pooled(params, response_key)
+        if self.rate_limiter is None:
+            return self._fetch(params, response_key)
+
+        self._acquire_slot(endpoints.cost_for(params.get("function")))
         try:
-            response = requests.get(
-                self.BASE_URL, params=params, timeout=self.SHORT_TIMEOUT)
+            data = self._fetch(params, response_key)
+        except ThrottleError:
+            self.rate_limiter.on_throttle()
+            raise
+        self.rate_limiter.on_success()
+        return data
+
+    def _send_pooled(self, params, response_key=None):
+        """ Sends one request with the least-loaded key of the pool.
+
+        A key answered with a throttle or invalid-key error leaves the
+        rotation and the call is retried with another key, as long as one
+        is left.
+        """
+        cost = endpoints.cost_for(params.get("function"))
+        error = None
+        for _ in range(len(self.key_pool)):
+            key = self.key_pool.acquire(cost, timeout=self.rate_limit_timeout)
+            try:
+                data = self._fetch(dict(params, apikey=key), response_key)
+            except ThrottleError as err:
+                self.key_pool.on_throttle(key)
+                error = err
+            except InvalidApiKeyError as err:
+                self.key_pool.on_invalid_key(key)
+                error = err
+            else:
+                self.key_pool.on_success(key)
+                return data
+            finally:
+                self.key_pool.release(key)
+            if not self.key_pool.active_keys():
+                break
+        raise error
+
+    def _acquire_slot(self, cost=endpoints.DEFAULT_COST):
+        """ Waits for a rate limiter slot worth `cost` tokens.
+
+        Raises:
+            RateLimitTimeout: If no slot frees up within rate_limit_timeout.
+        """
+        if not self.rate_limiter.acquire(
+                cost, timeout=self.rate_limit_timeout):
+            raise RateLimitTimeout(
+                "Rate limit: no request slot within "
+                f"{self.rate_limit_timeout} seconds.")
+
+    def _stream(self, params, response_key):
+        """ Yields Bar records while the response body downloads.
+
+        Streamed responses bypass the cache, the store and coalescing, as
+        they are never held in memory as a whole. The rate limiter or key
+        pool, the retry policy and the adaptive timeout apply up to the
+        response headers; nothing is retried once bars are yielded. The
+        timeout also bounds each read of the body.
+        """
+        function = params.get("function")
+        instrumentation = self._instrumentation()
+        timeout = self._timeout_for(function)
+        if instrumentation is not None:
+            instrumentation.count(function, "requests")
+        start = time.perf_counter()
+        key = None
+        try:
+            if self.retry_policy is None:
+                response, key = self._open_stream(params, timeout)
+            else:
+                response, key = self.retry_policy.call(
+                    self._open_stream, params, timeout)
+            received = time.perf_counter()
+            if self.adaptive_timeout is not None:
+                self.adaptive_timeout.observe(function, received - start)
+            with response:
+                try:
+                    if params.get("datatype") == "csv":
+                        yield from iter_csv_bars(response.iter_lines(),
+                                                 self._check_response_data,
+                                                 function)
+                    else:
+                        yield from iter_json_bars(
+                            response.iter_content(self.STREAM_CHUNK_SIZE),
+                            response_key, self._check_response_data,
+                            function)
+                except UnicodeDecodeError as err:
+                    raise ValueError("Failed to decode response from "
+                                     "Alpha Vantage API.") from err
+        except Exception as err:
+            if isinstance(err, ThrottleError):
+                if key is not None:
+                    self.key_pool.on_throttle(key)
+                elif self.rate_limiter is not None:
+                    self.rate_limiter.on_throttle()
+            elif isinstance(err, InvalidApiKeyError) and key is not None:
+                self.key_pool.on_invalid_key(key)
+            elif (self.adaptive_timeout is not None
+                    and isinstance(err, _lazy("requests").exceptions.Timeout)):
+                self.adaptive_timeout.observe(function, timeout)
+            if instrumentation is not None:
+                instrumentation.count(
+                    function,
+                    "throttles" if isinstance(err, ThrottleError)
+                    else "errors")
+            raise
+        finally:
+            if key is not None:
+                self.key_pool.release(key)
+        if key is not None:
+            self.key_pool.on_success(key)
+        elif self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+        if instrumentation is not None:
+            done = time.perf_counter()
+            instrumentation.span(function, "connect_wait", received - start)
+            instrumentation.span(function, "download", done - received)
+            instrumentation.span(function, "total", done - start)
+
+    def _open_stream(self, params, timeout):
+        """ Sends a streamed request once a rate-limit slot or pool key is
+        free, and checks its status.
+
+        Returns:
+            tuple: (response, pool key or None); the caller releases the
+                key.
+        """
+        cost = endpoints.cost_for(params.get("function"))
+        key = None
+        if self.key_pool is not None:
+            key = self.key_pool.acquire(cost, timeout=self.rate_limit_timeout)
+            params = dict(params, apikey=key)
+        elif self.rate_limiter is not None:
+            self._acquire_slot(cost)
+        response = None
+        try:
+            response = self._session.get(
+                self.base_url, params=params, timeout=timeout, stream=True)
             # Raises HTTPError for bad responses (4XX or 5XX)
             response.raise_for_status()
-            data = response.json()
-
-            if "Error Message" in data:
-                raise ValueError(
-                    f"Alpha Vantage API Error: {data[self.ERROR_MESSAGE]}")
-            elif "Information" in data:
-                if len(data.keys()) == 1:
-                    raise ValueError(
-                        f"Alpha Vantage API Info: {
-                            data[self.INFORMATION_MESSAGE]}")
+        except BaseException:
+            if response is not None:
+                response.close()
+            if key is not None:
+                self.key_pool.release(key)
+            raise
+        return response, key
+
+    def _timeout_for(self, function):
+        """ Returns the request timeout for an API function. """
+        if self.adaptive_timeout is None:
+            return self.SHORT_TIMEOUT
+        return self.adaptive_timeout.timeout_for(function)
+
+    def _fetch(self, params, response_key=None):
+        """ Performs the HTTP call and decodes and checks the response. """
+        instrumentation = self._instrumentation()
+        if self.adaptive_timeout is None and instrumentation is None:
+            return self._fetch_with_timeout(
+                params, response_key, self.SHORT_TIMEOUT)
+
+        function = params.get("function")
+        timeout = self._timeout_for(function)
+        if instrumentation is not None:
+            instrumentation.count(function, "requests")
+        start = time.perf_counter()
+        try:
+            data = self._fetch_with_timeout(
+                params, response_key, timeout, instrumentation)
+        except Exception as err:
+            if (self.adaptive_timeout is not None
+                    and isinstance(err, _lazy("requests").exceptions.Timeout)):
+                self.adaptive_timeout.observe(function, timeout)
+            if instrumentation is not None:
+                instrumentation.count(
+                    function,
+                    "throttles" if isinstance(err, ThrottleError)
+                    else "errors")
+            raise
+        latency = time.perf_counter() - start
+        if self.adaptive_timeout is not None:
+            self.adaptive_timeout.observe(function, latency)
+        if instrumentation is not None:
+            instrumentation.span(function, "total", latency)
+        return data
+
+    def _fetch_with_timeout(self, params, response_key, timeout,
+                            instrumentation=None):
+        try:
+            start = time.perf_counter() if instrumentation else 0.0
+            response = self._session.get(
+                self.base_url, params=params, timeout=timeout)
+            received = time.perf_counter() if instrumentation else 0.0
+            # Raises HTTPError for bad responses (4XX or 5XX)
+            response.raise_for_status()
+            data = self.decoder.decode(response, response_key)
+            decoded = time.perf_counter() if instrumentation else 0.0
+
+            self._check_response_data(data)
+            if instrumentation is not None:
+                self._record_phases(instrumentation, params.get("function"),
+                                    response, start, received, decoded)
             return data
 
-        except requests.exceptions.JSONDecodeError as err:
+        except (_lazy("requests").exceptions.JSONDecodeError,
+                json.JSONDecodeError, UnicodeDecodeError) as err:
             raise ValueError(
                 "Failed to decode JSON response from Alpha Vantage API.") from err
 
-    def get_currency_exchange_rate_response(self, from_currency, to_currency):
-        """
-        Fetches the currency exchange rate between two currencies. 
+    @staticmethod
+    def _record_phases(instrumentation, function, response, start, received,
+                       decoded):
+        """ Reports per-phase spans of one successful call. """
+        elapsed = getattr(response, "elapsed", None)
+        request_time = received - start
+        if isinstance(elapsed, timedelta):
+            # Time until the headers were parsed; the rest is the body.
+            wait = min(elapsed.total_seconds(), request_time)
+            instrumentation.span(function, "connect_wait", wait)
+            instrumentation.span(function, "download", request_time - wait)
+        else:
+            instrumentation.span(function, "connect_wait", request_time)
+        instrumentation.span(function, "decode", decoded - received)
+        instrumentation.span(
+            function, "validate", time.perf_counter() - decoded)
 
-        Args:
-            from_currency (str): The source currency code (e.g., "USD").
-            to_currency (str): The target currency code (e.g., "EUR").
+    def _instrumentation(self):
+        """ Returns the instrumentation if any hook is registered. """
+        if self.instrumentation is not None and self.instrumentation.hooks:
+            return self.instrumentation
+        return None
 
-        Returns:
-            dict: The API response data as a dictionary if successful.
+    def _call_endpoint(self, endpoint, params):
+        """ Requests a registered endpoint and returns its payload.
+
+        Args:
+            endpoint (Endpoint): See client/endpoints.py.
+            params (dict): Parameters built by endpoint.params().
 
         Raises:
             requests.exceptions.RequestException: For network or HTTP errors.
             ValueError: For API errors or unexpected response structure.
         """
-        params = {
-            "function": self.CURRENCY_EXCHANGE_RATE,
-            "from_currency": from_currency,
-            "to_currency": to_currency,
-            "apikey": self.api_key,
-        }
+        data = self._make_request(params, endpoint.response_key)
+        return self._extract_response_data(
+            data, endpoint.function, endpoint.response_key)
 
-        data = self._make_request(params)
-        if self.CURRENCY_EXCHANGE_RATE_RESPONSE_KEY in data:
-            return data[self.CURRENCY_EXCHANGE_RATE_RESPONSE_KEY]
+    def _call_stale_while_revalidate(self, endpoint, params):
+        """ Returns the endpoint result flagged fresh or stale, serving an
+        expired cache entry within max_staleness while it is refreshed in
+        the background.
+        """
+        key = make_cache_key(params)
+        entry = self.cache.get_stale(key)
+        stale = False
+        if entry is not None and entry[1] <= self.max_staleness:
+            data, stale_for = entry
+            if stale_for >= 0:
+                stale = True
+                self._revalidator.submit(key, self.refresh, params,
+                                         endpoint.response_key)
         else:
-            raise ValueError(
-                "Unexpected response structure for CURRENCY_EXCHANGE_RATE.")
+            data = self._load(key, params, endpoint.response_key)
+        payload = self._extract_response_data(
+            data, endpoint.function, endpoint.response_key)
+        return flag_stale(self._endpoint_result(endpoint, payload), stale)
 
     def get_symbol_search_response(self, keywords):
         """
-        Searches for stock symbols matching the given keywords.
+        Searches for stock symbols matching the given keywords. With a
+        symbol index, confident local matches are returned without an API
+        call.
 
         Args:
             keywords (str): The keywords to search for (e.g., "Tesla").
 
         Returns:
-            list: A list of matching symbols.
+            list: A list of matching symbols, as SymbolMatch records if
+                typed_results is set.
 
         Raises:
             requests.exceptions.RequestException:
                 For network or HTTP errors.
             ValueError: For API errors or unexpected response structure.
         """
-        params = {
-            "function": self.SYMBOL_SEARCH,
-            "keywords": keywords,
-            "apikey": self.api_key,
-        }
-        data = self._make_request(params)
+        if self.symbol_index is not None:
+            matches = self.symbol_index.lookup(keywords)
+            if matches is not None:
+                return self._symbol_search_result(matches)
+
+        matches = self._call_endpoint(
+            endpoints.SYMBOL_SEARCH,
+            endpoints.SYMBOL_SEARCH.params(self.api_key, keywords))
+        if self.symbol_index is not None:
+            self.symbol_index.add_matches(matches)
+        return self._symbol_search_result(matches)
+
+    def get_currency_exchange_rates(self, pairs,
+                                    max_workers=BATCH_MAX_WORKERS):
+        """
+        Fetches exchange rates for many currency pairs concurrently.
+
+        Pairs are normalized to upper case and deduplicated. A failing pair
+        is reported in the result and does not abort the batch.
+
+        Args:
+            pairs (iterable): (from_currency, to_currency) tuples.
+            max_workers (int): Max requests in flight.
+
+        Returns:
+            BatchResult: Per-pair BatchItem with the rate dict or the
+                exception and its latency, plus total wall-clock time.
+                See client/batch.py.
+        """
+        pairs = [(from_currency.strip().upper(), to_currency.strip().upper())
+                 for from_currency, to_currency in pairs]
+        return self.batch_call(self.CURRENCY_EXCHANGE_RATE, pairs, max_workers)
+
+    def batch_call(self, function, calls, max_workers=BATCH_MAX_WORKERS):
+        """
+        Calls any registered endpoint for many argument sets concurrently.
+
+        Each call goes through the endpoint's method, so caching, rate
+        limiting and typed results apply as for single calls. A failing
+        call is reported in the result and does not abort the batch.
 
-        if self.SYMBOL_SEARCH_RESPONSE_KEY in data:
-            return data[self.SYMBOL_SEARCH_RESPONSE_KEY]
+        Args:
+            function (str): Registered function name, e.g. "SYMBOL_SEARCH".
+            calls (iterable): Argument tuples in the endpoint's parameter
+                order; a single argument may be given bare.
+            max_workers (int): Max requests in flight.
+
+        Returns:
+            BatchResult: Per-call BatchItem keyed by argument tuple. See
+                client/batch.py.
+
+        Raises:
+            ValueError: For an unregistered function.
+        """
+        endpoint = endpoints.get_endpoint(function)
+        if endpoint.method:
+            fetch = getattr(self, endpoint.method)
         else:
-            raise ValueError(
-                "Unexpected response structure for SYMBOL_SEARCH.")
+            def fetch(*args):
+                return self._endpoint_result(endpoint, self._call_endpoint(
+                    endpoint, endpoint.params(self.api_key, *args)))
+        calls = [call if isinstance(call, tuple) else (call,)
+                 for call in calls]
+        return run_batch(fetch, calls, max_workers)
+
+    def get_fx_daily_response(self, from_symbol, to_symbol,
+                              outputsize="compact", columnar=None):
+        """
+        Fetches the daily FX series between two currencies.
+
+        Args:
+            from_symbol (str): The source currency code (e.g., "EUR").
+            to_symbol (str): The target currency code (e.g., "USD").
+            outputsize (str): "compact" for the last 100 days, "full" for
+                the whole history. For "full", iter_fx_daily() uses far
+                less memory.
+            columnar (str): "numpy" for a dict of column arrays, "pandas"
+                for a DataFrame; see client/columnar.py.
+
+        Returns:
+            dict: Bar dicts keyed by "YYYY-MM-DD", newest first, or a list
+                of Bar records if typed_results is set. With `columnar`,
+                "timestamp", "open", "high", "low" and "close" columns,
+                oldest first.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ImportError: If `columnar` needs numpy or pandas and it is not
+                installed.
+            ValueError: For API errors or unexpected response structure.
+        """
+        self._check_columnar(columnar)
+        endpoint = endpoints.FX_DAILY
+        series = self._call_endpoint(endpoint, endpoint.params(
+            self.api_key, from_symbol, to_symbol, outputsize))
+        return self._time_series_result(series, columnar)
+
+    def get_time_series_daily_response(self, symbol, outputsize="compact",
+                                       columnar=None):
+        """
+        Fetches the daily OHLCV series of an equity.
+
+        Args:
+            symbol (str): The equity symbol (e.g., "IBM").
+            outputsize (str): "compact" for the last 100 days, "full" for
+                20+ years of history. For "full", iter_time_series_daily()
+                uses far less memory.
+            columnar (str): "numpy" for a dict of column arrays, "pandas"
+                for a DataFrame; see client/columnar.py.
+
+        Returns:
+            dict: Bar dicts keyed by "YYYY-MM-DD", newest first, or a list
+                of Bar records if typed_results is set. With `columnar`,
+                "timestamp" and OHLCV columns, oldest first.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ImportError: If `columnar` needs numpy or pandas and it is not
+                installed.
+            ValueError: For API errors or unexpected response structure.
+        """
+        self._check_columnar(columnar)
+        endpoint = endpoints.TIME_SERIES_DAILY
+        series = self._call_endpoint(endpoint, endpoint.params(
+            self.api_key, symbol, outputsize))
+        return self._time_series_result(series, columnar)
+
+    def iter_fx_daily(self, from_symbol, to_symbol, outputsize="full",
+                      datatype="json"):
+        """
+        Streams the daily FX series, yielding each bar as it is parsed.
+
+        The request is sent when iteration starts. Memory use is bounded by
+        STREAM_CHUNK_SIZE, whatever the length of the history.
+
+        Args:
+            from_symbol (str): The source currency code (e.g., "EUR").
+            to_symbol (str): The target currency code (e.g., "USD").
+            outputsize (str): "full" or "compact".
+            datatype (str): Transfer format, "json" or "csv".
+
+        Yields:
+            Bar: One record per day, newest first; volume is None.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or a malformed response.
+        """
+        endpoint = endpoints.FX_DAILY
+        params = self._with_datatype(endpoint.params(
+            self.api_key, from_symbol, to_symbol, outputsize), datatype)
+        return self._stream(params, endpoint.response_key)
+
+    def iter_time_series_daily(self, symbol, outputsize="full",
+                               datatype="json"):
+        """
+        Streams the daily OHLCV series of an equity, yielding each bar as it
+        is parsed.
+
+        The request is sent when iteration starts. Memory use is bounded by
+        STREAM_CHUNK_SIZE, whatever the length of the history.
+
+        Args:
+            symbol (str): The equity symbol (e.g., "IBM").
+            outputsize (str): "full" or "compact".
+            datatype (str): Transfer format, "json" or "csv".
+
+        Yields:
+            Bar: One record per day, newest first.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or a malformed response.
+        """
+        endpoint = endpoints.TIME_SERIES_DAILY
+        params = self._with_datatype(endpoint.params(
+            self.api_key, symbol, outputsize), datatype)
+        return self._stream(params, endpoint.response_key)
+
+
+def _endpoint_method(endpoint):
+    """ Returns an AlphaVantageClient method for a registered endpoint. """
+    def method(self, *args, **kwargs):
+        params = endpoint.params(self.api_key, *args, **kwargs)
+        if endpoint.serve_stale and self.max_staleness is not None:
+            return self._call_stale_while_revalidate(endpoint, params)
+        return self._endpoint_result(
+            endpoint, self._call_endpoint(endpoint, params))
+
+    method.__signature__ = endpoint.signature()
+    method.__doc__ = endpoint.docstring(
+        "    requests.exceptions.RequestException: For network or HTTP "
+        "errors.\n"
+        "    ValueError: For API errors or unexpected response structure.")
+    return method
+
+
+endpoints.generate_methods(AlphaVantageClient, _endpoint_method)
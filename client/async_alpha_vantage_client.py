@@ -0,0 +1,144 @@
+""" client/async_alpha_vantage_client.py
+
+    Module for the asyncio API client implementation.
+
+    Requires the optional aiohttp package:
+        pip install aiohttp
+
+    aiohttp is imported when the first client is created, not at module
+    load; the module attribute `aiohttp` is None if it is not installed.
+
+"""
+import json
+
+from client import endpoints
+from client.alpha_vantage_client import BaseAlphaVantageClient
+from client.lazy_import import lazy_attributes
+
+_lazy, __getattr__ = lazy_attributes(
+    globals(), {"aiohttp": "aiohttp"}, optional=True)
+
+
+class AsyncAlphaVantageClient(BaseAlphaVantageClient):
+    """ Non-blocking counterpart of AlphaVantageClient.
+
+    Endpoint methods are generated from the registry in
+    client/endpoints.py; they, the constants and API error handling match
+    the blocking client. Requests go through one aiohttp session whose
+    connector keeps connections alive, so a single event loop can keep
+    many lookups in flight. Network errors surface as aiohttp.ClientError or
+    asyncio.TimeoutError instead of requests exceptions.
+
+    Usage:
+        async with AsyncAlphaVantageClient(api_key) as client:
+            rate = await client.get_currency_exchange_rate_response(
+                "USD", "EUR")
+    """
+
+    CONNECTION_LIMIT = 100  # Max simultaneous connections, all hosts.
+    DNS_CACHE_TTL = 300  # Seconds to cache resolved addresses.
+
+    def __init__(self, api_key, base_url=None,
+                 connection_limit=CONNECTION_LIMIT, timeout=None,
+                 typed_results=False):
+        """
+        Args:
+            api_key (str): Alpha Vantage API key.
+            base_url (str): Overrides BASE_URL, e.g. for a local stand-in.
+            connection_limit (int): Max simultaneous connections. Further
+                requests wait for a free connection.
+            timeout (float): Timeout in seconds for connecting and for
+                each socket read, defaults to SHORT_TIMEOUT. Time spent
+                waiting for a free pooled connection is not limited, as
+                with the blocking client.
+            typed_results (bool): Return ExchangeRate / SymbolMatch records
+                (client/models.py) instead of raw response dicts.
+
+        Raises:
+            ValueError: If no API key is provided.
+            ImportError: If aiohttp is not installed.
+        """
+        if _lazy("aiohttp") is None:
+            raise ImportError(
+                "AsyncAlphaVantageClient requires aiohttp: "
+                "pip install aiohttp")
+        super().__init__(api_key, base_url, typed_results)
+        self.connection_limit = connection_limit
+        self.timeout = self.SHORT_TIMEOUT if timeout is None else timeout
+        self._session = None
+
+    def _get_session(self):
+        """ Creates the session on first use, inside the running loop. """
+        if self._session is None or self._session.closed:
+            aiohttp = _lazy("aiohttp")
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit, ttl_dns_cache=self.DNS_CACHE_TTL)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.timeout,
+                    sock_read=self.timeout))
+        return self._session
+
+    async def close(self):
+        """ Closes the session and all pooled connections. """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _make_request(self, params):
+        """ Helper to make a request and return data.
+
+        Args: Parameter list
+
+        Returns:
+            dict: The API response data as a dictionary if successful.
+
+        Raises:
+            aiohttp.ClientError: For network or HTTP errors.
+            asyncio.TimeoutError: If the request exceeds the timeout.
+            ValueError: For API errors or unexpected response structure.
+        """
+        session = self._get_session()
+        async with session.get(self.base_url, params=params) as response:
+            # Raises ClientResponseError for bad responses (4XX or 5XX)
+            response.raise_for_status()
+            try:
+                data = await response.json(content_type=None)
+            except (json.JSONDecodeError, UnicodeDecodeError) as err:
+                raise ValueError(
+                    "Failed to decode JSON response from Alpha Vantage API."
+                ) from err
+        # aiohttp returns None for an empty body.
+        if not isinstance(data, dict):
+            raise ValueError(
+                "Failed to decode JSON response from Alpha Vantage API.")
+
+        self._check_response_data(data)
+        return data
+
+
+def _endpoint_method(endpoint):
+    """ Returns an AsyncAlphaVantageClient coroutine method for a
+    registered endpoint.
+    """
+    async def method(self, *args, **kwargs):
+        params = endpoint.params(self.api_key, *args, **kwargs)
+        data = await self._make_request(params)
+        return self._endpoint_result(endpoint, self._extract_response_data(
+            data, endpoint.function, endpoint.response_key))
+
+    method.__signature__ = endpoint.signature()
+    method.__doc__ = endpoint.docstring(
+        "    aiohttp.ClientError: For network or HTTP errors.\n"
+        "    ValueError: For API errors or unexpected response structure.")
+    return method
+
+
+endpoints.generate_methods(AsyncAlphaVantageClient, _endpoint_method)
@@ -0,0 +1,96 @@
+""" client/batch.py
+
+    Concurrent fan-out of many calls to one endpoint method.
+
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchItem:
+    """ Outcome of one call within a batch. """
+
+    __slots__ = ("key", "result", "error", "latency")
+
+    def __init__(self, key, result=None, error=None, latency=0.0):
+        self.key = key
+        self.result = result
+        self.error = error
+        self.latency = latency  # Seconds spent in the call.
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        outcome = "ok" if self.ok else f"error={self.error!r}"
+        return (f"BatchItem({self.key!r}, {outcome}, "
+                f"latency={self.latency:.3f}s)")
+
+
+class BatchResult:
+    """ Per-key outcomes of a batch, in input order, plus wall-clock time.
+
+    Indexing by key returns the BatchItem for that key.
+    """
+
+    def __init__(self, items, elapsed):
+        self.items = items  # dict: key -> BatchItem
+        self.elapsed = elapsed  # Seconds for the whole batch.
+
+    def __getitem__(self, key):
+        return self.items[key]
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def results(self):
+        """ dict: key -> result, for successful calls. """
+        return {key: item.result for key, item in self.items.items()
+                if item.ok}
+
+    @property
+    def errors(self):
+        """ dict: key -> exception, for failed calls. """
+        return {key: item.error for key, item in self.items.items()
+                if not item.ok}
+
+
+def run_batch(fetch, keys, max_workers):
+    """ Calls fetch(*key) for every distinct key on a bounded thread pool.
+
+    A failing call is recorded on its BatchItem and does not abort the rest
+    of the batch.
+
+    Args:
+        fetch (callable): Endpoint method to call.
+        keys (iterable): Argument tuples; duplicates are fetched once.
+        max_workers (int): Max calls in flight.
+
+    Returns:
+        BatchResult: Outcomes keyed by argument tuple.
+    """
+    unique_keys = list(dict.fromkeys(keys))
+
+    def call(key):
+        start = time.perf_counter()
+        try:
+            return BatchItem(key, result=fetch(*key),
+                             latency=time.perf_counter() - start)
+        except Exception as err:  # pylint: disable=broad-except
+            return BatchItem(key, error=err,
+                             latency=time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if unique_keys:
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(unique_keys))) as executor:
+            items = list(executor.map(call, unique_keys))
+    else:
+        items = []
+    return BatchResult({item.key: item for item in items},
+                       time.perf_counter() - start)
@@ -0,0 +1,164 @@
+""" client/cache.py
+
+    In-memory response cache for the API client.
+
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from client import endpoints
+
+
+# Parameters that do not change the response and are left out of the key.
+EXCLUDED_KEY_PARAMS = ("apikey",)
+
+
+def make_cache_key(params):
+    """ Builds a hashable cache key from request parameters.
+
+    The API key is left out, so clients sharing a cache share entries.
+    Alpha Vantage treats parameter values case-insensitively (e.g. "usd" and
+    "USD"), so values are stripped and upper-cased.
+
+    Args:
+        params (dict): Request parameters, including "function".
+
+    Returns:
+        tuple: Sorted (name, value) pairs.
+    """
+    return tuple(sorted(
+        (name, str(value).strip().upper())
+        for name, value in params.items()
+        if name not in EXCLUDED_KEY_PARAMS))
+
+
+def key_function(key):
+    """ Returns the API function name stored in a cache key. """
+    for name, value in key:
+        if name == "function":
+            return value
+    return None
+
+
+class ResponseCache:
+    """ Thread-safe TTL cache with LRU eviction for decoded API responses.
+
+    Entries expire after a per-function TTL. When the cache is full the least
+    recently used entry is evicted. Cached values are shared between callers
+    and must be treated as read-only.
+
+    Any object with the same get/set/clear interface can be passed to the
+    client as a cache; set() must accept the age keyword if a store is
+    used.
+    """
+
+    DEFAULT_MAX_SIZE = 1024
+    # Seconds, for functions without a TTL here or in the endpoint registry
+    # (client/endpoints.py).
+    DEFAULT_TTL = 60
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttls=None,
+                 default_ttl=DEFAULT_TTL, clock=time.monotonic):
+        """
+        Args:
+            max_size (int): Maximum number of entries.
+            ttls (dict): Function name to TTL in seconds, overriding the
+                endpoint registry's TTLs.
+            default_ttl (float): TTL for unregistered functions not in
+                ttls.
+            clock (callable): Monotonic time source, in seconds.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, function):
+        """ Returns the TTL in seconds for an API function. """
+        ttl = self.ttls.get(function)
+        if ttl is None:
+            ttl = endpoints.ttl_for(function, self.default_ttl)
+        return ttl
+
+    def get(self, key):
+        """ Returns the cached value, or None on a miss or expired entry. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key):
+        """ Returns (value, seconds past expiry) or None on a miss.
+
+        Unlike get(), expired entries are returned (with a positive second
+        value) and kept, for stale-while-revalidate. They still count as
+        misses.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            stale_for = self._clock() - expires_at
+            self._entries.move_to_end(key)
+            if stale_for >= 0:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value, stale_for
+
+    def set(self, key, value, age=0):
+        """ Stores a value with the TTL of the function in its key.
+
+        Args:
+            key (tuple): Cache key, see make_cache_key.
+            value: Decoded response.
+            age (float): Seconds the value is already old (e.g. when read
+                from a persistent store); deducted from the TTL.
+        """
+        expires_at = self._clock() + self.ttl_for(key_function(key)) - age
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """ Drops all entries. Counters are kept. """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Returns hit/miss/eviction counters and the current size. """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
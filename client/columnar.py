@@ -0,0 +1,106 @@
+""" client/columnar.py
+
+    Column-array output for daily time series.
+
+    Requires the optional numpy package, and pandas for DataFrames:
+        pip install numpy pandas
+
+    numpy and pandas are imported on first use, so importing the client
+    does not pay for them. Both are also available as module attributes,
+    None if not installed.
+
+"""
+import itertools
+from operator import itemgetter
+
+from client.lazy_import import lazy_attributes
+
+_lazy, __getattr__ = lazy_attributes(
+    globals(), {"numpy": "numpy", "pandas": "pandas"}, optional=True)
+
+
+# (column, response key); FX series have no volume.
+PRICE_FIELDS = (
+    ("open", "1. open"),
+    ("high", "2. high"),
+    ("low", "3. low"),
+    ("close", "4. close"),
+)
+VOLUME_FIELD = ("volume", "5. volume")
+
+FORMATS = ("numpy", "pandas")
+
+
+def series_columns(series):
+    """ Converts a date-keyed time series to column arrays, oldest first.
+
+    Parsing is done by NumPy in bulk: the dates go through one
+    datetime64 conversion and all prices and volumes through one float64
+    conversion, instead of float() and a date parse per value.
+
+    Args:
+        series (dict): "YYYY-MM-DD" keys to bar dicts, as in
+            "Time Series (Daily)".
+
+    Returns:
+        dict: "timestamp" as a datetime64[D] array, and "open", "high",
+            "low", "close" and, for equities, "volume" as float64 arrays.
+
+    Raises:
+        ImportError: If numpy is not installed.
+        ValueError: If a value is missing or malformed.
+    """
+    numpy = _lazy("numpy")
+    if numpy is None:
+        raise ImportError("Columnar output requires numpy: pip install numpy")
+    fields = PRICE_FIELDS
+    first = next(iter(series.values()), None)
+    if first is not None and VOLUME_FIELD[1] in first:
+        fields += (VOLUME_FIELD,)
+
+    values = itemgetter(*(key for _, key in fields))
+    try:
+        timestamps = numpy.array(list(series), dtype="datetime64[D]")
+        table = numpy.array(
+            list(itertools.chain.from_iterable(map(values, series.values()))),
+            dtype=numpy.float64).reshape(len(timestamps), len(fields))
+    except (KeyError, TypeError, ValueError) as err:
+        raise ValueError("Malformed time series response.") from err
+
+    # The API lists the newest bar first.
+    order = numpy.argsort(timestamps, kind="stable")
+    columns = {"timestamp": timestamps[order]}
+    for column, (name, _) in enumerate(fields):
+        columns[name] = table[order, column]
+    return columns
+
+
+def series_frame(series):
+    """ Converts a date-keyed time series to a DataFrame indexed by
+    timestamp, oldest first. Columns are as in series_columns().
+
+    Raises:
+        ImportError: If numpy or pandas is not installed.
+        ValueError: If a value is missing or malformed.
+    """
+    pandas = _lazy("pandas")
+    if pandas is None:
+        raise ImportError(
+            "DataFrame output requires pandas: pip install pandas")
+    columns = series_columns(series)
+    index = pandas.DatetimeIndex(columns.pop("timestamp"), name="timestamp")
+    return pandas.DataFrame(columns, index=index)
+
+
+def to_columnar(series, columnar):
+    """ Returns series_columns() for "numpy" or series_frame() for
+    "pandas".
+
+    Raises:
+        ValueError: For another format.
+    """
+    if columnar == "numpy":
+        return series_columns(series)
+    if columnar == "pandas":
+        return series_frame(series)
+    raise ValueError(f"columnar must be one of {', '.join(FORMATS)}.")
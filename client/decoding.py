@@ -0,0 +1,75 @@
+""" client/decoding.py
+
+    Pluggable JSON decoders for API responses.
+
+    A decoder has one method, decode(response, response_key), returning the
+    response data as a dict. response_key names the part of the payload the
+    caller will use; a decoder may drop the other top-level keys.
+
+    The optional orjson backend is imported when a FastJSONDecoder is
+    created; the module attribute `orjson` is None if it is not installed.
+
+"""
+import json
+
+from client.lazy_import import lazy_attributes
+
+_lazy, __getattr__ = lazy_attributes(
+    globals(), {"orjson": "orjson"}, optional=True)
+
+
+class ResponseDecoder:
+    """ Decodes the whole body with requests' Response.json(). """
+
+    def decode(self, response, response_key=None):  # pylint: disable=W0613
+        return response.json()
+
+
+class FastJSONDecoder:
+    """ Decodes straight from the raw response bytes, with orjson when it
+    is installed and the stdlib parser otherwise.
+
+    The whole body is parsed. Given a response_key, only that key and the
+    API message keys are kept from the top level of the payload, so the
+    rest is not held by the cache.
+    Payloads that are not objects are returned unchanged and the usual
+    checks apply.
+    """
+
+    # Top-level keys that are always kept, so API messages are not lost.
+    MESSAGE_KEYS = ("Error Message", "Information")
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend (str): "orjson" or "json"; defaults to orjson if it is
+                installed.
+
+        Raises:
+            ImportError: If "orjson" is requested but not installed.
+        """
+        orjson = _lazy("orjson")
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        if backend == "orjson" and orjson is None:
+            raise ImportError("FastJSONDecoder backend requires orjson: "
+                              "pip install orjson")
+        if backend not in ("orjson", "json"):
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        self.backend = backend
+        self._loads = orjson.loads if backend == "orjson" else json.loads
+
+    def decode(self, response, response_key=None):
+        return self.loads(response.content, response_key)
+
+    def loads(self, body, response_key=None):
+        """ Decodes a JSON body given as bytes.
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON.
+        """
+        data = self._loads(body)
+        if response_key is None or not isinstance(data, dict):
+            return data
+        return {key: data[key] for key in
+                (response_key,) + self.MESSAGE_KEYS if key in data}
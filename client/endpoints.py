@@ -0,0 +1,295 @@
+""" client/endpoints.py
+
+    Declarative registry of the supported API functions.
+
+    Each Endpoint describes one function: its parameters, response key,
+    cache TTL and rate-limit cost. The clients build and validate request
+    parameters from it and generate endpoint methods from it, and the
+    cache, store and rate limiter look TTLs and costs up here. Supporting a
+    new function is a single register() call.
+
+"""
+import inspect
+import textwrap
+
+DEFAULT_TTL = 60  # Seconds.
+DEFAULT_COST = 1  # Rate-limit tokens per call.
+
+
+class Param:
+    """ One request parameter of an endpoint. """
+
+    __slots__ = ("name", "default", "choices", "doc")
+
+    def __init__(self, name, default=None, choices=None, doc=""):
+        """
+        Args:
+            name (str): Query parameter name.
+            default: Value sent when the caller passes none; only for
+                optional parameters. None leaves the parameter out.
+            choices (tuple): Allowed values, or None for any.
+            doc (str): Description for generated docstrings.
+        """
+        self.name = name
+        self.default = default
+        self.choices = tuple(choices) if choices is not None else None
+        self.doc = doc
+
+
+class Endpoint:
+    """ Description of one API function.
+
+    Parameter names, their order and the constant part of the request are
+    computed once here, so building a call's params is a dict copy plus
+    the caller's values.
+    """
+
+    def __init__(self, function, response_key, required=(), optional=(),
+                 ttl=DEFAULT_TTL, cost=DEFAULT_COST, method=None,
+                 result=None, cache_result=False, serve_stale=False,
+                 description="", returns=""):
+        """
+        Args:
+            function (str): API function name, e.g. "SYMBOL_SEARCH".
+            response_key (str): Top-level key holding the payload.
+            required (tuple): Required Params, in positional order.
+            optional (tuple): Optional Params, after the required ones.
+            ttl (float): Seconds a response may be cached or stored.
+            cost (int): Rate-limit tokens a call consumes.
+            method (str): Client method name to generate, if any.
+            result (str): Name of the client method converting the payload
+                for typed_results, e.g. "_exchange_rate_result".
+            cache_result (bool): In typed mode, convert the payload once
+                when it is loaded and cache the result in its place. Only
+                for results that do not depend on call options.
+            serve_stale (bool): Allow stale-while-revalidate; the payload
+                carries "6. Last Refreshed" for its age.
+            description (str): Summary line of the generated docstring.
+            returns (str): Returns section of the generated docstring.
+        """
+        self.function = function
+        self.response_key = response_key
+        self.required = tuple(required)
+        self.optional = tuple(optional)
+        self.ttl = ttl
+        self.cost = cost
+        self.method = method
+        self.result = result
+        self.cache_result = cache_result
+        self.serve_stale = serve_stale
+        self.description = description
+        self.returns = returns
+        self.params_by_name = {param.name: param
+                               for param in self.required + self.optional}
+        self.param_names = tuple(self.params_by_name)
+        self._template = {"function": function}
+
+    def __repr__(self):
+        return f"Endpoint({self.function!r})"
+
+    def params(self, api_key, *args, **kwargs):
+        """ Builds the request parameters of one call.
+
+        Arguments bind like a function signature: required parameters
+        first, then optional ones, positionally or by name.
+
+        Returns:
+            dict: Request parameters, including "function" and "apikey".
+
+        Raises:
+            TypeError: For unknown or repeated arguments.
+            ValueError: For a missing required value or a value outside
+                the parameter's choices.
+        """
+        if len(args) > len(self.param_names):
+            raise TypeError(
+                f"{self.function} takes at most {len(self.param_names)} "
+                f"arguments ({len(args)} given).")
+        values = dict(zip(self.param_names, args))
+        for name, value in kwargs.items():
+            if name not in self.params_by_name:
+                raise TypeError(
+                    f"{self.function} got an unexpected argument {name!r}.")
+            if name in values:
+                raise TypeError(
+                    f"{self.function} got multiple values for {name!r}.")
+            values[name] = value
+
+        params = self._template.copy()
+        for param in self.required:
+            value = values.get(param.name)
+            if value is None:
+                raise ValueError(
+                    f"{self.function} requires {param.name}.")
+            params[param.name] = self._checked(param, value)
+        for param in self.optional:
+            value = values.get(param.name)
+            if value is None:
+                value = param.default
+            if value is not None:
+                params[param.name] = self._checked(param, value)
+        params["apikey"] = api_key
+        return params
+
+    def _checked(self, param, value):
+        if param.choices is not None and value not in param.choices:
+            raise ValueError(
+                f"{param.name} must be one of {', '.join(param.choices)}.")
+        return value
+
+    def signature(self):
+        """ Returns the inspect.Signature of a generated method. """
+        parameters = [inspect.Parameter(
+            "self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        parameters += [inspect.Parameter(
+            param.name, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            for param in self.required]
+        parameters += [inspect.Parameter(
+            param.name, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            default=param.default) for param in self.optional]
+        return inspect.Signature(parameters)
+
+    def docstring(self, raises):
+        """ Returns the docstring of a generated method.
+
+        Args:
+            raises (str): Raises section for the client's transport.
+        """
+        lines = [self.description, "", "Args:"]
+        for param in self.required + self.optional:
+            lines.append(textwrap.fill(
+                f"{param.name} (str): {param.doc}", 72,
+                initial_indent="    ", subsequent_indent="        "))
+        lines += ["", "Returns:", textwrap.fill(
+            self.returns, 72, initial_indent="    ",
+            subsequent_indent="        ")]
+        lines += ["", "Raises:", raises]
+        return "\n".join(lines)
+
+
+ENDPOINTS = {}  # Function name -> Endpoint.
+
+
+def register(endpoint):
+    """ Adds an endpoint to the registry, replacing one of the same name.
+
+    Client methods are generated when the client module is imported; for
+    an endpoint registered later, call generate_methods() again.
+    """
+    ENDPOINTS[endpoint.function] = endpoint
+    return endpoint
+
+
+def get_endpoint(function):
+    """ Returns the registered endpoint.
+
+    Raises:
+        ValueError: For an unknown function.
+    """
+    try:
+        return ENDPOINTS[function]
+    except KeyError:
+        raise ValueError(f"Unsupported function: {function}") from None
+
+
+def ttl_for(function, default=DEFAULT_TTL):
+    """ Returns the cache TTL of a function, or `default` if unknown. """
+    endpoint = ENDPOINTS.get(function)
+    return endpoint.ttl if endpoint is not None else default
+
+
+def cost_for(function):
+    """ Returns the rate-limit cost of a function; unknown ones cost one.
+    """
+    endpoint = ENDPOINTS.get(function)
+    return endpoint.cost if endpoint is not None else DEFAULT_COST
+
+
+def generate_methods(cls, make_method):
+    """ Adds a method to `cls` for every endpoint with a method name that
+    `cls` does not define itself.
+
+    Args:
+        cls (type): Client class.
+        make_method (callable): Returns the method function for an
+            Endpoint.
+
+    Returns:
+        type: `cls`, so this can be used as a class decorator.
+    """
+    for endpoint in ENDPOINTS.values():
+        if endpoint.method and endpoint.method not in vars(cls):
+            method = make_method(endpoint)
+            method.__name__ = endpoint.method
+            method.__qualname__ = f"{cls.__name__}.{endpoint.method}"
+            setattr(cls, endpoint.method, method)
+    return cls
+
+
+OUTPUT_SIZES = ("compact", "full")  # Last 100 bars, or full history.
+DATATYPES = ("json", "csv")
+
+CURRENCY_EXCHANGE_RATE = register(Endpoint(
+    "CURRENCY_EXCHANGE_RATE", "Realtime Currency Exchange Rate",
+    required=(
+        Param("from_currency", doc='The source currency code (e.g., "USD").'),
+        Param("to_currency", doc='The target currency code (e.g., "EUR").'),
+    ),
+    ttl=60,
+    method="get_currency_exchange_rate_response",
+    result="_exchange_rate_result",
+    cache_result=True,
+    serve_stale=True,
+    description="Fetches the currency exchange rate between two currencies.",
+    returns="dict: The API response data as a dictionary if successful, "
+            "or an ExchangeRate if typed_results is set.",
+))
+
+SYMBOL_SEARCH = register(Endpoint(
+    "SYMBOL_SEARCH", "bestMatches",
+    required=(
+        Param("keywords",
+              doc='The keywords to search for (e.g., "Tesla").'),
+    ),
+    ttl=24 * 60 * 60,
+    method="get_symbol_search_response",
+    result="_symbol_search_result",
+    cache_result=True,
+    description="Searches for stock symbols matching the given keywords.",
+    returns="list: A list of matching symbols, as SymbolMatch records if "
+            "typed_results is set.",
+))
+
+# Time series also accept datatype (DATATYPES); only the streaming methods
+# send it, as the other paths decode JSON.
+_OUTPUT_SIZE = Param("outputsize", "compact", OUTPUT_SIZES,
+                     doc='"compact" for the last 100 days, "full" for the '
+                         'whole history.')
+_TIME_SERIES_RETURNS = (
+    'dict: Bar dicts keyed by "YYYY-MM-DD", newest first, or a list of Bar '
+    "records if typed_results is set.")
+
+FX_DAILY = register(Endpoint(
+    "FX_DAILY", "Time Series FX (Daily)",
+    required=(
+        Param("from_symbol", doc='The source currency code (e.g., "EUR").'),
+        Param("to_symbol", doc='The target currency code (e.g., "USD").'),
+    ),
+    optional=(_OUTPUT_SIZE,),
+    ttl=60 * 60,  # One new bar per day.
+    method="get_fx_daily_response",
+    result="_time_series_result",
+    description="Fetches the daily FX series between two currencies.",
+    returns=_TIME_SERIES_RETURNS,
+))
+
+TIME_SERIES_DAILY = register(Endpoint(
+    "TIME_SERIES_DAILY", "Time Series (Daily)",
+    required=(Param("symbol", doc='The equity symbol (e.g., "IBM").'),),
+    optional=(_OUTPUT_SIZE,),
+    ttl=60 * 60,
+    method="get_time_series_daily_response",
+    result="_time_series_result",
+    description="Fetches the daily OHLCV series of an equity.",
+    returns=_TIME_SERIES_RETURNS,
+))
@@ -0,0 +1,20 @@
+""" client/exceptions.py
+
+    Exceptions raised by the API client.
+
+    API-level failures derive from ValueError, which the client has always
+    raised for them, so existing `except ValueError` handlers keep working.
+
+"""
+
+
+class ThrottleError(ValueError):
+    """ The API answered with a lone "Information" rate-limit message. """
+
+
+class RateLimitTimeout(ValueError):
+    """ The client-side rate limiter could not grant a request in time. """
+
+
+class InvalidApiKeyError(ValueError):
+    """ The API answered with an "Error Message" rejecting the API key. """
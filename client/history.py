@@ -0,0 +1,292 @@
+""" client/history.py
+
+    Incremental refresh of daily time series against a local history.
+
+"""
+import json
+import os
+import re
+import threading
+import time
+
+from client import endpoints
+from client.cache import make_cache_key
+
+# Parameters that select the window, not the series; left out of the key.
+WINDOW_PARAMS = ("outputsize",)
+
+
+def _size(series):
+    """ Returns the compact-JSON size of a series, in bytes. """
+    return len(json.dumps(series, separators=(",", ":")).encode("utf-8"))
+
+
+class HistoryStore:
+    """ Directory of full daily histories, one JSON file per series.
+
+    Files are replaced atomically, so a crash never leaves a half-written
+    history behind.
+    """
+
+    _UNSAFE = re.compile(r"[^A-Za-z0-9.]+")
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Where histories are kept; created if missing.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        """ Returns the file of a series, e.g. "FX_DAILY-EUR-USD.json". """
+        values = [value for name, value in key if name == "function"]
+        values += [value for name, value in key if name != "function"]
+        name = "-".join(self._UNSAFE.sub("_", value) for value in values)
+        return os.path.join(self.directory, name + ".json")
+
+    def load(self, key):
+        """ Returns the stored record, or None if the series is unknown.
+
+        Returns:
+            dict: "series" (date-keyed bars, newest first), "full_pull" and
+                "synced" (wall-clock timestamps).
+        """
+        try:
+            with open(self.path_for(key), encoding="utf-8") as source:
+                return json.load(source)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, record):
+        """ Writes the record of a series. """
+        path = self.path_for(key)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as out:
+            json.dump(record, out, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+
+class SyncReport:
+    """ Outcome of one HistorySync.sync() call.
+
+    mode is "full" (no usable history), "gap" (the compact window did not
+    reach the stored bars, so the history was pulled again), "incremental"
+    or "skipped" (synced within min_interval; no call made).
+    """
+
+    __slots__ = ("function", "key", "mode", "new_bars", "changed_bars",
+                 "bytes_downloaded", "bytes_saved", "calls_made",
+                 "calls_saved")
+
+    def __init__(self, function, key, mode, new_bars=0, changed_bars=0,
+                 bytes_downloaded=0, bytes_saved=0, calls_made=0,
+                 calls_saved=0):
+        self.function = function
+        self.key = key
+        self.mode = mode
+        self.new_bars = new_bars
+        self.changed_bars = changed_bars
+        self.bytes_downloaded = bytes_downloaded
+        self.bytes_saved = bytes_saved
+        self.calls_made = calls_made
+        self.calls_saved = calls_saved
+
+    def __repr__(self):
+        return (f"SyncReport({self.function}, mode={self.mode}, "
+                f"new={self.new_bars}, changed={self.changed_bars}, "
+                f"downloaded={self.bytes_downloaded}, "
+                f"saved={self.bytes_saved})")
+
+
+class HistorySync:
+    """ Keeps full daily histories current with compact requests.
+
+    The first sync of a series pulls outputsize=full and stores it. Later
+    syncs fetch only the compact window (the last 100 bars), add new bars
+    and replace changed ones. If the window does not overlap the stored
+    history (the series was not synced for over 100 trading days) or
+    disagrees with it about which days exist, the full history is pulled
+    again instead of leaving a hole.
+
+    Byte counts are compact-JSON sizes of the decoded series, a stable
+    proxy for transfer size. Savings compare against pulling the full
+    history every time.
+
+    Usage:
+        sync = HistorySync(client, HistoryStore("history"))
+        sync.sync("TIME_SERIES_DAILY", "IBM")
+        series = sync.history("TIME_SERIES_DAILY", "IBM")
+    """
+
+    MIN_INTERVAL = 60 * 60  # Seconds between calls for the same series.
+
+    def __init__(self, client, store, min_interval=MIN_INTERVAL,
+                 full_refresh_interval=None, clock=time.time):
+        """
+        Args:
+            client (AlphaVantageClient): Client making the calls; its cache,
+                rate limiter and retries apply.
+            store (HistoryStore): Where full histories are kept.
+            min_interval (float): Syncs within this many seconds of the
+                last one make no call.
+            full_refresh_interval (float): Pull the full history again
+                after this many seconds, e.g. to pick up restated bars;
+                None never does.
+            clock (callable): Wall-clock time source, in seconds.
+        """
+        self.client = client
+        self.store = store
+        self.min_interval = min_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Totals over all syncs.
+        self.full_pulls = 0
+        self.incremental_pulls = 0
+        self.skipped = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.calls_saved = 0
+
+    @staticmethod
+    def _key(params):
+        return make_cache_key({
+            name: value for name, value in params.items()
+            if name not in WINDOW_PARAMS})
+
+    def history(self, function, *args):
+        """ Returns the stored series (date-keyed bars, newest first), or
+        None if it was never synced.
+        """
+        endpoint = endpoints.get_endpoint(function)
+        params = endpoint.params(self.client.api_key, *args)
+        record = self.store.load(self._key(params))
+        return record["series"] if record is not None else None
+
+    def sync(self, function, *args):
+        """ Brings the stored history of one series up to date.
+
+        Args:
+            function (str): A daily series function, e.g. "FX_DAILY".
+            *args: The endpoint's series arguments, e.g. "EUR", "USD".
+
+        Returns:
+            SyncReport: What was fetched and saved.
+
+        Raises:
+            requests.exceptions.RequestException: For network or HTTP errors.
+            ValueError: For API errors or unexpected response structure.
+        """
+        endpoint = endpoints.get_endpoint(function)
+        base = endpoint.params(self.client.api_key, *args)
+        key = self._key(base)
+        record = self.store.load(key)
+        now = self._clock()
+
+        if record is not None and now - record["synced"] < self.min_interval:
+            report = SyncReport(function, key, "skipped",
+                                bytes_saved=_size(record["series"]),
+                                calls_saved=1)
+        elif record is None or (
+                self.full_refresh_interval is not None
+                and now - record["full_pull"] >= self.full_refresh_interval):
+            report = self._pull_full(endpoint, base, key, now, "full")
+        else:
+            report = self._pull_compact(endpoint, base, key, record, now)
+        self._count(report)
+        return report
+
+    def sync_many(self, function, calls):
+        """ Syncs several series one after another.
+
+        Returns:
+            list: SyncReport per call, in order.
+        """
+        return [self.sync(function, *(call if isinstance(call, tuple)
+                                       else (call,)))
+                for call in calls]
+
+    def _fetch(self, endpoint, base, outputsize):
+        params = dict(base, outputsize=outputsize)
+        return self.client._call_endpoint(endpoint, params)
+
+    def _pull_full(self, endpoint, base, key, now, mode, calls_made=1,
+                   bytes_downloaded=0):
+        series = self._fetch(endpoint, base, "full")
+        self.store.save(key, {"series": series, "full_pull": now,
+                              "synced": now})
+        return SyncReport(endpoint.function, key, mode,
+                          new_bars=len(series),
+                          bytes_downloaded=bytes_downloaded + _size(series),
+                          calls_made=calls_made)
+
+    def _pull_compact(self, endpoint, base, key, record, now):
+        window = self._fetch(endpoint, base, "compact")
+        downloaded = _size(window)
+        stored = record["series"]
+        if self._has_gap(window, stored):
+            return self._pull_full(endpoint, base, key, now, "gap",
+                                   calls_made=2, bytes_downloaded=downloaded)
+
+        new_bars = changed_bars = 0
+        merged = {}
+        for day, bar in window.items():
+            previous = stored.get(day)
+            if previous is None:
+                new_bars += 1
+            elif previous != bar:
+                changed_bars += 1
+            merged[day] = bar
+        for day, bar in stored.items():
+            merged.setdefault(day, bar)
+        # Newest first, as the API returns it; ISO dates sort as strings.
+        series = dict(sorted(merged.items(), reverse=True))
+        self.store.save(key, {"series": series,
+                              "full_pull": record["full_pull"],
+                              "synced": now})
+        return SyncReport(endpoint.function, key, "incremental",
+                          new_bars=new_bars, changed_bars=changed_bars,
+                          bytes_downloaded=downloaded,
+                          bytes_saved=max(0, _size(series) - downloaded),
+                          calls_made=1)
+
+    @staticmethod
+    def _has_gap(window, stored):
+        """ Returns True if the window cannot be merged safely: it does not
+        reach back to the newest stored bar, or a stored day inside the
+        window is missing from it.
+        """
+        if not stored:
+            return True
+        if not window:
+            return False
+        oldest = min(window)
+        newest_stored = max(stored)
+        if oldest > newest_stored:
+            return True
+        return any(day not in window for day in stored if day >= oldest)
+
+    def _count(self, report):
+        with self._lock:
+            if report.mode == "skipped":
+                self.skipped += 1
+            elif report.mode == "incremental":
+                self.incremental_pulls += 1
+            else:
+                self.full_pulls += 1
+            self.bytes_downloaded += report.bytes_downloaded
+            self.bytes_saved += report.bytes_saved
+            self.calls_saved += report.calls_saved
+
+    def stats(self):
+        """ Returns the totals over all syncs as a dict. """
+        with self._lock:
+            return {
+                "full_pulls": self.full_pulls,
+                "incremental_pulls": self.incremental_pulls,
+                "skipped": self.skipped,
+                "bytes_downloaded": self.bytes_downloaded,
+                "bytes_saved": self.bytes_saved,
+                "calls_saved": self.calls_saved,
+            }
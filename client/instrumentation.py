@@ -0,0 +1,164 @@
+""" client/instrumentation.py
+
+    Timing and counter hooks for API calls.
+
+    The client reports two kinds of events to an Instrumentation object:
+
+        span(function, phase, seconds): time spent in one phase of a call.
+        count(function, name, amount): a counted event.
+
+    Phases are "connect_wait" (DNS, connect, TLS and server wait until the
+    response headers arrive; requests does not expose these separately),
+    "download" (body transfer), "decode", "validate" and "total". Counters
+    are "requests", "errors", "throttles", "cache_hits" and "cache_misses".
+
+    Events are forwarded to registered hooks. With no hook registered the
+    client skips all timing, so the overhead is a single attribute check.
+
+"""
+import bisect
+import logging
+import threading
+
+
+class Hook:
+    """ Base hook; override the events you need. """
+
+    def on_span(self, function, phase, seconds):
+        pass
+
+    def on_count(self, function, name, amount):
+        pass
+
+
+class Instrumentation:
+    """ Fans out client events to the registered hooks. """
+
+    def __init__(self, *hooks):
+        self.hooks = list(hooks)
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def span(self, function, phase, seconds):
+        for hook in self.hooks:
+            hook.on_span(function, phase, seconds)
+
+    def count(self, function, name, amount=1):
+        for hook in self.hooks:
+            hook.on_count(function, name, amount)
+
+
+class CallbackHook(Hook):
+    """ Calls callback(kind, function, name, value) for every event, with
+    kind "span" (name is the phase, value seconds) or "count".
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def on_span(self, function, phase, seconds):
+        self.callback("span", function, phase, seconds)
+
+    def on_count(self, function, name, amount):
+        self.callback("count", function, name, amount)
+
+
+class LoggingHook(Hook):
+    """ Logs every event, by default at DEBUG level. """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("client.instrumentation")
+        self.level = level
+
+    def on_span(self, function, phase, seconds):
+        self.logger.log(self.level, "%s %s %.6fs", function, phase, seconds)
+
+    def on_count(self, function, name, amount):
+        self.logger.log(self.level, "%s %s +%s", function, name, amount)
+
+
+class Histogram:
+    """ Cumulative-bucket latency histogram. """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """ Returns (upper bound, count <= bound) pairs, ending with +Inf.
+        """
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        pairs.append((float("inf"), self.count))
+        return pairs
+
+
+class PrometheusHook(Hook):
+    """ Aggregates events into histograms and counters and exports them in
+    the Prometheus text exposition format.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, namespace="alphavantage", buckets=BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.histograms = {}  # (function, phase) -> Histogram
+        self.counters = {}  # (function, name) -> int
+        self._lock = threading.Lock()
+
+    def on_span(self, function, phase, seconds):
+        with self._lock:
+            histogram = self.histograms.get((function, phase))
+            if histogram is None:
+                histogram = self.histograms[(function, phase)] = Histogram(
+                    self.buckets)
+            histogram.observe(seconds)
+
+    def on_count(self, function, name, amount):
+        with self._lock:
+            key = (function, name)
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def export(self):
+        """ Returns all metrics as Prometheus exposition text. """
+        name = f"{self.namespace}_request_phase_seconds"
+        lines = [f"# HELP {name} Time spent per phase of an API call.",
+                 f"# TYPE {name} histogram"]
+        with self._lock:
+            for (function, phase), histogram in sorted(
+                    self.histograms.items()):
+                labels = f'function="{function}",phase="{phase}"'
+                for bound, count in histogram.cumulative():
+                    bound = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            name = f"{self.namespace}_events_total"
+            lines += [f"# HELP {name} Counted API client events.",
+                      f"# TYPE {name} counter"]
+            for (function, event), count in sorted(self.counters.items()):
+                lines.append(
+                    f'{name}{{function="{function}",event="{event}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,157 @@
+""" client/key_pool.py
+
+    Load balancing of calls over several Alpha Vantage API keys.
+
+"""
+import threading
+import time
+
+from client.exceptions import RateLimitTimeout
+from client.rate_limit import RateLimiter
+
+
+class KeyPool:
+    """ API keys with one rate limiter each; calls go to the least-loaded
+    key.
+
+    A key's load is the time a call would wait in its limiter's queue, then
+    its spent quota (fewest tokens left), then its calls in flight. Quotas
+    are per key, so N keys allow N times the calls of one. A key that
+    answers with a throttle message is taken out of rotation for
+    throttle_cooldown seconds, one whose key the API rejects for
+    invalid_key_cooldown seconds.
+
+    Usage:
+        pool = KeyPool(["KEY1", "KEY2", "KEY3"])
+        client = AlphaVantageClient(key_pool=pool)
+    """
+
+    THROTTLE_COOLDOWN = 60.0  # Seconds.
+    INVALID_KEY_COOLDOWN = 60 * 60.0  # Seconds.
+
+    def __init__(self, api_keys, limiter_factory=None,
+                 throttle_cooldown=THROTTLE_COOLDOWN,
+                 invalid_key_cooldown=INVALID_KEY_COOLDOWN,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            api_keys (iterable): Alpha Vantage API keys.
+            limiter_factory (callable): Returns the RateLimiter of a key;
+                defaults to the process-wide RateLimiter.for_api_key().
+            throttle_cooldown (float): Seconds a throttled key is skipped.
+            invalid_key_cooldown (float): Seconds a rejected key is skipped.
+            clock (callable): Monotonic time source, in seconds.
+            sleep (callable): Sleep function, in seconds.
+
+        Raises:
+            ValueError: If no API key is given.
+        """
+        self.api_keys = list(dict.fromkeys(api_keys))
+        if not self.api_keys:
+            raise ValueError("At least one API key is required.")
+        if limiter_factory is None:
+            limiter_factory = RateLimiter.for_api_key
+        self.limiters = {key: limiter_factory(key) for key in self.api_keys}
+        self.throttle_cooldown = throttle_cooldown
+        self.invalid_key_cooldown = invalid_key_cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._in_flight = dict.fromkeys(self.api_keys, 0)
+        self._disabled_until = {}  # Key -> clock time it rejoins rotation.
+        self._lock = threading.Lock()
+        self.calls = dict.fromkeys(self.api_keys, 0)  # Calls granted per key.
+
+    def __len__(self):
+        return len(self.api_keys)
+
+    def active_keys(self):
+        """ Returns the keys currently in rotation. """
+        with self._lock:
+            return self._active_locked(self._clock())
+
+    def _active_locked(self, now):
+        for key, until in list(self._disabled_until.items()):
+            if until <= now:
+                del self._disabled_until[key]
+        return [key for key in self.api_keys
+                if key not in self._disabled_until]
+
+    def _load_locked(self, key):
+        limiter = self.limiters[key]
+        return (limiter.queue_wait, -limiter.available, self._in_flight[key])
+
+    def acquire(self, cost=1, timeout=None):
+        """ Picks the least-loaded key and takes `cost` tokens from its
+        limiter, waiting if every key is busy. Pair with release().
+
+        Args:
+            cost (int): Tokens the call consumes.
+            timeout (float): Max seconds to wait; None waits as long as
+                needed.
+
+        Returns:
+            str: The API key to use.
+
+        Raises:
+            RateLimitTimeout: If no key can take the call within `timeout`.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                active = self._active_locked(self._clock())
+                if active:
+                    ranked = sorted(active, key=self._load_locked)
+                    for key in ranked:
+                        if self.limiters[key].try_acquire(cost):
+                            self._in_flight[key] += 1
+                            self.calls[key] += 1
+                            return key
+                    # Every key is busy: queue on the one free soonest.
+                    key = ranked[0]
+                    self._in_flight[key] += 1
+                else:
+                    wake = min(self._disabled_until.values())
+
+            if active:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(0.0, deadline - self._clock())
+                if self.limiters[key].acquire(cost, timeout=remaining):
+                    with self._lock:
+                        self.calls[key] += 1
+                    return key
+                self.release(key)
+                raise RateLimitTimeout(
+                    f"Key pool: no request slot within {timeout} seconds.")
+            if deadline is not None and wake > deadline:
+                raise RateLimitTimeout(
+                    "Key pool: every API key is out of rotation.")
+            self._sleep(max(0.0, wake - self._clock()))
+
+    def release(self, key):
+        """ Marks a call made with `key` as finished. """
+        with self._lock:
+            self._in_flight[key] -= 1
+
+    def on_success(self, key):
+        """ Reports a successful call, shrinking the key's backoff. """
+        self.limiters[key].on_success()
+
+    def on_throttle(self, key):
+        """ Reports a throttle answer: backs the key's limiter off and takes
+        the key out of rotation for throttle_cooldown seconds.
+        """
+        self.limiters[key].on_throttle()
+        self._disable(key, self.throttle_cooldown)
+
+    def on_invalid_key(self, key):
+        """ Reports that the API rejected the key: takes it out of rotation
+        for invalid_key_cooldown seconds.
+        """
+        self._disable(key, self.invalid_key_cooldown)
+
+    def _disable(self, key, seconds):
+        with self._lock:
+            until = self._clock() + seconds
+            self._disabled_until[key] = max(
+                until, self._disabled_until.get(key, until))
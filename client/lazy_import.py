@@ -0,0 +1,59 @@
+""" client/lazy_import.py
+
+    Module attributes imported on first access.
+
+    Heavy and optional dependencies (requests, numpy, pandas, orjson,
+    aiohttp) are loaded only when a feature needs them, so importing the
+    client stays cheap. A module declares them once:
+
+        _lazy, __getattr__ = lazy_attributes(globals(), {
+            "requests": "requests",
+            "HTTPAdapter": "requests.adapters:HTTPAdapter",
+        })
+
+    and uses _lazy("requests") where it needs the module. The names are
+    also module attributes, so patch("module.requests...") still works.
+
+"""
+import importlib
+
+
+def lazy_attributes(namespace, specs, optional=False):
+    """ Sets up lazily imported attributes of a module.
+
+    An attribute is imported on first use and then kept in the module's
+    globals, so later lookups are plain global reads.
+
+    Args:
+        namespace (dict): The module's globals().
+        specs (dict): Attribute name to "module" or "module:attribute".
+        optional (bool): Resolve missing packages to None instead of
+            raising ImportError.
+
+    Returns:
+        tuple: (load, module_getattr). load(name) returns the attribute,
+            importing it if needed; module_getattr is the module's
+            __getattr__.
+    """
+    def load(name):
+        if name in namespace:
+            return namespace[name]
+        module_name, _, attribute = specs[name].partition(":")
+        try:
+            value = importlib.import_module(module_name)
+            if attribute:
+                value = getattr(value, attribute)
+        except ImportError:
+            if not optional:
+                raise
+            value = None
+        namespace[name] = value
+        return value
+
+    def module_getattr(name):
+        if name not in specs:
+            raise AttributeError(
+                f"module {namespace['__name__']!r} has no attribute {name!r}")
+        return load(name)
+
+    return load, module_getattr
@@ -0,0 +1,260 @@
+""" client/models.py
+
+    Typed, compact result records built from API responses.
+
+    Records use __slots__ and parse numeric and timestamp fields once, so
+    callers do not re-parse "5. Exchange Rate"-style strings on every use.
+
+"""
+from datetime import date, datetime, timezone
+
+
+def _to_float(value):
+    """ Parses an API number; "-" and empty strings become None. """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(value, time_zone=None):
+    """ Parses an API timestamp, UTC-aware if the zone says UTC. """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if time_zone == "UTC" and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class _Record:
+    """ Equality, repr and raw-dict conversion for slotted records. """
+
+    __slots__ = ()
+
+    # (attribute, response key) in response order; set by subclasses.
+    FIELDS = ()
+    # Slots describing how the record was served, not its data.
+    UNCOMPARED = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__
+                   if name not in self.UNCOMPARED)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}"
+                           for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self):
+        """ Returns the record in the API's raw response format. """
+        raw = {}
+        for name, key in self.FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                value = "-"
+            elif isinstance(value, datetime):
+                value = value.strftime("%Y-%m-%d %H:%M:%S")
+            raw[key] = str(value)
+        return raw
+
+
+class ExchangeRate(_Record):
+    """ A "Realtime Currency Exchange Rate" response. """
+
+    __slots__ = ("from_code", "from_name", "to_code", "to_name", "rate",
+                 "last_refreshed", "time_zone", "bid", "ask", "stale")
+
+    FIELDS = (
+        ("from_code", "1. From_Currency Code"),
+        ("from_name", "2. From_Currency Name"),
+        ("to_code", "3. To_Currency Code"),
+        ("to_name", "4. To_Currency Name"),
+        ("rate", "5. Exchange Rate"),
+        ("last_refreshed", "6. Last Refreshed"),
+        ("time_zone", "7. Time Zone"),
+        ("bid", "8. Bid Price"),
+        ("ask", "9. Ask Price"),
+    )
+    UNCOMPARED = ("stale",)
+
+    def __init__(self, from_code, from_name, to_code, to_name, rate,
+                 last_refreshed, time_zone, bid=None, ask=None, stale=False):
+        self.from_code = from_code
+        self.from_name = from_name
+        self.to_code = to_code
+        self.to_name = to_name
+        self.rate = rate
+        self.last_refreshed = last_refreshed
+        self.time_zone = time_zone
+        self.bid = bid
+        self.ask = ask
+        # Served from an expired cache entry (stale-while-revalidate).
+        self.stale = stale
+
+    @property
+    def age(self):
+        """ float: Seconds since last_refreshed, None if not UTC-aware. """
+        if self.last_refreshed is None or self.last_refreshed.tzinfo is None:
+            return None
+        return max(0.0, (datetime.now(timezone.utc)
+                         - self.last_refreshed).total_seconds())
+
+    @classmethod
+    def from_response(cls, data):
+        """ Builds the record from the "Realtime Currency Exchange Rate"
+        dict.
+
+        Raises:
+            ValueError: If a required field is missing or malformed.
+        """
+        try:
+            time_zone = data.get("7. Time Zone")
+            return cls(
+                data["1. From_Currency Code"],
+                data.get("2. From_Currency Name"),
+                data["3. To_Currency Code"],
+                data.get("4. To_Currency Name"),
+                float(data["5. Exchange Rate"]),
+                _to_datetime(data.get("6. Last Refreshed"), time_zone),
+                time_zone,
+                _to_float(data.get("8. Bid Price")),
+                _to_float(data.get("9. Ask Price")),
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(
+                "Unexpected response structure for CURRENCY_EXCHANGE_RATE."
+            ) from err
+
+
+class SymbolMatch(_Record):
+    """ One entry of a "bestMatches" symbol search response. """
+
+    __slots__ = ("symbol", "name", "type", "region", "market_open",
+                 "market_close", "timezone", "currency", "match_score")
+
+    FIELDS = (
+        ("symbol", "1. symbol"),
+        ("name", "2. name"),
+        ("type", "3. type"),
+        ("region", "4. region"),
+        ("market_open", "5. marketOpen"),
+        ("market_close", "6. marketClose"),
+        ("timezone", "7. timezone"),
+        ("currency", "8. currency"),
+        ("match_score", "9. matchScore"),
+    )
+
+    def __init__(self, symbol, name, type, region,  # pylint: disable=W0622
+                 market_open, market_close, timezone, currency, match_score):
+        self.symbol = symbol
+        self.name = name
+        self.type = type
+        self.region = region
+        self.market_open = market_open
+        self.market_close = market_close
+        self.timezone = timezone
+        self.currency = currency
+        self.match_score = match_score
+
+    @classmethod
+    def from_response(cls, data):
+        """ Builds the record from one "bestMatches" dict.
+
+        Raises:
+            ValueError: If a required field is missing or malformed.
+        """
+        try:
+            return cls(
+                data["1. symbol"],
+                data.get("2. name"),
+                data.get("3. type"),
+                data.get("4. region"),
+                data.get("5. marketOpen"),
+                data.get("6. marketClose"),
+                data.get("7. timezone"),
+                data.get("8. currency"),
+                _to_float(data.get("9. matchScore")),
+            )
+        except (KeyError, TypeError) as err:
+            raise ValueError(
+                "Unexpected response structure for SYMBOL_SEARCH.") from err
+
+
+class Bar(_Record):
+    """ One bar of a daily time series (FX_DAILY, TIME_SERIES_DAILY).
+
+    volume is None for FX series, which carry no volume.
+    """
+
+    __slots__ = ("date", "open", "high", "low", "close", "volume")
+
+    FIELDS = (
+        ("open", "1. open"),
+        ("high", "2. high"),
+        ("low", "3. low"),
+        ("close", "4. close"),
+        ("volume", "5. volume"),
+    )
+
+    def __init__(self, date, open, high, low,  # pylint: disable=W0622
+                 close, volume=None):
+        self.date = date
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_response(cls, day, data):
+        """ Builds the bar from a "YYYY-MM-DD" key and its JSON values.
+
+        Raises:
+            ValueError: If a price is missing or malformed.
+        """
+        try:
+            return cls(
+                date.fromisoformat(day),
+                float(data["1. open"]),
+                float(data["2. high"]),
+                float(data["3. low"]),
+                float(data["4. close"]),
+                _to_float(data.get("5. volume")),
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"Malformed time series bar for {day}.") from err
+
+    @classmethod
+    def from_csv_row(cls, row):
+        """ Builds the bar from a CSV row: timestamp, open, high, low, close
+        and optionally volume.
+
+        Raises:
+            ValueError: If a value is missing or malformed.
+        """
+        try:
+            return cls(
+                date.fromisoformat(row[0]),
+                float(row[1]),
+                float(row[2]),
+                float(row[3]),
+                float(row[4]),
+                _to_float(row[5]) if len(row) > 5 else None,
+            )
+        except (IndexError, ValueError) as err:
+            raise ValueError(
+                f"Malformed time series CSV row: {','.join(row)}") from err
+
+    def to_dict(self):
+        """ Returns the bar values in the API's raw response format; FX
+        bars have no "5. volume" key.
+        """
+        raw = {key: f"{getattr(self, name):.4f}"
+               for name, key in self.FIELDS[:4]}
+        if self.volume is not None:
+            raw["5. volume"] = f"{self.volume:.0f}"
+        return raw
@@ -0,0 +1,259 @@
+""" client/prefetch.py
+
+    Background warm-up of the client cache for a known watchlist.
+
+"""
+import heapq
+import itertools
+import threading
+import time
+
+from client import endpoints
+
+
+class WatchItem:
+    """ One watched call: a registered function, its arguments and how
+    often it is refreshed.
+    """
+
+    __slots__ = ("function", "args", "interval", "params", "response_key",
+                 "cost", "refreshes", "errors", "last_error")
+
+    def __init__(self, endpoint, args, interval, api_key):
+        self.function = endpoint.function
+        self.args = args
+        self.interval = interval
+        self.params = endpoint.params(api_key, *args)
+        self.response_key = endpoint.response_key
+        self.cost = endpoint.cost
+        self.refreshes = 0
+        self.errors = 0
+        self.last_error = None
+
+    def __repr__(self):
+        return (f"WatchItem({self.function}, {self.args!r}, "
+                f"interval={self.interval})")
+
+
+class PrefetchScheduler:
+    """ Keeps a watchlist warm in the client's cache from a background
+    thread.
+
+    Each item is refreshed every `interval` seconds, by default somewhat
+    before its cache TTL runs out, so live calls keep hitting the cache.
+    Prefetches only use spare rate-limit budget: a call is made only while
+    the client's rate limiter (or key pool) has more than `reserve` tokens
+    free, so live requests do not queue behind prefetches; otherwise it
+    is deferred by `retry_delay` seconds. Without a limiter calls are
+    made back to back, one at a time.
+
+    Usage:
+        scheduler = PrefetchScheduler(client, [
+            ("CURRENCY_EXCHANGE_RATE", ("USD", "EUR")),
+            ("SYMBOL_SEARCH", "Tesla", 6 * 60 * 60),
+        ])
+        with scheduler:
+            ...  # Serve traffic with client.
+    """
+
+    REFRESH_FRACTION = 0.9  # Default interval, as a fraction of the TTL.
+    RESERVE = 1  # Rate-limit tokens always left to live requests.
+    RETRY_DELAY = 5.0  # Seconds, after a deferred or failed prefetch.
+
+    def __init__(self, client, watchlist=(), reserve=RESERVE,
+                 retry_delay=RETRY_DELAY, clock=time.monotonic):
+        """
+        Args:
+            client (AlphaVantageClient): Client whose cache is kept warm.
+            watchlist (iterable): (function, args) or (function, args,
+                interval) tuples; a single argument may be given bare.
+            reserve (float): Tokens the limiter must keep free after a
+                prefetch.
+            retry_delay (float): Seconds before a deferred or failed
+                prefetch is tried again.
+            clock (callable): Monotonic time source, in seconds.
+
+        Raises:
+            ValueError: If the client has no cache, or for an unregistered
+                function.
+        """
+        if client.cache is None:
+            raise ValueError("Prefetching requires a client with a cache.")
+        self.client = client
+        self.reserve = reserve
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._queue = []  # (due, seq, WatchItem) heap.
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread = None
+        self.items = []
+        self.refreshes = 0  # Prefetch calls completed.
+        self.deferred = 0  # Prefetches postponed for lack of budget.
+        self.errors = 0  # Prefetch calls that raised.
+        for entry in watchlist:
+            self.add(*entry)
+
+    def add(self, function, args, interval=None):
+        """ Adds a call to the watchlist; it is prefetched as soon as
+        budget allows.
+
+        Args:
+            function (str): Registered function name.
+            args: Argument tuple in the endpoint's parameter order; a single
+                argument may be given bare.
+            interval (float): Seconds between refreshes; defaults to
+                REFRESH_FRACTION of the cache TTL.
+
+        Returns:
+            WatchItem: The watched call.
+
+        Raises:
+            ValueError: For an unregistered function, invalid arguments or
+                a non-positive interval.
+        """
+        endpoint = endpoints.get_endpoint(function)
+        if not isinstance(args, tuple):
+            args = (args,)
+        if interval is None:
+            interval = self._ttl_for(function) * self.REFRESH_FRACTION
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        item = WatchItem(endpoint, args, interval, self.client.api_key)
+        with self._wakeup:
+            self.items.append(item)
+            self._schedule_locked(item, self._clock())
+            self._wakeup.notify()
+        return item
+
+    def _ttl_for(self, function):
+        ttl_for = getattr(self.client.cache, "ttl_for", None)
+        if ttl_for is not None:
+            return ttl_for(function)
+        return endpoints.ttl_for(function)
+
+    def _schedule_locked(self, item, due):
+        heapq.heappush(self._queue, (due, next(self._seq), item))
+
+    @property
+    def running(self):
+        """ bool: Whether the background thread is alive. """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ Starts the background thread; does nothing if running. """
+        with self._wakeup:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """ Stops the background thread after the call in progress, if any.
+
+        Args:
+            timeout (float): Max seconds to wait for the thread.
+
+        Returns:
+            bool: True if the thread has stopped.
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _spare_tokens(self):
+        """ Returns the tokens live requests are not using, or None if the
+        client is not rate limited.
+        """
+        pool = self.client.key_pool
+        if pool is not None:
+            return sum(pool.limiters[key].available
+                       for key in pool.active_keys())
+        if self.client.rate_limiter is not None:
+            return self.client.rate_limiter.available
+        return None
+
+    def _has_budget(self, item):
+        spare = self._spare_tokens()
+        return spare is None or spare - item.cost >= self.reserve
+
+    def run_pending(self):
+        """ Prefetches every due item that fits the spare budget; the
+        background thread calls this in a loop.
+
+        Returns:
+            float: Seconds until the next item is due, or None if the
+                watchlist is empty.
+        """
+        while True:
+            with self._wakeup:
+                if not self._queue or self._stopping:
+                    return None
+                now = self._clock()
+                due = self._queue[0][0]
+                if due > now:
+                    return due - now
+                _, _, item = heapq.heappop(self._queue)
+            if self._has_budget(item):
+                delay = self._refresh(item)
+            else:
+                with self._lock:
+                    self.deferred += 1
+                delay = self.retry_delay
+            with self._wakeup:
+                self._schedule_locked(item, self._clock() + delay)
+
+    def _refresh(self, item):
+        """ Fetches one item into the cache; returns the delay until its
+        next refresh.
+        """
+        try:
+            self.client.refresh(item.params, item.response_key)
+        except Exception as err:  # pylint: disable=broad-except
+            with self._lock:
+                self.errors += 1
+                item.errors += 1
+                item.last_error = err
+            return min(item.interval, self.retry_delay)
+        with self._lock:
+            self.refreshes += 1
+            item.refreshes += 1
+        return item.interval
+
+    def _run(self):
+        while True:
+            self.run_pending()
+            with self._wakeup:
+                if self._stopping:
+                    return
+                # Re-checked under the lock, so an add() is not missed.
+                wait = None
+                if self._queue:
+                    wait = self._queue[0][0] - self._clock()
+                    if wait <= 0:
+                        continue
+                self._wakeup.wait(wait)
+
+    def stats(self):
+        """ Returns the prefetch counters as a dict. """
+        with self._lock:
+            return {
+                "items": len(self.items),
+                "refreshes": self.refreshes,
+                "deferred": self.deferred,
+                "errors": self.errors,
+            }
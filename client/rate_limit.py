@@ -0,0 +1,163 @@
+""" client/rate_limit.py
+
+    Client-side rate limiting for Alpha Vantage API keys.
+
+"""
+import threading
+import time
+
+
+class _TokenBucket:
+    """ Token bucket that may go into debt to reserve future tokens. """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, period, now):
+        self.capacity = capacity
+        self.rate = capacity / period  # Tokens per second.
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, cost):
+        """ Seconds until `cost` tokens are available (after refill). """
+        deficit = cost - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class RateLimiter:
+    """ Thread-safe per-minute and per-day token buckets for one API key.
+
+    Calls are queued rather than fired: acquire() reserves the next free
+    slot and sleeps until it is due, so concurrent callers are served in
+    arrival order without exceeding either limit. Share one instance between
+    all clients and threads using the same key, e.g. via for_api_key().
+
+    When the API still answers with a throttle message, on_throttle() pauses
+    all callers for an exponentially growing backoff; on_success() shrinks
+    it again.
+    """
+
+    DEFAULT_REQUESTS_PER_MINUTE = 5
+    DEFAULT_REQUESTS_PER_DAY = 500
+    BASE_BACKOFF = 1.0  # Seconds, first pause after a throttle response.
+    MAX_BACKOFF = 60.0  # Seconds.
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 requests_per_day=DEFAULT_REQUESTS_PER_DAY,
+                 base_backoff=BASE_BACKOFF, max_backoff=MAX_BACKOFF,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            requests_per_minute (int): Minute quota of the API key.
+            requests_per_day (int): Daily quota, or None for no daily limit.
+            base_backoff (float): Pause after the first throttle response.
+            max_backoff (float): Upper bound for the adaptive pause.
+            clock (callable): Monotonic time source, in seconds.
+            sleep (callable): Sleep function, in seconds.
+        """
+        now = clock()
+        self._buckets = [_TokenBucket(requests_per_minute, 60.0, now)]
+        if requests_per_day:
+            self._buckets.append(
+                _TokenBucket(requests_per_day, 24 * 60 * 60.0, now))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.backoff = 0.0  # Current adaptive pause, in seconds.
+        self.throttled = 0  # Throttle responses seen.
+        self._blocked_until = now
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_api_key(cls, api_key, **kwargs):
+        """ Returns the process-wide limiter for an API key, creating it with
+        `kwargs` on first use.
+        """
+        with cls._registry_lock:
+            if api_key not in cls._registry:
+                cls._registry[api_key] = cls(**kwargs)
+            return cls._registry[api_key]
+
+    def _wait_locked(self, now, cost):
+        for bucket in self._buckets:
+            bucket.refill(now)
+        return max([self._blocked_until - now, 0.0]
+                   + [bucket.wait(cost) for bucket in self._buckets])
+
+    @property
+    def queue_wait(self):
+        """ Seconds a call made now would wait in the queue. """
+        with self._lock:
+            return self._wait_locked(self._clock(), 1)
+
+    @property
+    def available(self):
+        """ Tokens calls made now could take without waiting. """
+        with self._lock:
+            now = self._clock()
+            if self._blocked_until > now:
+                return 0.0
+            for bucket in self._buckets:
+                bucket.refill(now)
+            return max(0.0, min(bucket.tokens for bucket in self._buckets))
+
+    def try_acquire(self, cost=1):
+        """ Takes `cost` tokens only if no waiting is needed.
+
+        Returns:
+            bool: True if the call may proceed now.
+        """
+        return self.acquire(cost, timeout=0)
+
+    def acquire(self, cost=1, timeout=None):
+        """ Waits for a slot and takes `cost` tokens from every bucket.
+
+        Args:
+            cost (int): Tokens the call consumes.
+            timeout (float): Max seconds to wait; None waits as long as
+                needed.
+
+        Returns:
+            bool: True once the call may proceed, False if the wait would
+                exceed `timeout` (nothing is reserved in that case).
+        """
+        with self._lock:
+            now = self._clock()
+            wait = self._wait_locked(now, cost)
+            if timeout is not None and wait > timeout:
+                return False
+            for bucket in self._buckets:
+                bucket.tokens -= cost
+            # Later callers queue behind this reservation.
+            self._blocked_until = max(self._blocked_until, now + wait)
+        if wait > 0:
+            self._sleep(wait)
+        return True
+
+    def on_throttle(self):
+        """ Backs off after the API reported a rate limit. """
+        with self._lock:
+            now = self._clock()
+            self.throttled += 1
+            self.backoff = min(self.max_backoff,
+                               max(self.base_backoff, self.backoff * 2))
+            self._blocked_until = max(self._blocked_until, now + self.backoff)
+            # The server disagrees with our count; start the minute over.
+            self._buckets[0].refill(now)
+            self._buckets[0].tokens = min(self._buckets[0].tokens, 0)
+
+    def on_success(self):
+        """ Shrinks the adaptive backoff after a successful call. """
+        with self._lock:
+            self.backoff = self.backoff / 2
+            if self.backoff < self.base_backoff:
+                self.backoff = 0.0
@@ -0,0 +1,163 @@
+""" client/retry.py
+
+    Retry policy and adaptive timeouts for API calls.
+
+"""
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from client.lazy_import import lazy_attributes
+
+# requests is only loaded once an error has to be classified.
+_lazy, __getattr__ = lazy_attributes(globals(), {"requests": "requests"})
+
+
+class RetryBudget:
+    """ Caps retries to a fraction of calls, so an outage does not turn
+    every call into max_attempts calls.
+
+    Each call deposits `ratio` tokens, each retry withdraws one. The budget
+    starts with `min_tokens` so isolated failures can always be retried.
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=10, max_tokens=100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """ Returns True if a retry may be made. """
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy:
+    """ Retries transient failures of idempotent GET calls with jittered
+    exponential backoff.
+
+    Connection errors, timeouts, 429 and 5XX responses are retried. API
+    errors (ValueError) are not: retrying a bad parameter cannot succeed
+    and a throttle is handled by the rate limiter.
+    """
+
+    MAX_ATTEMPTS = 3
+    BASE_DELAY = 0.2  # Seconds.
+    MAX_DELAY = 5.0  # Seconds.
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY,
+                 max_delay=MAX_DELAY, budget=None, sleep=time.sleep,
+                 rng=random.random):
+        """
+        Args:
+            max_attempts (int): Attempts per call, including the first.
+            base_delay (float): Backoff cap for the first retry.
+            max_delay (float): Upper bound for any backoff.
+            budget (RetryBudget): Shared retry budget; a default one is
+                created per policy.
+            sleep (callable): Sleep function, in seconds.
+            rng (callable): Returns a float in [0, 1).
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget is not None else RetryBudget()
+        self._sleep = sleep
+        self._rng = rng
+        self.retries = 0  # Retries made.
+
+    def is_retryable(self, error):
+        requests = _lazy("requests")
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return (response is not None
+                    and response.status_code in self.RETRY_STATUSES)
+        return isinstance(error, (requests.exceptions.ConnectionError,
+                                  requests.exceptions.Timeout))
+
+    def backoff(self, retry):
+        """ Returns the full-jitter delay before retry number `retry`. """
+        cap = min(self.max_delay, self.base_delay * 2 ** retry)
+        return self._rng() * cap
+
+    def call(self, fn, *args):
+        """ Returns fn(*args), retrying transient failures.
+
+        Raises:
+            Exception: The last error once attempts or budget run out.
+        """
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except Exception as err:  # pylint: disable=broad-except
+                if (attempt + 1 >= self.max_attempts
+                        or not self.is_retryable(err)
+                        or not self.budget.withdraw()):
+                    raise
+            self.retries += 1
+            self._sleep(self.backoff(attempt))
+            attempt += 1
+
+
+class AdaptiveTimeout:
+    """ Per-function timeouts derived from observed latency.
+
+    The timeout is the chosen latency percentile of the last `window` calls
+    times `multiplier`, clamped to [min_timeout, max_timeout]. Until
+    `min_samples` latencies are seen, `initial` is used. Timed-out calls are
+    recorded at the timeout value, so a slowing upstream raises the
+    deadline instead of failing every call.
+    """
+
+    def __init__(self, initial=1.0, min_timeout=0.25, max_timeout=10.0,
+                 percentile=0.99, multiplier=2.0, window=200, min_samples=20):
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}  # function -> deque of seconds
+        self._lock = threading.Lock()
+
+    def observe(self, function, latency):
+        """ Records the latency in seconds of a call to `function`. """
+        with self._lock:
+            samples = self._samples.get(function)
+            if samples is None:
+                samples = self._samples[function] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def latency_percentile(self, function, percentile=None):
+        """ Returns the observed latency percentile, or None if unknown. """
+        with self._lock:
+            samples = sorted(self._samples.get(function, ()))
+        if not samples:
+            return None
+        if percentile is None:
+            percentile = self.percentile
+        rank = max(0, math.ceil(percentile * len(samples)) - 1)
+        return samples[rank]
+
+    def timeout_for(self, function):
+        """ Returns the timeout in seconds for the next call. """
+        with self._lock:
+            count = len(self._samples.get(function, ()))
+        if count < self.min_samples:
+            return self.initial
+        timeout = self.latency_percentile(function) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, timeout))
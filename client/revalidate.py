@@ -0,0 +1,115 @@
+""" client/revalidate.py
+
+    Stale-while-revalidate support: background refreshes and staleness
+    flags for served responses.
+
+"""
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from client.models import _to_datetime
+
+LAST_REFRESHED_KEY = "6. Last Refreshed"
+TIME_ZONE_KEY = "7. Time Zone"
+
+
+def freshness(payload, now=None):
+    """ Returns (last_refreshed, age in seconds) of a payload carrying
+    "6. Last Refreshed"; age is None unless the time zone is UTC, and both
+    are None without a timestamp.
+    """
+    try:
+        refreshed = _to_datetime(payload.get(LAST_REFRESHED_KEY),
+                                 payload.get(TIME_ZONE_KEY))
+    except (AttributeError, ValueError):
+        return None, None
+    if refreshed is None or refreshed.tzinfo is None:
+        return refreshed, None
+    now = now or datetime.now(timezone.utc)
+    return refreshed, max(0.0, (now - refreshed).total_seconds())
+
+
+class ServedResponse(dict):
+    """ A response dict flagged with its freshness.
+
+    Attributes:
+        stale (bool): Served from an expired cache entry while a refresh
+            runs in the background.
+        last_refreshed (datetime): The payload's "6. Last Refreshed".
+        age (float): Seconds since last_refreshed, if known.
+    """
+
+    def __init__(self, payload, stale=False):
+        super().__init__(payload)
+        self.stale = stale
+        self.last_refreshed, self.age = freshness(payload)
+
+
+def flag_stale(result, stale):
+    """ Returns the endpoint result flagged with `stale`: dicts become a
+    ServedResponse, records are copied with their stale attribute set, as
+    the cache may share them.
+    """
+    if isinstance(result, dict):
+        return ServedResponse(result, stale)
+    result = copy.copy(result)
+    result.stale = stale
+    return result
+
+
+class Revalidator:
+    """ Runs background refreshes, at most one at a time per key. """
+
+    MAX_WORKERS = 2
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="revalidate")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.refreshes = 0  # Background refreshes completed.
+        self.errors = 0  # Background refreshes that raised.
+
+    def submit(self, key, fn, *args):
+        """ Schedules fn(*args) unless a refresh of `key` is pending.
+
+        Returns:
+            bool: True if a refresh was scheduled.
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        try:
+            self._executor.submit(self._run, key, fn, *args)
+        except RuntimeError:  # Shut down.
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, key, fn, *args):
+        try:
+            fn(*args)
+        except Exception:  # pylint: disable=broad-except
+            # The entry stays stale; callers block once it is too old.
+            with self._lock:
+                self.errors += 1
+        else:
+            with self._lock:
+                self.refreshes += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    @property
+    def pending(self):
+        """ int: Refreshes scheduled or running. """
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, wait=True):
+        """ Stops accepting refreshes; waits for running ones if `wait`. """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,341 @@
+""" client/shared_state.py
+
+    Cache and rate-limit state shared by all processes on a host, kept in an
+    SQLite file.
+
+    Workers forked by gunicorn or multiprocessing each build their own
+    client; pointing them at the same file gives them one view of cached
+    responses and of the remaining quota, so N workers neither call the API
+    N times for the same rate nor spend N times the quota. SQLite does the
+    cross-process locking, so no external service is needed.
+
+    Usage:
+        path = "/var/tmp/alpha_vantage.sqlite"
+        client = AlphaVantageClient(
+            api_key, cache=SharedCache(path),
+            rate_limiter=SharedRateLimiter(path, api_key))
+
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from client import endpoints
+from client.cache import key_function
+from client.rate_limit import RateLimiter
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS cache (
+        key TEXT PRIMARY KEY,
+        expires_at REAL NOT NULL,
+        value TEXT NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)",
+    """CREATE TABLE IF NOT EXISTS rate_limit (
+        name TEXT PRIMARY KEY,
+        state TEXT NOT NULL)""",
+)
+
+
+class _Database:
+    """ One SQLite connection per thread and process on a shared file.
+
+    Connections are never inherited across fork(): a child opens its own
+    on first use.
+    """
+
+    TIMEOUT = 30.0  # Seconds to wait for another process's write lock.
+
+    def __init__(self, path, timeout=TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self.connection()  # Creates the file and schema up front.
+
+    def connection(self):
+        """ Returns this thread's connection, opening it if needed. """
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            # Autocommit; writers open explicit BEGIN IMMEDIATE
+            # transactions.
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def write(self):
+        """ Returns a context manager running a write transaction that
+        holds the database lock against other processes.
+        """
+        return _Transaction(self.connection())
+
+
+class _Transaction:
+    """ BEGIN IMMEDIATE ... COMMIT, rolled back on error. """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
+
+
+def _encode(value):
+    # Typed records (client/models.py) are stored in raw response format.
+    return json.dumps(value, separators=(",", ":"),
+                      default=lambda record: record.to_dict())
+
+
+class SharedCache:
+    """ TTL cache in an SQLite file, shared by every process using it.
+
+    Drop-in for ResponseCache: same get/get_stale/set/clear interface and
+    per-function TTLs. When the cache is full, expired entries go first,
+    then those closest to expiry; reads stay lock-free for other readers,
+    so recency is not tracked. Hit and miss counters are per process.
+
+    Values are stored as JSON, so anything the API returns round-trips;
+    typed records come back as raw response dicts. Each get() returns a
+    fresh copy.
+    """
+
+    DEFAULT_MAX_SIZE = 4096
+    DEFAULT_TTL = 60  # Seconds, for unregistered functions not in ttls.
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE, ttls=None,
+                 default_ttl=DEFAULT_TTL, timeout=_Database.TIMEOUT,
+                 clock=time.time):
+        """
+        Args:
+            path (str): SQLite file; created if missing. Share it between
+                processes, not between hosts (no network filesystems).
+            max_size (int): Maximum number of entries.
+            ttls (dict): Function name to TTL in seconds, overriding the
+                endpoint registry's TTLs.
+            default_ttl (float): TTL for unregistered functions not in
+                ttls.
+            timeout (float): Seconds to wait for another process's lock.
+            clock (callable): Wall-clock time source, in seconds; must
+                agree across processes.
+
+        Raises:
+            ValueError: If max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._db = _Database(path, timeout)
+        self._lock = threading.Lock()  # Guards the counters.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def path(self):
+        return self._db.path
+
+    def __len__(self):
+        return self._db.connection().execute(
+            "SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def ttl_for(self, function):
+        """ Returns the TTL in seconds for an API function. """
+        ttl = self.ttls.get(function)
+        if ttl is None:
+            ttl = endpoints.ttl_for(function, self.default_ttl)
+        return ttl
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _read(self, key):
+        return self._db.connection().execute(
+            "SELECT expires_at, value FROM cache WHERE key = ?",
+            (_encode(key),)).fetchone()
+
+    def get(self, key):
+        """ Returns the cached value, or None on a miss or expired entry. """
+        row = self._read(key)
+        if row is None or row[0] <= self._clock():
+            self._count(False)
+            return None
+        self._count(True)
+        return json.loads(row[1])
+
+    def get_stale(self, key):
+        """ Returns (value, seconds past expiry) or None on a miss; see
+        ResponseCache.get_stale().
+        """
+        row = self._read(key)
+        if row is None:
+            self._count(False)
+            return None
+        stale_for = self._clock() - row[0]
+        self._count(stale_for < 0)
+        return json.loads(row[1]), stale_for
+
+    def set(self, key, value, age=0):
+        """ Stores a value with the TTL of the function in its key, less
+        `age` seconds; see ResponseCache.set().
+        """
+        expires_at = self._clock() + self.ttl_for(key_function(key)) - age
+        with self._db.write() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) "
+                "VALUES (?, ?, ?)", (_encode(key), expires_at, _encode(value)))
+            excess = connection.execute(
+                "SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_size
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                    "ORDER BY expires_at LIMIT ?)", (excess,))
+        if excess > 0:
+            with self._lock:
+                self.evictions += excess
+
+    def clear(self):
+        """ Drops all entries, for every process. Counters are kept. """
+        with self._db.write() as connection:
+            connection.execute("DELETE FROM cache")
+
+    def stats(self):
+        """ Returns this process's counters and the shared size. """
+        size = len(self)
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": size,
+            }
+
+
+class _SharedLock:
+    """ Stands in for RateLimiter's lock: loads the limiter state from the
+    database on entry and writes it back on exit, inside one write
+    transaction, so every process sees and updates the same buckets.
+    """
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._thread_lock = threading.Lock()
+        self._transaction = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        transaction = self._limiter._db.write()
+        try:
+            connection = transaction.__enter__()
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        try:
+            self._limiter._load(connection)
+        except BaseException:
+            transaction.__exit__(*sys.exc_info())
+            self._thread_lock.release()
+            raise
+        self._transaction = transaction
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                try:
+                    self._limiter._save(self._transaction.connection)
+                except BaseException:
+                    self._transaction.__exit__(*sys.exc_info())
+                    raise
+            self._transaction.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._transaction = None
+            self._thread_lock.release()
+
+
+class SharedRateLimiter(RateLimiter):
+    """ RateLimiter whose buckets, backoff and queue live in an SQLite file,
+    so every process using the same file and name draws from one quota.
+
+    The algorithm is RateLimiter's; only its lock is replaced by a
+    cross-process write transaction that loads and stores the state.
+    Limiters with the same path and name share state, so for_api_key() is
+    not needed.
+
+    Usage:
+        limiter = SharedRateLimiter("/var/tmp/av.sqlite", api_key)
+    """
+
+    _registry = {}  # Not shared with RateLimiter.for_api_key().
+
+    def __init__(self, path, name,
+                 requests_per_minute=RateLimiter.DEFAULT_REQUESTS_PER_MINUTE,
+                 requests_per_day=RateLimiter.DEFAULT_REQUESTS_PER_DAY,
+                 base_backoff=RateLimiter.BASE_BACKOFF,
+                 max_backoff=RateLimiter.MAX_BACKOFF,
+                 timeout=_Database.TIMEOUT, clock=time.time,
+                 sleep=time.sleep):
+        """
+        Args:
+            path (str): SQLite file; created if missing.
+            name (str): State to share, usually the API key.
+            requests_per_minute (int): Minute quota of the API key.
+            requests_per_day (int): Daily quota, or None for no daily limit.
+            base_backoff (float): Pause after the first throttle response.
+            max_backoff (float): Upper bound for the adaptive pause.
+            timeout (float): Seconds to wait for another process's lock.
+            clock (callable): Wall-clock time source, in seconds; must
+                agree across processes.
+            sleep (callable): Sleep function, in seconds.
+        """
+        super().__init__(requests_per_minute, requests_per_day,
+                         base_backoff, max_backoff, clock, sleep)
+        self.name = name
+        self._db = _Database(path, timeout)
+        self._lock = _SharedLock(self)
+
+    def _load(self, connection):
+        row = connection.execute(
+            "SELECT state FROM rate_limit WHERE name = ?",
+            (self.name,)).fetchone()
+        if row is None:
+            return  # First user: start from this instance's full buckets.
+        state = json.loads(row[0])
+        for bucket, (tokens, updated) in zip(self._buckets, state["buckets"]):
+            bucket.tokens = min(bucket.capacity, tokens)
+            bucket.updated = updated
+        self._blocked_until = state["blocked_until"]
+        self.backoff = state["backoff"]
+        self.throttled = state["throttled"]
+
+    def _save(self, connection):
+        state = {
+            "buckets": [[bucket.tokens, bucket.updated]
+                        for bucket in self._buckets],
+            "blocked_until": self._blocked_until,
+            "backoff": self.backoff,
+            "throttled": self.throttled,
+        }
+        connection.execute(
+            "INSERT OR REPLACE INTO rate_limit (name, state) VALUES (?, ?)",
+            (self.name, _encode(state)))
@@ -0,0 +1,63 @@
+""" client/single_flight.py
+
+    Request coalescing for identical in-flight calls.
+
+"""
+import threading
+
+
+class _Call:
+    """ One outstanding call and the callers waiting on it. """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """ Runs at most one call per key at a time.
+
+    Callers that ask for a key while a call for it is in flight block until
+    that call finishes and share its result or exception. The next call for
+    the key after that starts a fresh call.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0  # Calls answered by another caller's request.
+
+    def do(self, key, fn, *args):
+        """ Returns fn(*args), sharing one execution per in-flight key.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if leader:
+            try:
+                call.result = fn(*args)
+            except BaseException as err:
+                call.error = err
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
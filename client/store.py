@@ -0,0 +1,212 @@
+""" client/store.py
+
+    Persistent on-disk response store for warm restarts.
+
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from client import endpoints
+from client.cache import ResponseCache, key_function
+
+
+class PersistentStore:
+    """ Append-only file of timestamped responses, read through mmap.
+
+    Each record is a fixed header (write time, key length, value length)
+    followed by the JSON-encoded request key and response data. Opening the
+    file scans it once to index the latest record per key; reads slice the
+    memory map without copying the file. A restarted client can therefore
+    serve fresh-enough responses right away instead of calling the API.
+
+    Superseded records are dropped by compact(), which also runs when the
+    file grows beyond max_bytes. If the live records alone exceed the cap,
+    the oldest are dropped until COMPACT_FILL of the cap is used. A
+    truncated record at the end of the file (e.g. after a crash) is
+    discarded on open.
+    """
+
+    HEADER = struct.Struct("<dII")  # Timestamp, key length, value length.
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    # Compaction forced by the size cap shrinks the file to this fraction of
+    # max_bytes, so the next appends do not immediately compact again.
+    COMPACT_FILL = 0.75
+    # Seconds a stored response is served for if the function is not in
+    # the endpoint registry; registered functions use their cache TTL.
+    DEFAULT_MAX_AGE = ResponseCache.DEFAULT_TTL
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, max_ages=None,
+                 default_max_age=DEFAULT_MAX_AGE, clock=time.time):
+        """
+        Args:
+            path (str): File to store responses in; created if missing.
+            max_bytes (int): Size cap of the file.
+            max_ages (dict): Function name to max age in seconds,
+                overriding the endpoint registry's TTLs.
+            default_max_age (float): Max age for unregistered functions
+                not in max_ages.
+            clock (callable): Wall-clock time source, in seconds. Wall time
+                is used because entries must outlive the process.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_ages = dict(max_ages or {})
+        self.default_max_age = default_max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = {}  # Encoded key -> (value offset, length, timestamp)
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "a+b")  # pylint: disable=R1732
+        self._index = {}
+        self._map = None
+        size = os.fstat(self._file.fileno()).st_size
+        end = self._scan(size)
+        if end < size:
+            self._file.truncate(end)
+        self._remap()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._map = mmap.mmap(
+                self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _scan(self, size):
+        """ Indexes all complete records; returns the end of the last one.
+        """
+        if not size:
+            return 0
+        with mmap.mmap(self._file.fileno(), size,
+                       access=mmap.ACCESS_READ) as view:
+            offset = 0
+            while offset + self.HEADER.size <= size:
+                timestamp, key_length, value_length = self.HEADER.unpack_from(
+                    view, offset)
+                key_start = offset + self.HEADER.size
+                value_start = key_start + key_length
+                end = value_start + value_length
+                if end > size:
+                    break
+                key = bytes(view[key_start:value_start])
+                self._index[key] = (value_start, value_length, timestamp)
+                offset = end
+        return offset
+
+    @staticmethod
+    def _encode_key(key):
+        return json.dumps(key, separators=(",", ":")).encode("utf-8")
+
+    def __len__(self):
+        return len(self._index)
+
+    def max_age_for(self, function):
+        """ Returns the max age in seconds for an API function. """
+        max_age = self.max_ages.get(function)
+        if max_age is None:
+            max_age = endpoints.ttl_for(function, self.default_max_age)
+        return max_age
+
+    def age(self, timestamp):
+        """ Returns the seconds elapsed since a record's write time. """
+        return self._clock() - timestamp
+
+    def get(self, key, max_age=None):
+        """ Returns the stored response and its write time.
+
+        Args:
+            key (tuple): Request key, see client.cache.make_cache_key.
+            max_age (float): Overrides the per-function max age.
+
+        Returns:
+            tuple: (response, write timestamp), or None if missing or too
+                old.
+        """
+        if max_age is None:
+            max_age = self.max_age_for(key_function(key))
+        encoded = self._encode_key(key)
+        with self._lock:
+            entry = self._index.get(encoded)
+            if entry is None:
+                return None
+            offset, length, timestamp = entry
+            if self.age(timestamp) > max_age:
+                return None
+            if self._map is None or offset + length > len(self._map):
+                self._remap()
+            raw = self._map[offset:offset + length]
+        return json.loads(raw), timestamp
+
+    def put(self, key, value):
+        """ Appends a response; compacts if the file exceeds max_bytes. """
+        encoded = self._encode_key(key)
+        raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        timestamp = self._clock()
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            header = self.HEADER.pack(timestamp, len(encoded), len(raw))
+            self._file.write(header + encoded + raw)
+            self._file.flush()
+            value_offset = offset + len(header) + len(encoded)
+            self._index[encoded] = (value_offset, len(raw), timestamp)
+            if value_offset + len(raw) > self.max_bytes:
+                self._compact_locked(self.max_bytes * self.COMPACT_FILL)
+
+    def compact(self):
+        """ Rewrites the file with only the latest record per key. """
+        with self._lock:
+            self._compact_locked(self.max_bytes)
+
+    def _compact_locked(self, limit):
+        if self._map is None or len(self._map) < os.fstat(
+                self._file.fileno()).st_size:
+            self._remap()
+        # Newest first, so the size cap drops the oldest records.
+        entries = sorted(self._index.items(), key=lambda item: -item[1][2])
+        records = []
+        total = 0
+        for key, (offset, length, timestamp) in entries:
+            record = (self.HEADER.pack(timestamp, len(key), length) + key
+                      + self._map[offset:offset + length])
+            if total + len(record) > limit:
+                break
+            records.append(record)
+            total += len(record)
+
+        temp_path = self.path + ".compact"
+        with open(temp_path, "wb") as temp:
+            for record in reversed(records):
+                temp.write(record)
+        self._release()
+        os.replace(temp_path, self.path)
+        self._open()
+
+    def close(self):
+        """ Releases the memory map and the file handle. """
+        with self._lock:
+            self._release()
+
+    def _release(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
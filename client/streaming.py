@@ -0,0 +1,135 @@
+""" client/streaming.py
+
+    Incremental parsers for daily time series responses.
+
+    A full-history series (outputsize=full) is several megabytes. These
+    parsers turn the body into Bar records while it downloads, holding only
+    the unparsed tail of the last chunk, so memory stays bounded by the
+    chunk size instead of growing with the history.
+
+"""
+import codecs
+import csv
+import json
+import re
+
+from client.models import Bar
+
+_DECODER = json.JSONDecoder()
+_OBJECT_START = re.compile(r"\s*:\s*\{")
+_SEPARATOR = re.compile(r"[\s,]*")
+_COLON = re.compile(r"\s*:\s*")
+
+# Bytes of preamble ("Meta Data" or an error body) read while looking for
+# the series key before the response is rejected.
+MAX_PREAMBLE = 64 * 1024
+
+
+def _unexpected(function):
+    return ValueError(f"Unexpected response structure for {function}.")
+
+
+def _check_body(body, check, function):
+    """ Raises for a complete non-series body: the API's error payload via
+    `check`, anything else as an unexpected structure.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError as err:
+        raise ValueError(
+            "Failed to decode JSON response from Alpha Vantage API.") from err
+    if check is not None and isinstance(data, dict):
+        check(data)
+    raise _unexpected(function)
+
+
+def iter_json_bars(chunks, series_key, check=None, function=None):
+    """ Yields Bar records from a JSON time series body, in response order
+    (newest first).
+
+    Args:
+        chunks (iterable): The body as UTF-8 byte chunks, e.g.
+            Response.iter_content().
+        series_key (str): Key of the series object, e.g.
+            "Time Series (Daily)".
+        check (callable): Called with the decoded body if it has no series,
+            to raise the API's error message.
+        function (str): API function name, for error messages.
+
+    Raises:
+        ValueError: For API errors, or a malformed or truncated body.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    marker = json.dumps(series_key)
+    buffer = ""
+    in_series = False
+
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        if not in_series:
+            found = buffer.find(marker)
+            if found < 0:
+                if len(buffer) > MAX_PREAMBLE:
+                    raise _unexpected(function)
+                continue
+            start = _OBJECT_START.match(buffer, found + len(marker))
+            if start is None:
+                if buffer[found + len(marker):].strip() in ("", ":"):
+                    continue  # The opening brace is in the next chunk.
+                raise _unexpected(function)
+            buffer = buffer[start.end():]
+            in_series = True
+
+        position = 0
+        while True:
+            position = _SEPARATOR.match(buffer, position).end()
+            if buffer.startswith("}", position):
+                return  # End of the series; the rest is not needed.
+            # Bar values are flat, so the next brace closes the entry.
+            if buffer.find("}", position) < 0:
+                break
+            try:
+                day, end = _DECODER.raw_decode(buffer, position)
+                end = _COLON.match(buffer, end).end()
+                values, position = _DECODER.raw_decode(buffer, end)
+            except (ValueError, AttributeError) as err:
+                raise ValueError(
+                    f"Malformed time series response for {function}."
+                ) from err
+            yield Bar.from_response(day, values)
+        buffer = buffer[position:]
+
+    buffer += text.decode(b"", final=True)
+    if in_series:
+        raise ValueError(f"Truncated time series response for {function}.")
+    _check_body(buffer, check, function)
+
+
+def iter_csv_bars(lines, check=None, function=None):
+    """ Yields Bar records from a CSV time series body (datatype=csv), in
+    response order (newest first).
+
+    The API answers errors with a JSON body even when CSV was requested;
+    such a body is passed to `check`.
+
+    Args:
+        lines (iterable): Body lines as bytes or str, e.g.
+            Response.iter_lines().
+        check (callable): Called with a decoded JSON error body.
+        function (str): API function name, for error messages.
+
+    Raises:
+        ValueError: For API errors or a malformed body.
+    """
+    lines = (line.decode("utf-8") if isinstance(line, bytes) else line
+             for line in lines)
+    rows = (line for line in lines if line.strip())
+    header = next(rows, None)
+    if header is None:
+        raise _unexpected(function)
+    if header.lstrip().startswith("{"):
+        _check_body("\n".join([header, *rows]), check, function)
+    if not header.lower().startswith("timestamp,"):
+        raise _unexpected(function)
+    for row in csv.reader(rows):
+        yield Bar.from_csv_row(row)
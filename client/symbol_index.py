@@ -0,0 +1,224 @@
+""" client/symbol_index.py
+
+    Local symbol index answering SYMBOL_SEARCH queries without the network.
+
+"""
+import bisect
+import csv
+import difflib
+import re
+import threading
+
+from client.models import SymbolMatch
+
+
+class SymbolIndex:
+    """ Prefix and fuzzy search over known symbols and company names.
+
+    Entries come from past "bestMatches" results (add_matches) and/or an
+    Alpha Vantage LISTING_STATUS CSV file (load_listing_csv). Searchable
+    terms (the symbol, the full name and each word of the name) are kept in
+    one sorted array, so prefix queries are a binary search. The array is
+    built once and then updated in place as entries are added or replaced.
+
+    Results use the "bestMatches" format with a computed "9. matchScore":
+    1.0 for an exact term, len(query) / len(term) for a prefix, and a
+    scaled similarity ratio for fuzzy hits. lookup() returns None when no
+    result reaches the confidence threshold, so the caller can ask the API.
+    """
+
+    FIELDS = ("1. symbol", "2. name", "3. type", "4. region",
+              "5. marketOpen", "6. marketClose", "7. timezone", "8. currency")
+    SCORE_FIELD = "9. matchScore"
+
+    DEFAULT_CONFIDENCE = 0.75  # Minimum top score for lookup() to answer.
+    MAX_RESULTS = 10
+    MAX_SCAN = 1000  # Max sorted terms examined per prefix query.
+    FUZZY_SCAN = 200  # Max sorted terms compared per fuzzy query.
+    FUZZY_MIN_LENGTH = 3  # Shorter queries are answered by prefix only.
+    FUZZY_WEIGHT = 0.8  # Fuzzy scores rank below equally close prefixes.
+    FUZZY_MIN_RATIO = 0.6  # Less similar terms are not scored.
+
+    _WORD = re.compile(r"[A-Z0-9]+")
+
+    # LISTING_STATUS only covers US exchanges.
+    LISTING_DEFAULTS = {
+        "4. region": "United States",
+        "5. marketOpen": "09:30",
+        "6. marketClose": "16:00",
+        "7. timezone": "UTC-04",
+        "8. currency": "USD",
+    }
+
+    def __init__(self, confidence=DEFAULT_CONFIDENCE,
+                 max_results=MAX_RESULTS):
+        self.confidence = confidence
+        self.max_results = max_results
+        self._rows = {}  # Upper-case symbol -> tuple of FIELDS values.
+        self._terms = []  # Sorted (term, symbol) pairs.
+        self._dirty = False  # Rebuild _terms instead of updating it.
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._rows
+
+    def add(self, match):
+        """ Adds or replaces one entry given in "bestMatches" format or as
+        a SymbolMatch.
+        """
+        if isinstance(match, SymbolMatch):
+            match = match.to_dict()
+        row = tuple(str(match.get(field) or "").replace("\t", " ")
+                    .replace("\n", " ") for field in self.FIELDS)
+        if not row[0]:
+            return
+        key = row[0].upper()
+        with self._lock:
+            old = self._rows.get(key)
+            if old == row:
+                return
+            self._rows[key] = row
+            if self._dirty:
+                return
+            if old is not None:
+                for term in self._terms_for(key, old):
+                    del self._terms[bisect.bisect_left(self._terms, term)]
+            for term in self._terms_for(key, row):
+                bisect.insort(self._terms, term)
+
+    def add_matches(self, matches):
+        """ Adds every entry of a "bestMatches" list. """
+        for match in matches:
+            self.add(match)
+
+    def load_listing_csv(self, path):
+        """ Adds active symbols from a LISTING_STATUS CSV file.
+
+        Returns:
+            int: Number of entries added.
+        """
+        count = 0
+        with self._lock:
+            self._dirty = True  # One sort beats an insort per row.
+        with open(path, newline="", encoding="utf-8") as listing:
+            for row in csv.DictReader(listing):
+                if row.get("status", "Active") != "Active":
+                    continue
+                self.add(dict(self.LISTING_DEFAULTS, **{
+                    "1. symbol": row["symbol"],
+                    "2. name": row.get("name", ""),
+                    "3. type": row.get("assetType", ""),
+                }))
+                count += 1
+        return count
+
+    def save(self, path):
+        """ Writes the entries as sorted tab-separated lines. """
+        with self._lock:
+            rows = [self._rows[key] for key in sorted(self._rows)]
+        with open(path, "w", encoding="utf-8") as out:
+            for row in rows:
+                out.write("\t".join(row) + "\n")
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """ Reads an index written by save(). """
+        index = cls(**kwargs)
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                values = line.rstrip("\n").split("\t")
+                if len(values) == len(cls.FIELDS):
+                    index._rows[values[0].upper()] = tuple(values)
+        index._dirty = True
+        return index
+
+    def _terms_for(self, key, row):
+        terms = {key, row[1].upper()}
+        terms.update(self._WORD.findall(row[1].upper()))
+        terms.discard("")
+        return [(term, key) for term in terms]
+
+    def _candidates(self, prefix, count):
+        """ Returns up to `count` sorted terms from the first one not
+        before `prefix`.
+        """
+        with self._lock:
+            if self._dirty:
+                terms = []
+                for key, row in self._rows.items():
+                    terms.extend(self._terms_for(key, row))
+                terms.sort()
+                self._terms = terms
+                self._dirty = False
+            start = bisect.bisect_left(self._terms, (prefix,))
+            return self._terms[start:start + count]
+
+    def search(self, keywords, limit=None):
+        """ Returns entries ranked by match score, best first.
+
+        Args:
+            keywords (str): Symbol or name prefix, e.g. "TSL" or "Tesla".
+            limit (int): Max results, defaults to max_results.
+
+        Returns:
+            list: Entries in "bestMatches" format.
+        """
+        query = keywords.strip().upper()
+        if not query:
+            return []
+        scores = {}
+
+        for term, key in self._candidates(query, self.MAX_SCAN):
+            if not term.startswith(query):
+                break
+            score = len(query) / len(term)
+            if score > scores.get(key, 0.0):
+                scores[key] = score
+
+        if len(query) >= self.FUZZY_MIN_LENGTH and (
+                not scores or max(scores.values()) < self.confidence):
+            self._fuzzy(query, scores)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._entry(key, score)
+                for key, score in ranked[:limit or self.max_results]]
+
+    def _fuzzy(self, query, scores):
+        """ Scores terms sharing the query's leading characters by
+        similarity. Typos rarely hit the first letters, and anchoring there
+        keeps the candidate range a binary search away.
+        """
+        anchor = query[:2] if len(query) > self.FUZZY_MIN_LENGTH else query[0]
+        matcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        # Upper bounds are checked first; ratio() is the expensive part.
+        for term, key in self._candidates(anchor, self.FUZZY_SCAN):
+            if not term.startswith(anchor):
+                break
+            matcher.set_seq1(term)
+            if (matcher.real_quick_ratio() < self.FUZZY_MIN_RATIO
+                    or matcher.quick_ratio() < self.FUZZY_MIN_RATIO):
+                continue
+            ratio = matcher.ratio()
+            score = ratio * self.FUZZY_WEIGHT
+            if ratio >= self.FUZZY_MIN_RATIO and score > scores.get(key, 0.0):
+                scores[key] = score
+
+    def _entry(self, key, score):
+        entry = dict(zip(self.FIELDS, self._rows[key]))
+        entry[self.SCORE_FIELD] = f"{score:.4f}"
+        return entry
+
+    def lookup(self, keywords):
+        """ Returns search results only if the best one is confident.
+
+        Returns:
+            list: Entries in "bestMatches" format, or None if the index has
+                no match scoring at least `confidence`.
+        """
+        matches = self.search(keywords)
+        if matches and float(matches[0][self.SCORE_FIELD]) >= self.confidence:
+            return matches
+        return None
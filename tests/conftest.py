@@ -1,6 +1,7 @@
 """ tests/conftest.py
 
-Pytest fixture to provide a test API key to the AlphaVantageClient.
+Pytest fixtures shared by the tests: a test API key, a client and a
+manually advanced clock. Plain helpers are in tests/helpers.py.
 
 """
 
@@ -8,6 +9,22 @@ import pytest
 from client.alpha_vantage_client import AlphaVantageClient
 
 
+class FakeClock:
+    """Manually advanced time source whose sleep() advances it instead of
+    blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
 @pytest.fixture()
 def api_key():
     """Provides a dummy API key for testing."""
@@ -18,3 +35,9 @@ def api_key():
 def client(api_key):
     """Provides an instance of the AlphaVantageClient."""
     return AlphaVantageClient(api_key=api_key)
+
+
+@pytest.fixture()
+def clock():
+    """Provides a FakeClock starting at 0."""
+    return FakeClock()
@@ -0,0 +1,19 @@
+""" tests/helpers.py
+
+Helpers shared by the test modules.
+
+"""
+
+from datetime import timedelta
+from unittest.mock import Mock
+
+
+def mock_response(data=None, content=None):
+    """Returns a mock HTTP response whose json() returns `data` and whose
+    content is the raw body `content`."""
+    response = Mock()
+    response.json.return_value = data
+    response.content = content
+    response.status_code = 200
+    response.elapsed = timedelta(0)
+    return response
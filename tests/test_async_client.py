@@ -0,0 +1,126 @@
+""" tests/test_async_client.py
+
+    Tests for AsyncAlphaVantageClient against a local aiohttp server.
+
+"""
+
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from client.async_alpha_vantage_client import (  # noqa: E402
+    AsyncAlphaVantageClient)
+
+
+def _run(payload, call, status=200, delay=0.0, **options):
+    """Serves `payload` for every request, `delay` seconds late, and awaits
+    `call(client)` on a client created with `options`.
+    """
+    requests_seen = []
+
+    async def handler(request):
+        requests_seen.append(dict(request.query))
+        await asyncio.sleep(delay)
+        if isinstance(payload, str):
+            return web.Response(text=payload, status=status)
+        return web.json_response(payload, status=status)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/query", handler)
+        async with TestServer(app) as server:
+            async with AsyncAlphaVantageClient(
+                    "TESTAPIKEY123",
+                    base_url=str(server.make_url("/query")),
+                    **options) as client:
+                return await call(client)
+
+    return asyncio.run(main()), requests_seen
+
+
+class TestAsyncAlphaVantageClient:
+    """Tests for the asyncio client endpoint methods and error handling."""
+
+    def test_currency_exchange_rate_success(self):
+        """Tests a rate is returned and the expected params are sent."""
+        rate = {"1. From_Currency Code": "USD", "5. Exchange Rate": "0.925"}
+        result, seen = _run(
+            {"Realtime Currency Exchange Rate": rate},
+            lambda c: c.get_currency_exchange_rate_response("USD", "EUR"))
+
+        assert result == rate
+        assert seen == [{
+            "function": "CURRENCY_EXCHANGE_RATE",
+            "from_currency": "USD",
+            "to_currency": "EUR",
+            "apikey": "TESTAPIKEY123",
+        }]
+
+    def test_concurrent_symbol_searches(self):
+        """Tests many lookups can be in flight on one client."""
+        async def call(client):
+            return await asyncio.gather(*(
+                client.get_symbol_search_response(f"T{i}")
+                for i in range(50)))
+
+        results, seen = _run({"bestMatches": []}, call)
+
+        assert results == [[]] * 50
+        assert len(seen) == 50
+
+    def test_pool_wait_not_timed_out(self):
+        """Tests calls queued for a free connection do not time out."""
+        async def call(client):
+            return await asyncio.gather(*(
+                client.get_symbol_search_response(f"T{i}")
+                for i in range(12)))
+
+        results, seen = _run({"bestMatches": []}, call, delay=0.1,
+                             connection_limit=2, timeout=0.3)
+
+        assert results == [[]] * 12
+        assert len(seen) == 12
+
+    def test_api_error_message(self):
+        """Tests "Error Message" payloads raise ValueError."""
+        with pytest.raises(ValueError, match="Alpha Vantage API Error: Bad"):
+            _run({"Error Message": "Bad"},
+                 lambda c: c.get_symbol_search_response("x"))
+
+    def test_information_message(self):
+        """Tests a lone "Information" payload raises ValueError."""
+        with pytest.raises(ValueError, match="Alpha Vantage API Info: Slow"):
+            _run({"Information": "Slow"},
+                 lambda c: c.get_currency_exchange_rate_response("A", "B"))
+
+    def test_malformed_json(self):
+        """Tests an invalid body raises ValueError."""
+        with pytest.raises(ValueError, match="Failed to decode JSON"):
+            _run("not json", lambda c: c.get_symbol_search_response("x"))
+
+    @pytest.mark.parametrize("body", ["", "[]"])
+    def test_empty_or_non_object_body(self, body):
+        """Tests an empty or non-object body raises ValueError."""
+        with pytest.raises(ValueError, match="Failed to decode JSON"):
+            _run(body, lambda c: c.get_symbol_search_response("x"))
+
+    def test_unexpected_structure(self):
+        """Tests a missing response key raises ValueError."""
+        with pytest.raises(
+                ValueError,
+                match="Unexpected response structure for SYMBOL_SEARCH."):
+            _run({"other": 1}, lambda c: c.get_symbol_search_response("x"))
+
+    def test_http_error(self):
+        """Tests 5XX responses raise aiohttp.ClientResponseError."""
+        with pytest.raises(aiohttp.ClientResponseError):
+            _run({}, lambda c: c.get_symbol_search_response("x"), status=503)
+
+    def test_client_initialization_no_api_key(self):
+        """Tests client raises ValueError if no API key is provided."""
+        with pytest.raises(ValueError, match="API key is required."):
+            AsyncAlphaVantageClient(api_key="")
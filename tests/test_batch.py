@@ -0,0 +1,83 @@
+""" tests/test_batch.py
+
+    Tests for the batch exchange-rate API of AlphaVantageClient.
+
+"""
+
+import threading
+from unittest.mock import patch
+
+import requests
+
+from tests.helpers import mock_response
+
+
+def _rate_response(params):
+    if params["from_currency"] == "XXX":
+        return mock_response({"Error Message": "Invalid call"})
+    return mock_response({
+        "Realtime Currency Exchange Rate": {
+            "1. From_Currency Code": params["from_currency"],
+            "3. To_Currency Code": params["to_currency"],
+        }
+    })
+
+
+class TestCurrencyExchangeRateBatch:
+    """Tests for get_currency_exchange_rates."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_pairs_are_normalized_and_deduplicated(self, mock_get, client):
+        """Tests each distinct pair is fetched once, in input order."""
+        mock_get.side_effect = lambda url, params, timeout: (
+            _rate_response(params))
+
+        batch = client.get_currency_exchange_rates(
+            [("USD", "EUR"), ("usd", "eur"), ("GBP", "EUR")])
+
+        assert mock_get.call_count == 2
+        assert list(batch.results) == [("USD", "EUR"), ("GBP", "EUR")]
+        assert batch[("GBP", "EUR")].result["1. From_Currency Code"] == "GBP"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_failures_do_not_abort_batch(self, mock_get, client):
+        """Tests API and network errors are reported per pair."""
+        def side_effect(url, params, timeout):
+            if params["from_currency"] == "JPY":
+                raise requests.exceptions.ConnectionError("down")
+            return _rate_response(params)
+        mock_get.side_effect = side_effect
+
+        batch = client.get_currency_exchange_rates(
+            [("USD", "EUR"), ("XXX", "EUR"), ("JPY", "EUR")])
+
+        assert list(batch.results) == [("USD", "EUR")]
+        assert isinstance(batch.errors[("XXX", "EUR")], ValueError)
+        assert isinstance(batch.errors[("JPY", "EUR")],
+                          requests.exceptions.ConnectionError)
+        assert all(item.latency >= 0 for item in batch)
+        assert batch.elapsed >= max(item.latency for item in batch)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_calls_run_concurrently(self, mock_get, client):
+        """Tests pairs are in flight at the same time."""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def side_effect(url, params, timeout):
+            barrier.wait()  # Breaks unless four calls overlap.
+            return _rate_response(params)
+        mock_get.side_effect = side_effect
+
+        batch = client.get_currency_exchange_rates(
+            [(code, "USD") for code in ("EUR", "GBP", "JPY", "CHF")],
+            max_workers=4)
+
+        assert not batch.errors
+        assert len(batch) == 4
+
+    def test_empty_batch(self, client):
+        """Tests an empty input returns an empty result."""
+        batch = client.get_currency_exchange_rates([])
+
+        assert len(batch) == 0
+        assert batch.results == {}
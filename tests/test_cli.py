@@ -0,0 +1,141 @@
+""" tests/test_cli.py
+
+    Tests for the `python -m client` entry point and for lazy loading of
+    heavy dependencies.
+
+"""
+
+import io
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.bench_import import LAZY_DEPENDENCIES, loaded_dependencies
+from client.__main__ import build_parser, main, run
+from client.alpha_vantage_client import AlphaVantageClient
+from client.lazy_import import lazy_attributes
+from tests.helpers import mock_response
+
+RATE = {"Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}}
+MATCHES = {"bestMatches": [{"1. symbol": "TSLA"}]}
+
+
+def _run(*argv):
+    out = io.StringIO()
+    run(build_parser().parse_args(list(argv)), out)
+    return json.loads(out.getvalue())
+
+
+class TestCli:
+    """Tests the rate and search commands."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_rate_served_from_store(self, mock_get, tmp_path):
+        """Tests a second run is answered from the persistent store."""
+        mock_get.return_value = mock_response(RATE)
+        store = str(tmp_path / "responses.bin")
+
+        first = _run("--api-key", "KEY", "--store", store,
+                     "rate", "USD", "EUR")
+        second = _run("--api-key", "KEY", "--store", store,
+                      "rate", "usd", "eur")
+
+        assert first == second == {"5. Exchange Rate": "0.9"}
+        assert mock_get.call_count == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_search_without_store(self, mock_get, tmp_path):
+        """Tests --no-store always calls the API."""
+        mock_get.return_value = mock_response(MATCHES)
+
+        for _ in range(2):
+            result = _run("--api-key", "KEY", "--no-store",
+                          "search", "Tesla")
+
+        assert result == [{"1. symbol": "TSLA"}]
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["params"]["keywords"] == "Tesla"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_api_error_exit_status(self, mock_get, capsys):
+        """Tests API errors print a message and exit with 1."""
+        mock_get.return_value = mock_response({"Error Message": "Invalid."})
+
+        status = main(["--api-key", "KEY", "--no-store",
+                       "rate", "USD", "XXX"])
+
+        assert status == 1
+        assert "Invalid." in capsys.readouterr().err
+
+    def test_api_key_required(self, monkeypatch):
+        """Tests a missing API key is a usage error."""
+        monkeypatch.delenv("ALPHAVANTAGE_API_KEY", raising=False)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--no-store", "search", "Tesla"])
+
+        assert exc_info.value.code == 2
+
+
+class TestLazyImports:
+    """Tests heavy dependencies load on first use only."""
+
+    @pytest.mark.parametrize("module", [
+        "client.alpha_vantage_client",
+        "client.__main__",
+        "client.async_alpha_vantage_client",
+    ])
+    def test_import_loads_no_heavy_dependency(self, module):
+        """Tests importing the client modules stays light."""
+        assert loaded_dependencies(module) == []
+
+    def test_optional_dependency_missing(self):
+        """Tests a missing optional package resolves to None and a missing
+        required one raises ImportError.
+        """
+        namespace = {"__name__": "example"}
+        load, module_getattr = lazy_attributes(
+            namespace, {"json": "json", "missing": "no_such_package"},
+            optional=True)
+
+        assert module_getattr("json") is json
+        assert load("missing") is None
+        assert namespace["missing"] is None
+        with pytest.raises(AttributeError):
+            module_getattr("other")
+        with pytest.raises(ImportError):
+            lazy_attributes({}, {"missing": "no_such_package"})[0]("missing")
+
+    def test_patched_http_adapter_is_used(self, api_key):
+        """Tests the HTTPAdapter module attribute builds the session's
+        adapters, so it can be patched.
+        """
+        with patch('client.alpha_vantage_client.HTTPAdapter') as adapter:
+            AlphaVantageClient(api_key)._session  # pylint: disable=W0104
+
+        assert adapter.call_count == 1
+
+    def test_store_hit_does_not_import_requests(self, tmp_path):
+        """Tests a CLI run answered from the store never loads requests."""
+        from client.cache import make_cache_key
+        from client.store import PersistentStore
+
+        path = str(tmp_path / "responses.bin")
+        with PersistentStore(path) as store:
+            store.put(make_cache_key({
+                "function": "CURRENCY_EXCHANGE_RATE",
+                "from_currency": "USD", "to_currency": "EUR"}), RATE)
+        script = (
+            "import sys\n"
+            "from client.__main__ import main\n"
+            f"main(['--api-key', 'KEY', '--store', {path!r}, "
+            "'rate', 'USD', 'EUR'])\n"
+            f"print(sorted(set({LAZY_DEPENDENCIES!r}) & set(sys.modules)))\n")
+
+        output = subprocess.run([sys.executable, "-c", script], check=True,
+                                capture_output=True, text=True).stdout
+
+        assert '"5. Exchange Rate": "0.9"' in output
+        assert output.strip().endswith("[]")
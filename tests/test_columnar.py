@@ -0,0 +1,98 @@
+""" tests/test_columnar.py
+
+    Tests for the column-array output of daily time series.
+
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from client.columnar import series_columns, to_columnar
+from tests.helpers import mock_response
+
+numpy = pytest.importorskip("numpy")
+
+SERIES = {
+    "2025-05-16": {"1. open": "266.0000", "2. high": "266.9000",
+                   "3. low": "264.1000", "4. close": "266.7600",
+                   "5. volume": "3813100"},
+    "2025-05-15": {"1. open": "258.0000", "2. high": "265.0000",
+                   "3. low": "257.5000", "4. close": "264.5000",
+                   "5. volume": "4101000"},
+}
+FX_SERIES = {
+    "2025-05-16": {"1. open": "1.1180", "2. high": "1.1230",
+                   "3. low": "1.1130", "4. close": "1.1166"},
+}
+
+
+class TestSeriesColumns:
+    """Tests the NumPy conversion."""
+
+    def test_columns_oldest_first(self):
+        """Tests dtypes, values and ascending order."""
+        columns = series_columns(SERIES)
+
+        assert columns["timestamp"].dtype == numpy.dtype("datetime64[D]")
+        assert list(columns["timestamp"].astype(str)) == [
+            "2025-05-15", "2025-05-16"]
+        assert columns["close"].dtype == numpy.float64
+        assert list(columns["close"]) == [264.5, 266.76]
+        assert list(columns["volume"]) == [4101000.0, 3813100.0]
+
+    def test_fx_series_has_no_volume(self):
+        """Tests FX bars give price columns only."""
+        columns = series_columns(FX_SERIES)
+
+        assert sorted(columns) == ["close", "high", "low", "open", "timestamp"]
+
+    def test_empty_series(self):
+        """Tests an empty series gives empty columns."""
+        assert len(series_columns({})["open"]) == 0
+
+    def test_malformed_value(self):
+        """Tests a bad number raises ValueError."""
+        series = {"2025-05-16": dict(FX_SERIES["2025-05-16"],
+                                     **{"2. high": "-"})}
+
+        with pytest.raises(ValueError, match="Malformed"):
+            series_columns(series)
+
+    def test_unknown_format(self):
+        """Tests only numpy and pandas are accepted."""
+        with pytest.raises(ValueError, match="columnar"):
+            to_columnar(SERIES, "arrow")
+
+    def test_frame(self):
+        """Tests the DataFrame is indexed by timestamp."""
+        pytest.importorskip("pandas")
+
+        frame = to_columnar(SERIES, "pandas")
+
+        assert list(frame.columns) == ["open", "high", "low", "close",
+                                       "volume"]
+        assert str(frame.index[0].date()) == "2025-05-15"
+        assert frame["close"].iloc[-1] == 266.76
+
+
+class TestColumnarEndpoints:
+    """Tests the columnar option of the time series methods."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_time_series_daily_numpy(self, mock_get, client):
+        """Tests the method returns column arrays."""
+        mock_get.return_value = mock_response({"Time Series (Daily)": SERIES})
+
+        columns = client.get_time_series_daily_response(
+            "IBM", columnar="numpy")
+
+        assert list(columns["open"]) == [258.0, 266.0]
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_unknown_format_fails_before_request(self, mock_get, client):
+        """Tests a bad format raises without calling the API."""
+        with pytest.raises(ValueError, match="columnar"):
+            client.get_fx_daily_response("EUR", "USD", columnar="arrow")
+
+        mock_get.assert_not_called()
@@ -0,0 +1,75 @@
+""" tests/test_connection_pool.py
+
+    Tests for the pooled HTTP session owned by AlphaVantageClient.
+
+"""
+
+from unittest.mock import patch
+
+from client.alpha_vantage_client import AlphaVantageClient
+from tests.helpers import mock_response
+
+
+class TestConnectionPool:
+    """Tests for session reuse, pool configuration and lifecycle."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_endpoints_share_one_session(self, mock_get, client):
+        """Tests every endpoint method goes through the same session."""
+        mock_get.side_effect = [
+            mock_response({"Realtime Currency Exchange Rate": {}}),
+            mock_response({"bestMatches": []}),
+        ]
+        session = client._session
+
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        client.get_symbol_search_response("Tesla")
+
+        assert mock_get.call_count == 2
+        assert client._session is session
+
+    def test_pool_configuration(self, api_key):
+        """Tests pool size settings reach the mounted adapter."""
+        client = AlphaVantageClient(
+            api_key, pool_connections=2, pool_maxsize=32, pool_block=True)
+        adapter = client._session.get_adapter(client.base_url)
+
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+
+    def test_keep_alive_disabled(self, api_key):
+        """Tests disabling keep-alive asks the server to close connections."""
+        client = AlphaVantageClient(api_key, keep_alive=False)
+
+        assert client._session.headers["Connection"] == "close"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_base_url_override(self, mock_get, api_key):
+        """Tests requests are sent to a custom base URL."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+        client = AlphaVantageClient(api_key, base_url="http://127.0.0.1/query")
+
+        client.get_symbol_search_response("Tesla")
+
+        assert mock_get.call_args.args == ("http://127.0.0.1/query",)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    @patch('client.alpha_vantage_client.requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close, mock_get,
+                                            api_key):
+        """Tests leaving the context manager closes pooled connections."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+        with AlphaVantageClient(api_key) as client:
+            assert isinstance(client, AlphaVantageClient)
+            client.get_symbol_search_response("Tesla")
+
+        mock_close.assert_called_once_with()
+
+    @patch('client.alpha_vantage_client.requests.Session.close')
+    def test_session_created_on_first_call(self, mock_close, api_key):
+        """Tests a client that makes no call opens no session."""
+        with AlphaVantageClient(api_key) as client:
+            assert client._http_session is None
+
+        mock_close.assert_not_called()
@@ -38,7 +38,7 @@ class TestCurrencyExchangeRate:
             Ensures the client requires an API key for initialization.
     """
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_success(self, mock_get, client):
         """Tests successful retrieval of an exchange rate."""
         mock_response = Mock()
@@ -72,12 +72,13 @@ class TestCurrencyExchangeRate:
                 "from_currency": from_currency,
                 "to_currency": to_currency,
                 "apikey": client.api_key,
-            })
+            },
+            timeout=AlphaVantageClient.SHORT_TIMEOUT)
         assert result == expected_data["Realtime Currency Exchange Rate"]
         assert result["1. From_Currency Code"] == from_currency
         assert result["3. To_Currency Code"] == to_currency
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_api_error(self, mock_get, client):
         """Tests handling of an API error message from Alpha Vantage."""
         mock_response = Mock()
@@ -94,7 +95,7 @@ class TestCurrencyExchangeRate:
                 match="Alpha Vantage API Error: Invalid API call"):
             client.get_currency_exchange_rate_response("UXD", "EUR")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_premium_endpoint_info(
             self, mock_get, client):
         """Tests handling of 'Information' messages."""
@@ -116,7 +117,7 @@ class TestCurrencyExchangeRate:
                     "This is a premium endpoint.")):
             client.get_currency_exchange_rate_response("USD", "EUR")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_network_error(self, mock_get, client):
         """Tests handling of network errors (e.g., connection timeout)."""
         mock_get.side_effect = requests.exceptions.ConnectionError(
@@ -126,7 +127,7 @@ class TestCurrencyExchangeRate:
                            match="Failed to connect"):
             client.get_currency_exchange_rate_response("USD", "EUR")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_malformed_json(self, mock_get, client):
         """Tests handling of a response with malformed JSON."""
         mock_response = Mock()
@@ -139,7 +140,7 @@ class TestCurrencyExchangeRate:
         with pytest.raises(ValueError, match="Failed to decode JSON response"):
             client.get_currency_exchange_rate_response("USD", "EUR")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_currency_exchange_rate_unexpected_success_structure(
             self, mock_get, client):
         """Tests a 200 OK response with an unexpected JSON structure."""
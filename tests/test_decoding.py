@@ -0,0 +1,103 @@
+""" tests/test_decoding.py
+
+    Tests for the pluggable JSON decoders.
+
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.decoding import FastJSONDecoder, orjson
+from tests.helpers import mock_response
+
+BACKENDS = ["json"] + (["orjson"] if orjson is not None else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+class TestFastJSONDecoder:
+    """Tests FastJSONDecoder with every installed backend."""
+
+    def test_only_response_key_is_kept(self, backend):
+        """Tests other top-level keys are dropped."""
+        body = json.dumps({
+            "Meta Data": {"1. Information": "x"},
+            "bestMatches": [{"1. symbol": "TSLA"}],
+        }).encode()
+
+        data = FastJSONDecoder(backend).loads(body, "bestMatches")
+
+        assert data == {"bestMatches": [{"1. symbol": "TSLA"}]}
+
+    def test_nested_key_is_not_mistaken_for_top_level(self, backend):
+        """Tests a nested or value occurrence of the key is skipped."""
+        body = json.dumps({
+            "note": "bestMatches",
+            "Meta Data": {"bestMatches": "nested"},
+            "bestMatches": [],
+        }).encode()
+
+        data = FastJSONDecoder(backend).loads(body, "bestMatches")
+
+        assert data == {"bestMatches": []}
+
+    def test_error_payload_is_kept(self, backend):
+        """Tests API messages survive when the response key is absent."""
+        body = b'{"Error Message": "Invalid API call."}'
+
+        data = FastJSONDecoder(backend).loads(body, "bestMatches")
+
+        assert data == {"Error Message": "Invalid API call."}
+
+    def test_message_next_to_response_key_is_kept(self, backend):
+        """Tests API messages are kept alongside the response key."""
+        body = json.dumps({
+            "Information": "Thank you for using Alpha Vantage!",
+            "bestMatches": [],
+        }).encode()
+
+        data = FastJSONDecoder(backend).loads(body, "bestMatches")
+
+        assert data == {"bestMatches": [],
+                        "Information": "Thank you for using Alpha Vantage!"}
+
+    def test_malformed_body(self, backend):
+        """Tests invalid JSON raises json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            FastJSONDecoder(backend).loads(b"<html>", "bestMatches")
+
+    def test_truncated_body(self, backend):
+        """Tests a body cut off after the response key is rejected."""
+        body = json.dumps({"bestMatches": [], "Meta Data": {}}).encode()
+
+        with pytest.raises(json.JSONDecodeError):
+            FastJSONDecoder(backend).loads(body[:-5], "bestMatches")
+
+
+class TestClientDecoder:
+    """Tests AlphaVantageClient with a FastJSONDecoder."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_decodes_raw_content(self, mock_get, api_key):
+        """Tests the client decodes Response.content with the decoder."""
+        response = mock_response(content=(
+            b'{"Realtime Currency Exchange Rate": {"5. Exchange Rate": "1"}}'))
+        mock_get.return_value = response
+        client = AlphaVantageClient(api_key, decoder=FastJSONDecoder())
+
+        result = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert result == {"5. Exchange Rate": "1"}
+        response.json.assert_not_called()
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_malformed_content(self, mock_get, api_key):
+        """Tests invalid bytes raise the client's decode ValueError."""
+        mock_get.return_value = mock_response(content=b"\xff not json")
+        client = AlphaVantageClient(
+            api_key, decoder=FastJSONDecoder("json"))
+
+        with pytest.raises(ValueError, match="Failed to decode JSON"):
+            client.get_symbol_search_response("Tesla")
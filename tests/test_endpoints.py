@@ -0,0 +1,108 @@
+""" tests/test_endpoints.py
+
+    Tests for the declarative endpoint registry.
+
+"""
+
+import inspect
+from unittest.mock import patch
+
+import pytest
+
+from client import endpoints
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache
+from client.endpoints import Endpoint, Param
+from client.rate_limit import RateLimiter
+from tests.helpers import mock_response
+
+
+@pytest.fixture()
+def custom_endpoint():
+    """Registers a throwaway endpoint and generates its method."""
+    endpoint = endpoints.register(Endpoint(
+        "GLOBAL_QUOTE", "Global Quote",
+        required=(Param("symbol", doc="The equity symbol."),),
+        optional=(Param("datatype", choices=("json", "csv")),),
+        ttl=30, cost=2, method="get_global_quote_response"))
+    endpoints.generate_methods(AlphaVantageClient, lambda e: (
+        lambda self, *args, **kwargs: self._call_endpoint(
+            e, e.params(self.api_key, *args, **kwargs))))
+    yield endpoint
+    del endpoints.ENDPOINTS["GLOBAL_QUOTE"]
+    del AlphaVantageClient.get_global_quote_response
+
+
+class TestEndpoint:
+    """Tests parameter building and validation."""
+
+    def test_params_bind_positionally_and_by_name(self):
+        """Tests both call styles give the same params."""
+        endpoint = endpoints.FX_DAILY
+
+        assert endpoint.params("KEY", "EUR", "USD", "full") == \
+            endpoint.params("KEY", to_symbol="USD", from_symbol="EUR",
+                            outputsize="full") == {
+            "function": "FX_DAILY", "from_symbol": "EUR",
+            "to_symbol": "USD", "outputsize": "full", "apikey": "KEY"}
+
+    def test_optional_default_is_sent(self):
+        """Tests outputsize falls back to its default."""
+        params = endpoints.TIME_SERIES_DAILY.params("KEY", "IBM")
+
+        assert params["outputsize"] == "compact"
+
+    def test_validation(self):
+        """Tests missing, unknown and out-of-choice arguments."""
+        endpoint = endpoints.TIME_SERIES_DAILY
+
+        with pytest.raises(ValueError, match="requires symbol"):
+            endpoint.params("KEY")
+        with pytest.raises(ValueError, match="outputsize"):
+            endpoint.params("KEY", "IBM", "huge")
+        with pytest.raises(TypeError, match="unexpected"):
+            endpoint.params("KEY", "IBM", interval="1min")
+        with pytest.raises(TypeError, match="multiple"):
+            endpoint.params("KEY", "IBM", symbol="IBM")
+
+    def test_unknown_function(self):
+        """Tests get_endpoint rejects unregistered names."""
+        with pytest.raises(ValueError, match="Unsupported function"):
+            endpoints.get_endpoint("NOPE")
+
+
+class TestGeneratedMethods:
+    """Tests client methods generated from the registry."""
+
+    def test_generated_signature_and_doc(self):
+        """Tests generated methods look hand-written to introspection."""
+        method = AlphaVantageClient.get_currency_exchange_rate_response
+
+        assert list(inspect.signature(method).parameters) == [
+            "self", "from_currency", "to_currency"]
+        assert "from_currency (str)" in method.__doc__
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_new_endpoint_is_one_entry(self, mock_get, api_key,
+                                       custom_endpoint):
+        """Tests a registered endpoint gets a method, TTL and cost."""
+        mock_get.return_value = mock_response(
+            {"Global Quote": {"05. price": "1"}})
+        limiter = RateLimiter(requests_per_minute=10, requests_per_day=None)
+        client = AlphaVantageClient(api_key, rate_limiter=limiter)
+
+        result = client.get_global_quote_response("IBM")
+
+        assert result == {"05. price": "1"}
+        assert ResponseCache().ttl_for("GLOBAL_QUOTE") == 30
+        assert limiter._buckets[0].tokens == pytest.approx(8, abs=0.01)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_batch_call(self, mock_get, client):
+        """Tests any registered function can be batched."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+
+        result = client.batch_call("SYMBOL_SEARCH", ["Tesla", ("Apple",)])
+
+        assert result[("Tesla",)].result == []
+        assert result[("Apple",)].ok
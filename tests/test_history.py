@@ -0,0 +1,128 @@
+""" tests/test_history.py
+
+    Tests for the incremental refresh of daily time series.
+
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.history import HistoryStore, HistorySync
+from tests.helpers import mock_response
+
+KEY = "Time Series (Daily)"
+
+
+def make_series(newest, days, close="1.0000"):
+    """Returns `days` bars ending at day offset `newest`, newest first."""
+    start = date(2025, 1, 1)
+    return {
+        (start + timedelta(days=offset)).isoformat(): {
+            "1. open": "1.0000", "2. high": "1.0000", "3. low": "1.0000",
+            "4. close": close, "5. volume": "100"}
+        for offset in range(newest, newest - days, -1)}
+
+
+class FakeApi:
+    """Serves a full history and its compact window as mock responses."""
+
+    def __init__(self, series, key=KEY):
+        self.series = series
+        self.key = key
+        self.calls = []
+
+    def __call__(self, url, params=None, timeout=None):
+        self.calls.append(params["outputsize"])
+        series = self.series
+        if params["outputsize"] == "compact":
+            series = dict(list(series.items())[:100])
+        return mock_response({self.key: series})
+
+
+@pytest.fixture()
+def sync(tmp_path, api_key, clock):
+    client = AlphaVantageClient(api_key, coalesce_requests=False)
+    return HistorySync(client, HistoryStore(str(tmp_path)), clock=clock)
+
+
+class TestHistorySync:
+    """Tests full pulls, incremental merges, gaps and skips."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_first_sync_is_full_then_incremental(self, mock_get, sync, clock):
+        """Tests only the compact window is fetched once history exists."""
+        api = mock_get.side_effect = FakeApi(make_series(300, 300))
+
+        first = sync.sync("TIME_SERIES_DAILY", "IBM")
+        api.series = dict(make_series(302, 2), **api.series)
+        clock.now += 24 * 60 * 60
+        second = sync.sync("TIME_SERIES_DAILY", "IBM")
+
+        assert api.calls == ["full", "compact"]
+        assert (first.mode, first.new_bars) == ("full", 300)
+        assert (second.mode, second.new_bars) == ("incremental", 2)
+        assert (first.calls_made, second.calls_made) == (1, 1)
+        assert second.bytes_saved > 0
+        history = sync.history("TIME_SERIES_DAILY", "IBM")
+        assert len(history) == 302
+        assert next(iter(history)) == "2025-10-30"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_changed_bars_are_replaced(self, mock_get, sync, clock):
+        """Tests a corrected bar in the window overwrites the stored one."""
+        api = mock_get.side_effect = FakeApi(make_series(200, 200))
+        sync.sync("TIME_SERIES_DAILY", "IBM")
+        api.series = dict(api.series)
+        newest = next(iter(api.series))
+        api.series[newest] = dict(api.series[newest], **{"4. close": "2.0"})
+        clock.now += 24 * 60 * 60
+
+        report = sync.sync("TIME_SERIES_DAILY", "IBM")
+
+        assert (report.new_bars, report.changed_bars) == (0, 1)
+        assert sync.history("TIME_SERIES_DAILY", "IBM")[newest][
+            "4. close"] == "2.0"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_gap_triggers_full_pull(self, mock_get, sync, clock):
+        """Tests a window not reaching the stored bars re-pulls all."""
+        api = mock_get.side_effect = FakeApi(make_series(150, 150))
+        sync.sync("TIME_SERIES_DAILY", "IBM")
+        api.series = make_series(400, 400)
+        clock.now += 24 * 60 * 60
+
+        report = sync.sync("TIME_SERIES_DAILY", "IBM")
+
+        assert report.mode == "gap"
+        assert report.calls_made == 2
+        assert api.calls == ["full", "compact", "full"]
+        assert len(sync.history("TIME_SERIES_DAILY", "IBM")) == 400
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_recent_sync_is_skipped(self, mock_get, sync):
+        """Tests no call is made within min_interval."""
+        api = mock_get.side_effect = FakeApi(make_series(120, 120))
+        sync.sync("TIME_SERIES_DAILY", "IBM")
+
+        report = sync.sync("TIME_SERIES_DAILY", "ibm")
+
+        assert report.mode == "skipped"
+        assert api.calls == ["full"]
+        assert sync.stats()["calls_saved"] == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_history_survives_new_sync_object(self, mock_get, sync,
+                                              tmp_path, api_key):
+        """Tests the stored history is reused after a restart."""
+        mock_get.side_effect = FakeApi(make_series(120, 120),
+                                       "Time Series FX (Daily)")
+        sync.sync("FX_DAILY", "EUR", "USD")
+
+        restarted = HistorySync(AlphaVantageClient(api_key),
+                                HistoryStore(str(tmp_path)))
+
+        assert len(restarted.history("FX_DAILY", "EUR", "USD")) == 120
+        assert (tmp_path / "FX_DAILY-EUR-USD.json").exists()
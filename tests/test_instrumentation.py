@@ -0,0 +1,96 @@
+""" tests/test_instrumentation.py
+
+    Tests for instrumentation hooks and their use by AlphaVantageClient.
+
+"""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache
+from client.instrumentation import (
+    CallbackHook, Instrumentation, LoggingHook, PrometheusHook)
+from tests.helpers import mock_response
+
+
+class TestHooks:
+    """Tests hook dispatch and the Prometheus export."""
+
+    def test_callback_and_logging_hooks(self, caplog):
+        """Tests events reach callback and logging hooks."""
+        events = []
+        instrumentation = Instrumentation(
+            CallbackHook(lambda *event: events.append(event)), LoggingHook())
+
+        with caplog.at_level(logging.DEBUG, logger="client.instrumentation"):
+            instrumentation.span("SYMBOL_SEARCH", "total", 0.25)
+            instrumentation.count("SYMBOL_SEARCH", "errors")
+
+        assert events == [("span", "SYMBOL_SEARCH", "total", 0.25),
+                          ("count", "SYMBOL_SEARCH", "errors", 1)]
+        assert "SYMBOL_SEARCH total 0.250000s" in caplog.text
+
+    def test_prometheus_export(self):
+        """Tests histograms and counters in exposition format."""
+        hook = PrometheusHook(buckets=(0.1, 1.0))
+        hook.on_span("FX", "total", 0.05)
+        hook.on_span("FX", "total", 0.5)
+        hook.on_span("FX", "total", 5.0)
+        hook.on_count("FX", "errors", 2)
+
+        text = hook.export()
+
+        assert ('alphavantage_request_phase_seconds_bucket'
+                '{function="FX",phase="total",le="0.1"} 1') in text
+        assert ('alphavantage_request_phase_seconds_bucket'
+                '{function="FX",phase="total",le="1.0"} 2') in text
+        assert ('alphavantage_request_phase_seconds_bucket'
+                '{function="FX",phase="total",le="+Inf"} 3') in text
+        assert ('alphavantage_request_phase_seconds_count'
+                '{function="FX",phase="total"} 3') in text
+        assert ('alphavantage_events_total'
+                '{function="FX",event="errors"} 2') in text
+
+
+class TestClientInstrumentation:
+    """Tests the events AlphaVantageClient reports."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_phases_and_counters(self, mock_get, api_key):
+        """Tests a call reports all phases, cache and error counters."""
+        mock_get.side_effect = [
+            mock_response({"bestMatches": []}),
+            mock_response({"Information": "API rate limit reached."}),
+        ]
+        hook = PrometheusHook()
+        client = AlphaVantageClient(api_key, cache=ResponseCache(),
+                                    instrumentation=Instrumentation(hook))
+
+        client.get_symbol_search_response("Tesla")
+        client.get_symbol_search_response("Tesla")
+        with pytest.raises(ValueError):
+            client.get_symbol_search_response("Apple")
+
+        phases = {phase for _, phase in hook.histograms}
+        assert phases == {"connect_wait", "download", "decode", "validate",
+                          "total"}
+        assert hook.counters == {
+            ("SYMBOL_SEARCH", "cache_misses"): 2,
+            ("SYMBOL_SEARCH", "cache_hits"): 1,
+            ("SYMBOL_SEARCH", "requests"): 2,
+            ("SYMBOL_SEARCH", "throttles"): 1,
+        }
+
+    @patch('client.alpha_vantage_client.time.perf_counter')
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_no_timing_without_hooks(self, mock_get, mock_clock, api_key):
+        """Tests an instrumentation without hooks adds no timing calls."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+        client = AlphaVantageClient(api_key, instrumentation=Instrumentation())
+
+        client.get_symbol_search_response("Tesla")
+
+        mock_clock.assert_not_called()
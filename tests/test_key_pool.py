@@ -0,0 +1,126 @@
+""" tests/test_key_pool.py
+
+    Tests for load balancing over several API keys.
+
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.exceptions import InvalidApiKeyError, RateLimitTimeout
+from client.key_pool import KeyPool
+from client.rate_limit import RateLimiter
+from tests.helpers import mock_response
+
+THROTTLE = {"Information": "Thank you for using Alpha Vantage! Our standard "
+                           "API rate limit is 25 requests per day."}
+INVALID = {"Error Message": "the parameter apikey is invalid or missing."}
+RATE = {"Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}}
+
+
+def _pool(clock, keys=("K1", "K2", "K3"), **kwargs):
+    return KeyPool(keys, limiter_factory=lambda key: RateLimiter(
+        requests_per_minute=5, requests_per_day=None,
+        clock=clock, sleep=clock.sleep),
+        clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestKeyPool:
+    """Tests key selection, cooldowns and throughput."""
+
+    def test_throughput_scales_with_keys(self, clock):
+        """Tests N keys grant N quotas before anyone waits."""
+        pool = _pool(clock)
+
+        keys = [pool.acquire() for _ in range(15)]
+
+        assert clock.slept == []
+        assert sorted(pool.calls.values()) == [5, 5, 5]
+        assert keys[:3] == ["K1", "K2", "K3"]
+
+    def test_waits_on_key_free_soonest(self, clock):
+        """Tests a call beyond all quotas queues on one key."""
+        pool = _pool(clock, keys=("K1", "K2"))
+        for _ in range(10):
+            pool.acquire()
+
+        pool.acquire()
+
+        assert clock.slept == [pytest.approx(12.0)]
+
+    def test_throttled_key_leaves_rotation(self, clock):
+        """Tests a throttled key is skipped until its cooldown ends."""
+        pool = _pool(clock, throttle_cooldown=30)
+
+        pool.on_throttle("K1")
+
+        assert pool.active_keys() == ["K2", "K3"]
+        clock.now += 30
+        assert pool.active_keys() == ["K1", "K2", "K3"]
+
+    def test_all_keys_out_of_rotation(self, clock):
+        """Tests the pool waits for a key to return, or times out."""
+        pool = _pool(clock, keys=("K1",), invalid_key_cooldown=100)
+        pool.on_invalid_key("K1")
+
+        with pytest.raises(RateLimitTimeout):
+            pool.acquire(timeout=10)
+        assert pool.acquire() == "K1"
+        assert clock.now == pytest.approx(100)
+
+    def test_requires_keys(self):
+        """Tests an empty pool is rejected."""
+        with pytest.raises(ValueError):
+            KeyPool([])
+
+
+class TestClientWithKeyPool:
+    """Tests the client spreading calls over the pool."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_calls_rotate_over_keys(self, mock_get, clock):
+        """Tests consecutive calls use different keys."""
+        mock_get.return_value = mock_response(RATE)
+        client = AlphaVantageClient(key_pool=_pool(clock),
+                                    coalesce_requests=False)
+
+        for currency in ("EUR", "GBP", "JPY"):
+            client.get_currency_exchange_rate_response("USD", currency)
+
+        used = [call.kwargs["params"]["apikey"]
+                for call in mock_get.call_args_list]
+        assert used == ["K1", "K2", "K3"]
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_throttle_retries_on_other_key(self, mock_get, clock):
+        """Tests a throttled key is replaced by the next one."""
+        mock_get.side_effect = [mock_response(THROTTLE), mock_response(RATE)]
+        pool = _pool(clock)
+        client = AlphaVantageClient(key_pool=pool)
+
+        result = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert result == RATE["Realtime Currency Exchange Rate"]
+        assert "K1" not in pool.active_keys()
+        assert pool.limiters["K1"].throttled == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_invalid_key_on_every_key(self, mock_get, clock):
+        """Tests the error surfaces once no key is left."""
+        mock_get.return_value = mock_response(INVALID)
+        pool = _pool(clock, keys=("K1", "K2"))
+        client = AlphaVantageClient(key_pool=pool)
+
+        with pytest.raises(InvalidApiKeyError, match="apikey is invalid"):
+            client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert mock_get.call_count == 2
+        assert pool.active_keys() == []
+
+    def test_rate_limiter_and_pool_are_exclusive(self, clock):
+        """Tests both limits at once are rejected."""
+        with pytest.raises(ValueError, match="either"):
+            AlphaVantageClient(key_pool=_pool(clock),
+                               rate_limiter=RateLimiter())
@@ -0,0 +1,134 @@
+""" tests/test_models.py
+
+    Tests for the typed ExchangeRate and SymbolMatch result records.
+
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache
+from client.models import ExchangeRate, SymbolMatch
+from client.shared_state import SharedCache
+from tests.helpers import mock_response
+
+
+RATE_DATA = {
+    "1. From_Currency Code": "USD",
+    "2. From_Currency Name": "United States Dollar",
+    "3. To_Currency Code": "EUR",
+    "4. To_Currency Name": "Euro",
+    "5. Exchange Rate": "0.92500000",
+    "6. Last Refreshed": "2025-05-16 08:00:00",
+    "7. Time Zone": "UTC",
+    "8. Bid Price": "0.92490000",
+    "9. Ask Price": "-",
+}
+
+MATCH_DATA = {
+    "1. symbol": "TSLA",
+    "2. name": "Tesla Inc",
+    "3. type": "Equity",
+    "4. region": "United States",
+    "5. marketOpen": "09:30",
+    "6. marketClose": "16:00",
+    "7. timezone": "UTC-04",
+    "8. currency": "USD",
+    "9. matchScore": "1.0000",
+}
+
+
+class TestModels:
+    """Tests for parsing and converting typed records."""
+
+    def test_exchange_rate_parses_fields_once(self):
+        """Tests numbers and timestamps are parsed into native types."""
+        rate = ExchangeRate.from_response(RATE_DATA)
+
+        assert rate.from_code == "USD"
+        assert rate.rate == 0.925
+        assert rate.bid == 0.9249
+        assert rate.ask is None
+        assert rate.last_refreshed == datetime(
+            2025, 5, 16, 8, 0, tzinfo=timezone.utc)
+        assert not hasattr(rate, "__dict__")
+
+    def test_exchange_rate_round_trip(self):
+        """Tests to_dict() restores the raw response keys."""
+        raw = ExchangeRate.from_response(RATE_DATA).to_dict()
+
+        assert list(raw) == list(RATE_DATA)
+        assert raw["6. Last Refreshed"] == "2025-05-16 08:00:00"
+        assert ExchangeRate.from_response(raw) == ExchangeRate.from_response(
+            RATE_DATA)
+
+    def test_exchange_rate_malformed(self):
+        """Tests a missing rate raises ValueError."""
+        with pytest.raises(ValueError, match="CURRENCY_EXCHANGE_RATE"):
+            ExchangeRate.from_response({"1. From_Currency Code": "USD"})
+
+    def test_symbol_match(self):
+        """Tests match scores are parsed to floats."""
+        match = SymbolMatch.from_response(MATCH_DATA)
+
+        assert match.symbol == "TSLA"
+        assert match.match_score == 1.0
+        assert not hasattr(match, "__dict__")
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_client_typed_results(self, mock_get, api_key):
+        """Tests typed mode returns records from both endpoints."""
+        mock_get.side_effect = [
+            mock_response({"Realtime Currency Exchange Rate": RATE_DATA}),
+            mock_response({"bestMatches": [MATCH_DATA]}),
+        ]
+        client = AlphaVantageClient(api_key, typed_results=True)
+
+        rate = client.get_currency_exchange_rate_response("USD", "EUR")
+        matches = client.get_symbol_search_response("Tesla")
+
+        assert rate == ExchangeRate.from_response(RATE_DATA)
+        assert matches == [SymbolMatch.from_response(MATCH_DATA)]
+
+    @patch('client.models.ExchangeRate.from_response',
+           wraps=ExchangeRate.from_response)
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_typed_records_cached(self, mock_get, mock_from_response,
+                                  api_key):
+        """Tests cache hits reuse the record built when the response was
+        loaded.
+        """
+        mock_get.return_value = mock_response({
+            "Realtime Currency Exchange Rate": RATE_DATA})
+        client = AlphaVantageClient(api_key, cache=ResponseCache(),
+                                    typed_results=True)
+
+        first = client.get_currency_exchange_rate_response("USD", "EUR")
+        second = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert second is first
+        assert mock_from_response.call_count == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_cached_records_shared_with_untyped_client(self, mock_get,
+                                                       api_key, tmp_path):
+        """Tests records cached by a typed client are served as dicts to
+        untyped clients, in memory and through a SharedCache.
+        """
+        mock_get.return_value = mock_response({
+            "bestMatches": [MATCH_DATA]})
+        for cache in (ResponseCache(),
+                      SharedCache(str(tmp_path / "shared.sqlite"))):
+            typed = AlphaVantageClient(api_key, cache=cache,
+                                       typed_results=True)
+            raw = AlphaVantageClient(api_key, cache=cache)
+
+            matches = typed.get_symbol_search_response("Tesla")
+            assert matches == [SymbolMatch.from_response(MATCH_DATA)]
+            assert raw.get_symbol_search_response("Tesla")[0][
+                "1. symbol"] == "TSLA"
+            assert typed.get_symbol_search_response("Tesla") == matches
+        assert mock_get.call_count == 2
@@ -0,0 +1,173 @@
+""" tests/test_prefetch.py
+
+    Tests for the background watchlist prefetcher.
+
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache, make_cache_key
+from client.prefetch import PrefetchScheduler
+from client.rate_limit import RateLimiter
+from client.store import PersistentStore
+from tests.helpers import mock_response
+
+RATE = {"Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}}
+MATCHES = {"bestMatches": [{"1. symbol": "TSLA"}]}
+
+
+def _responses(*args, **kwargs):
+    function = kwargs["params"]["function"]
+    return mock_response(RATE if function == "CURRENCY_EXCHANGE_RATE"
+                         else MATCHES)
+
+
+def _client(clock, **kwargs):
+    return AlphaVantageClient(
+        "KEY", cache=ResponseCache(clock=clock), **kwargs)
+
+
+class TestPrefetchScheduler:
+    """Tests scheduling, budget use and the background thread."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_prefetch_warms_cache(self, mock_get, clock):
+        """Tests watched calls are served from the cache afterwards."""
+        mock_get.side_effect = _responses
+        client = _client(clock)
+        scheduler = PrefetchScheduler(client, [
+            ("CURRENCY_EXCHANGE_RATE", ("USD", "EUR")),
+            ("SYMBOL_SEARCH", "Tesla"),
+        ], clock=clock)
+
+        scheduler.run_pending()
+        assert mock_get.call_count == 2
+
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        client.get_symbol_search_response("Tesla")
+        assert mock_get.call_count == 2
+        assert scheduler.stats()["refreshes"] == 2
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_refresh_bypasses_store(self, mock_get, tmp_path, clock):
+        """Tests prefetches call the API even when the store holds a fresh
+        response, and write the new one to the store and the cache.
+        """
+        mock_get.side_effect = _responses
+        params = {"function": "CURRENCY_EXCHANGE_RATE",
+                  "from_currency": "USD", "to_currency": "EUR"}
+        with PersistentStore(str(tmp_path / "responses.bin")) as store:
+            store.put(make_cache_key(params), {
+                "Realtime Currency Exchange Rate": {
+                    "5. Exchange Rate": "0.8"}})
+            client = _client(clock, store=store)
+            PrefetchScheduler(
+                client, [("CURRENCY_EXCHANGE_RATE", ("USD", "EUR"))],
+                clock=clock).run_pending()
+
+            assert mock_get.call_count == 1
+            assert store.get(make_cache_key(params))[0] == RATE
+            assert client.get_currency_exchange_rate_response(
+                "USD", "EUR") == {"5. Exchange Rate": "0.9"}
+            assert mock_get.call_count == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_refreshes_before_ttl(self, mock_get, clock):
+        """Tests items are refreshed on their interval, before the cache
+        entry expires.
+        """
+        mock_get.side_effect = _responses
+        client = _client(clock)
+        scheduler = PrefetchScheduler(
+            client, [("CURRENCY_EXCHANGE_RATE", ("USD", "EUR"))], clock=clock)
+
+        assert scheduler.run_pending() == pytest.approx(54)
+        clock.now = 53
+        scheduler.run_pending()
+        assert mock_get.call_count == 1
+        clock.now = 54
+        scheduler.run_pending()
+        assert mock_get.call_count == 2
+
+        clock.now = 59
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        assert mock_get.call_count == 2
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_keeps_reserve_for_live_requests(self, mock_get, clock):
+        """Tests prefetches stop at the reserve and are deferred."""
+        mock_get.side_effect = _responses
+        limiter = RateLimiter(requests_per_minute=3, requests_per_day=None,
+                              clock=clock, sleep=lambda seconds: None)
+        client = _client(clock, rate_limiter=limiter)
+        scheduler = PrefetchScheduler(client, [
+            ("CURRENCY_EXCHANGE_RATE", ("USD", "EUR"), 3600),
+            ("CURRENCY_EXCHANGE_RATE", ("USD", "JPY"), 3600),
+            ("CURRENCY_EXCHANGE_RATE", ("USD", "GBP"), 3600),
+        ], reserve=1, retry_delay=5, clock=clock)
+
+        scheduler.run_pending()
+
+        assert mock_get.call_count == 2
+        assert scheduler.deferred == 1
+        assert limiter.try_acquire()
+
+        clock.now = 5 + 20  # One token back, the reserve kept.
+        scheduler.run_pending()
+        assert mock_get.call_count == 2
+        clock.now = 5 + 60
+        scheduler.run_pending()
+        assert mock_get.call_count == 3
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_failed_prefetch_retried(self, mock_get, clock):
+        """Tests errors are counted and retried after retry_delay."""
+        mock_get.side_effect = [mock_response({"Error Message": "Invalid."}),
+                                mock_response(RATE)]
+        scheduler = PrefetchScheduler(
+            _client(clock), [("CURRENCY_EXCHANGE_RATE", ("USD", "EUR"))],
+            retry_delay=5, clock=clock)
+
+        assert scheduler.run_pending() == pytest.approx(5)
+        item = scheduler.items[0]
+        assert item.errors == 1
+        assert isinstance(item.last_error, ValueError)
+
+        clock.now = 5
+        scheduler.run_pending()
+        assert item.refreshes == 1
+
+    def test_requires_cache(self):
+        """Tests a client without a cache is rejected."""
+        with pytest.raises(ValueError):
+            PrefetchScheduler(AlphaVantageClient("KEY"))
+
+    def test_rejects_unknown_function(self, clock):
+        """Tests watchlist entries are validated up front."""
+        with pytest.raises(ValueError):
+            PrefetchScheduler(_client(clock), [("NOPE", "X")])
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_background_thread_start_stop(self, mock_get):
+        """Tests the thread prefetches added items and stops cleanly."""
+        fetched = threading.Event()
+
+        def get(*args, **kwargs):
+            fetched.set()
+            return _responses(*args, **kwargs)
+
+        mock_get.side_effect = get
+        scheduler = PrefetchScheduler(AlphaVantageClient(
+            "KEY", cache=ResponseCache()))
+
+        with scheduler:
+            assert scheduler.running
+            scheduler.add("SYMBOL_SEARCH", "Tesla")
+            assert fetched.wait(5)
+
+        assert not scheduler.running
+        assert scheduler.refreshes == 1
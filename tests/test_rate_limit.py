@@ -0,0 +1,121 @@
+""" tests/test_rate_limit.py
+
+    Tests for the client-side RateLimiter and its use by AlphaVantageClient.
+
+"""
+
+from unittest.mock import patch
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.exceptions import RateLimitTimeout, ThrottleError
+from client.rate_limit import RateLimiter
+from tests.helpers import mock_response
+
+
+def _limiter(clock, **kwargs):
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestRateLimiter:
+    """Tests for token buckets, queueing and adaptive backoff."""
+
+    def test_burst_then_queue(self, clock):
+        """Tests calls beyond the minute quota wait for a refill."""
+        limiter = _limiter(clock, requests_per_minute=5)
+
+        for _ in range(5):
+            limiter.acquire()
+        assert clock.slept == []
+        assert limiter.queue_wait == pytest.approx(12.0)
+
+        limiter.acquire()
+        assert clock.slept == [pytest.approx(12.0)]
+
+    def test_daily_quota(self, clock):
+        """Tests the daily bucket limits even with minute tokens left."""
+        limiter = _limiter(clock, requests_per_minute=100, requests_per_day=2)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.queue_wait == pytest.approx(12 * 60 * 60)
+
+    def test_timeout_does_not_reserve(self, clock):
+        """Tests a refused acquire leaves the queue unchanged."""
+        limiter = _limiter(clock, requests_per_minute=1)
+        limiter.acquire()
+
+        assert limiter.acquire(timeout=1) is False
+        assert limiter.queue_wait == pytest.approx(60.0)
+
+    def test_adaptive_backoff(self, clock):
+        """Tests throttles double the pause and successes shrink it."""
+        limiter = _limiter(clock, requests_per_minute=1000, base_backoff=1,
+                            max_backoff=4)
+
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.backoff == 2
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.backoff == 4
+        assert limiter.queue_wait >= 4
+
+        limiter.on_success()
+        assert limiter.backoff == 2
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.backoff == 0
+
+    def test_for_api_key_shares_instance(self):
+        """Tests one limiter is shared per API key."""
+        first = RateLimiter.for_api_key("shared-key-test")
+        assert RateLimiter.for_api_key("shared-key-test") is first
+        assert RateLimiter.for_api_key("other-key-test") is not first
+
+
+class TestClientRateLimiting:
+    """Tests AlphaVantageClient with a RateLimiter."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_throttle_response_triggers_backoff(self, mock_get, api_key,
+                                                clock):
+        """Tests a rate-limit "Information" message backs the limiter off."""
+        mock_get.return_value = mock_response({
+            "Information": "Our standard API rate limit is 25 requests per day."
+        })
+        limiter = _limiter(clock)
+        client = AlphaVantageClient(api_key, rate_limiter=limiter)
+
+        with pytest.raises(ThrottleError, match="Alpha Vantage API Info"):
+            client.get_symbol_search_response("Tesla")
+        assert limiter.throttled == 1
+        assert limiter.backoff == RateLimiter.BASE_BACKOFF
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_premium_information_is_not_throttle(self, mock_get, api_key,
+                                                 clock):
+        """Tests other "Information" messages stay plain ValueErrors."""
+        mock_get.return_value = mock_response({
+            "Information": "This is a premium endpoint."})
+        limiter = _limiter(clock)
+        client = AlphaVantageClient(api_key, rate_limiter=limiter)
+
+        with pytest.raises(ValueError) as excinfo:
+            client.get_symbol_search_response("Tesla")
+        assert not isinstance(excinfo.value, ThrottleError)
+        assert limiter.throttled == 0
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_rate_limit_timeout(self, mock_get, api_key, clock):
+        """Tests calls fail fast when no slot is free within the timeout."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+        limiter = _limiter(clock, requests_per_minute=1)
+        client = AlphaVantageClient(
+            api_key, rate_limiter=limiter, rate_limit_timeout=5)
+
+        client.get_symbol_search_response("Tesla")
+        with pytest.raises(RateLimitTimeout):
+            client.get_symbol_search_response("Tesla")
+        mock_get.assert_called_once()
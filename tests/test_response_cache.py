@@ -0,0 +1,99 @@
+""" tests/test_response_cache.py
+
+    Tests for the TTL/LRU response cache and its use by AlphaVantageClient.
+
+"""
+
+from unittest.mock import patch
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache, make_cache_key
+from tests.helpers import mock_response
+
+
+def _rate_key(from_currency="USD", to_currency="EUR"):
+    return make_cache_key({
+        "function": "CURRENCY_EXCHANGE_RATE",
+        "from_currency": from_currency,
+        "to_currency": to_currency,
+    })
+
+
+class TestResponseCache:
+    """Tests for ResponseCache and make_cache_key."""
+
+    def test_cache_key_ignores_api_key_and_case(self):
+        """Tests keys are normalized and independent of the API key."""
+        key = make_cache_key({
+            "function": "CURRENCY_EXCHANGE_RATE",
+            "from_currency": " usd",
+            "to_currency": "eur",
+            "apikey": "KEY1",
+        })
+        assert key == make_cache_key({
+            "apikey": "KEY2",
+            "to_currency": "EUR",
+            "from_currency": "USD",
+            "function": "CURRENCY_EXCHANGE_RATE",
+        })
+
+    def test_per_function_ttl(self, clock):
+        """Tests exchange rates expire sooner than symbol searches."""
+        cache = ResponseCache(ttls={"CURRENCY_EXCHANGE_RATE": 10},
+                              clock=clock)
+        search_key = make_cache_key(
+            {"function": "SYMBOL_SEARCH", "keywords": "Tesla"})
+        cache.set(_rate_key(), {"rate": 1})
+        cache.set(search_key, {"bestMatches": []})
+
+        clock.now = 11
+        assert cache.get(_rate_key()) is None
+        assert cache.get(search_key) == {"bestMatches": []}
+        assert cache.expirations == 1
+
+    def test_lru_eviction(self):
+        """Tests the least recently used entry is evicted first."""
+        cache = ResponseCache(max_size=2)
+        cache.set(_rate_key("USD"), 1)
+        cache.set(_rate_key("GBP"), 2)
+        cache.get(_rate_key("USD"))
+        cache.set(_rate_key("JPY"), 3)
+
+        assert cache.get(_rate_key("GBP")) is None
+        assert cache.get(_rate_key("USD")) == 1
+        assert cache.stats() == {
+            "hits": 2, "misses": 1, "evictions": 1, "expirations": 0,
+            "size": 2,
+        }
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_client_serves_repeated_calls_from_cache(self, mock_get,
+                                                     api_key):
+        """Tests a repeated call does not reach the network."""
+        mock_get.return_value = mock_response({
+            "Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.925"}})
+        cache = ResponseCache()
+        client = AlphaVantageClient(api_key, cache=cache)
+
+        first = client.get_currency_exchange_rate_response("USD", "EUR")
+        second = client.get_currency_exchange_rate_response("usd", "eur")
+
+        assert first == second == {"5. Exchange Rate": "0.925"}
+        mock_get.assert_called_once()
+        assert cache.hits == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_client_does_not_cache_errors(self, mock_get, api_key):
+        """Tests API errors are not stored in the cache."""
+        mock_get.return_value = mock_response(
+            {"Error Message": "Invalid call"})
+        cache = ResponseCache()
+        client = AlphaVantageClient(api_key, cache=cache)
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Invalid call"):
+                client.get_symbol_search_response("Tesla")
+
+        assert mock_get.call_count == 2
+        assert len(cache) == 0
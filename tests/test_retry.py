@@ -0,0 +1,114 @@
+""" tests/test_retry.py
+
+    Tests for RetryPolicy, RetryBudget and AdaptiveTimeout.
+
+"""
+
+from unittest.mock import patch, Mock
+
+import pytest
+import requests
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.retry import AdaptiveTimeout, RetryBudget, RetryPolicy
+from tests.helpers import mock_response
+
+
+def _http_error(status):
+    response = Mock(status_code=status)
+    return requests.exceptions.HTTPError(f"{status}", response=response)
+
+
+class TestRetryPolicy:
+    """Tests retry decisions, backoff and budget."""
+
+    def test_retries_transient_errors(self):
+        """Tests connection errors are retried with jittered backoff."""
+        slept = []
+        policy = RetryPolicy(max_attempts=3, base_delay=1, sleep=slept.append,
+                             rng=lambda: 0.5)
+        fn = Mock(side_effect=[requests.exceptions.ConnectionError(),
+                               _http_error(503), "ok"])
+
+        assert policy.call(fn) == "ok"
+        assert fn.call_count == 3
+        assert slept == [0.5, 1.0]
+        assert policy.retries == 2
+
+    def test_does_not_retry_api_errors(self):
+        """Tests ValueErrors and 4XX responses fail immediately."""
+        policy = RetryPolicy(sleep=Mock())
+        for error in (ValueError("Alpha Vantage API Error"),
+                      _http_error(404)):
+            fn = Mock(side_effect=error)
+            with pytest.raises(type(error)):
+                policy.call(fn)
+            fn.assert_called_once()
+
+    def test_gives_up_after_max_attempts(self):
+        """Tests the last error is raised when attempts run out."""
+        policy = RetryPolicy(max_attempts=2, sleep=Mock())
+        fn = Mock(side_effect=requests.exceptions.Timeout("slow"))
+
+        with pytest.raises(requests.exceptions.Timeout, match="slow"):
+            policy.call(fn)
+        assert fn.call_count == 2
+
+    def test_budget_limits_retries(self):
+        """Tests an exhausted budget stops retrying."""
+        budget = RetryBudget(ratio=0, min_tokens=1)
+        policy = RetryPolicy(max_attempts=5, budget=budget, sleep=Mock())
+        fn = Mock(side_effect=requests.exceptions.ConnectionError())
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy.call(fn)
+        assert fn.call_count == 2
+
+    def test_backoff_is_capped(self):
+        """Tests the delay never exceeds max_delay."""
+        policy = RetryPolicy(base_delay=1, max_delay=3, rng=lambda: 0.999)
+
+        assert policy.backoff(10) < 3
+
+
+class TestAdaptiveTimeout:
+    """Tests latency-derived timeouts."""
+
+    def test_initial_until_enough_samples(self):
+        """Tests the initial timeout is used while data is scarce."""
+        timeouts = AdaptiveTimeout(initial=1.0, min_samples=3)
+        timeouts.observe("SYMBOL_SEARCH", 0.1)
+
+        assert timeouts.timeout_for("SYMBOL_SEARCH") == 1.0
+
+    def test_percentile_times_multiplier(self):
+        """Tests the timeout follows the latency tail, clamped."""
+        timeouts = AdaptiveTimeout(percentile=0.9, multiplier=2,
+                                   min_timeout=0.05, max_timeout=5,
+                                   min_samples=10)
+        for latency in range(1, 11):
+            timeouts.observe("FX", latency / 100)
+            timeouts.observe("SLOW", latency)
+
+        assert timeouts.latency_percentile("FX") == 0.09
+        assert timeouts.timeout_for("FX") == pytest.approx(0.18)
+        assert timeouts.timeout_for("SLOW") == 5
+
+
+class TestClientRetry:
+    """Tests AlphaVantageClient with retries and adaptive timeouts."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_client_retries_and_learns_timeout(self, mock_get, api_key):
+        """Tests a transient failure is retried with the adaptive timeout."""
+        mock_get.side_effect = [requests.exceptions.Timeout(),
+                                mock_response({"bestMatches": []})]
+        timeouts = AdaptiveTimeout(initial=2.5)
+        client = AlphaVantageClient(
+            api_key, retry_policy=RetryPolicy(sleep=Mock()),
+            adaptive_timeout=timeouts)
+
+        assert client.get_symbol_search_response("Tesla") == []
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["timeout"] == 2.5
+        assert timeouts.latency_percentile("SYMBOL_SEARCH", 1.0) == 2.5
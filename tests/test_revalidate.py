@@ -0,0 +1,240 @@
+""" tests/test_revalidate.py
+
+    Tests for stale-while-revalidate serving of exchange rates.
+
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache
+from client.revalidate import Revalidator, ServedResponse, freshness
+from client.store import PersistentStore
+from tests.helpers import mock_response
+
+
+def _rate(rate, refreshed="2024-01-02 10:00:00"):
+    return {"Realtime Currency Exchange Rate": {
+        "1. From_Currency Code": "USD",
+        "3. To_Currency Code": "EUR",
+        "5. Exchange Rate": rate,
+        "6. Last Refreshed": refreshed,
+        "7. Time Zone": "UTC",
+    }}
+
+
+def _client(clock, **kwargs):
+    cache = ResponseCache(ttls={"CURRENCY_EXCHANGE_RATE": 60}, clock=clock)
+    return AlphaVantageClient("KEY", cache=cache, max_staleness=300,
+                              **kwargs)
+
+
+class TestStaleWhileRevalidate:
+    """Tests serving expired entries while they are refreshed."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_fresh_entry_not_flagged(self, mock_get, clock):
+        """Tests a cache hit within the TTL is served as fresh."""
+        mock_get.return_value = mock_response(_rate("0.9"))
+        client = _client(clock)
+
+        first = client.get_currency_exchange_rate_response("USD", "EUR")
+        clock.now = 30
+        second = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert isinstance(second, ServedResponse)
+        assert not first.stale and not second.stale
+        assert second["5. Exchange Rate"] == "0.9"
+        assert mock_get.call_count == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_expired_entry_served_stale_and_refreshed(self, mock_get, clock):
+        """Tests an expired entry is returned at once, flagged, while the
+        refresh runs in the background.
+        """
+        mock_get.return_value = mock_response(_rate("0.9"))
+        client = _client(clock)
+        client.get_currency_exchange_rate_response("USD", "EUR")
+
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return mock_response(_rate("0.95"))
+
+        mock_get.side_effect = slow_get
+        clock.now = 120
+        stale = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert stale.stale
+        assert stale["5. Exchange Rate"] == "0.9"
+        # Further calls do not queue a second refresh of the same key.
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        assert client._revalidator.pending == 1
+
+        release.set()
+        client.close()
+        assert client._revalidator.refreshes == 1
+        fresh = client.get_currency_exchange_rate_response("USD", "EUR")
+        assert not fresh.stale
+        assert fresh["5. Exchange Rate"] == "0.95"
+        assert mock_get.call_count == 2
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_concurrent_stale_reads_refresh_once(self, mock_get, clock):
+        """Tests threads hitting one stale entry together share a single
+        revalidator and queue a single refresh.
+        """
+        mock_get.return_value = mock_response(_rate("0.9"))
+        client = _client(clock)
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        revalidator = client._revalidator
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return mock_response(_rate("0.95"))
+
+        mock_get.side_effect = slow_get
+        clock.now = 120
+        barrier = threading.Barrier(8)
+
+        def read():
+            barrier.wait(5)
+            client.get_currency_exchange_rate_response("USD", "EUR")
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        release.set()
+        client.close()
+
+        assert client._revalidator is revalidator
+        assert revalidator.refreshes == 1
+        assert mock_get.call_count == 2
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_refresh_bypasses_store(self, mock_get, tmp_path, clock):
+        """Tests the background refresh calls the API even when the store
+        still holds the response.
+        """
+        mock_get.return_value = mock_response(_rate("0.9"))
+        with PersistentStore(
+                str(tmp_path / "responses.bin"),
+                max_ages={"CURRENCY_EXCHANGE_RATE": 3600}) as store:
+            client = _client(clock, store=store)
+            client.get_currency_exchange_rate_response("USD", "EUR")
+
+            mock_get.return_value = mock_response(_rate("0.95"))
+            clock.now = 120
+            client.get_currency_exchange_rate_response("USD", "EUR")
+            client.close()
+
+            fresh = client.get_currency_exchange_rate_response("USD", "EUR")
+            assert fresh["5. Exchange Rate"] == "0.95"
+            assert mock_get.call_count == 2
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_too_stale_entry_blocks(self, mock_get, clock):
+        """Tests entries past max_staleness are fetched synchronously."""
+        mock_get.side_effect = [mock_response(_rate("0.9")),
+                                mock_response(_rate("0.95"))]
+        client = _client(clock)
+        client.get_currency_exchange_rate_response("USD", "EUR")
+
+        clock.now = 60 + 301
+        result = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert not result.stale
+        assert result["5. Exchange Rate"] == "0.95"
+        assert client._revalidator.pending == 0
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_failed_refresh_keeps_stale_entry(self, mock_get, clock):
+        """Tests a failing background refresh is counted and the stale
+        entry is still served.
+        """
+        mock_get.side_effect = [mock_response(_rate("0.9")),
+                                mock_response({"Error Message": "Invalid."})]
+        client = _client(clock)
+        client.get_currency_exchange_rate_response("USD", "EUR")
+
+        clock.now = 120
+        client.get_currency_exchange_rate_response("USD", "EUR")
+        client._revalidator.close()
+
+        assert client._revalidator.errors == 1
+        result = client.get_currency_exchange_rate_response("USD", "EUR")
+        assert result.stale
+        assert result["5. Exchange Rate"] == "0.9"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_typed_results_flagged(self, mock_get, clock):
+        """Tests ExchangeRate records carry the stale flag, which does not
+        affect equality.
+        """
+        mock_get.return_value = mock_response(_rate("0.9"))
+        client = _client(clock, typed_results=True)
+        fresh = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        clock.now = 120
+        stale = client.get_currency_exchange_rate_response("USD", "EUR")
+        client.close()
+
+        assert not fresh.stale
+        assert stale.stale
+        assert stale == fresh
+        assert stale.age > 0
+
+    def test_requires_stale_capable_cache(self):
+        """Tests max_staleness without a suitable cache is rejected."""
+        with pytest.raises(ValueError):
+            AlphaVantageClient("KEY", max_staleness=300)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_other_endpoints_unaffected(self, mock_get, clock):
+        """Tests endpoints without serve_stale return plain results."""
+        mock_get.return_value = mock_response({"bestMatches": []})
+        client = _client(clock)
+
+        assert client.get_symbol_search_response("Tesla") == []
+
+
+class TestFreshness:
+    """Tests the age computed from "6. Last Refreshed"."""
+
+    def test_age_of_utc_payload(self):
+        """Tests the age is measured from the UTC timestamp."""
+        now = datetime(2024, 1, 2, 10, 5, tzinfo=timezone.utc)
+        refreshed, age = freshness(_rate("0.9")[
+            "Realtime Currency Exchange Rate"], now=now)
+
+        assert refreshed == now - timedelta(minutes=5)
+        assert age == 300
+
+    def test_unknown_time_zone_has_no_age(self):
+        """Tests payloads without a UTC time zone get no age."""
+        refreshed, age = freshness({"6. Last Refreshed": "2024-01-02"})
+
+        assert refreshed == datetime(2024, 1, 2)
+        assert age is None
+        assert freshness({}) == (None, None)
+
+    def test_revalidator_dedupes_keys(self):
+        """Tests one pending refresh per key."""
+        revalidator = Revalidator()
+        release = threading.Event()
+
+        assert revalidator.submit("k", release.wait, 5)
+        assert not revalidator.submit("k", release.wait, 5)
+        release.set()
+        revalidator.close()
+
+        assert revalidator.refreshes == 1
+        assert revalidator.pending == 0
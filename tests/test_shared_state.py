@@ -0,0 +1,158 @@
+""" tests/test_shared_state.py
+
+    Tests for the SQLite-backed cache and rate limiter shared by processes.
+
+"""
+
+import multiprocessing
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import make_cache_key
+from client.shared_state import SharedCache, SharedRateLimiter
+from tests.helpers import mock_response
+
+RATE = {"Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}}
+
+
+def _rate_key(to_currency="EUR"):
+    return make_cache_key({
+        "function": "CURRENCY_EXCHANGE_RATE",
+        "from_currency": "USD",
+        "to_currency": to_currency,
+    })
+
+
+def _grab_tokens(path, results):
+    # The daily bucket barely refills while the workers run.
+    limiter = SharedRateLimiter(path, "KEY", requests_per_minute=1000,
+                                requests_per_day=10)
+    results.put(sum(limiter.try_acquire() for _ in range(10)))
+
+
+@pytest.fixture()
+def path(tmp_path):
+    """Provides the path of a fresh shared-state file."""
+    return str(tmp_path / "shared.sqlite")
+
+
+class TestSharedCache:
+    """Tests TTLs, eviction and sharing between instances."""
+
+    def test_shared_between_instances(self, path):
+        """Tests a value set through one instance is seen by another."""
+        SharedCache(path).set(_rate_key(), RATE)
+
+        assert SharedCache(path).get(_rate_key()) == RATE
+
+    def test_ttl_and_stale(self, path, clock):
+        """Tests expiry by function TTL and stale reads past it."""
+        cache = SharedCache(path, ttls={"CURRENCY_EXCHANGE_RATE": 60},
+                            clock=clock)
+        cache.set(_rate_key(), RATE)
+
+        clock.now += 59
+        assert cache.get(_rate_key()) == RATE
+        clock.now += 11
+        assert cache.get(_rate_key()) is None
+        assert cache.get_stale(_rate_key()) == (RATE, pytest.approx(10))
+        assert cache.stats()["hits"] == 1
+
+    def test_eviction_closest_to_expiry(self, path, clock):
+        """Tests a full cache drops the entry expiring first."""
+        cache = SharedCache(path, max_size=2, clock=clock)
+        cache.set(_rate_key("EUR"), RATE)
+        clock.now += 1
+        cache.set(_rate_key("JPY"), RATE)
+        cache.set(_rate_key("GBP"), RATE)
+
+        assert len(cache) == 2
+        assert cache.get(_rate_key("EUR")) is None
+        assert cache.evictions == 1
+
+    def test_clear(self, path):
+        """Tests clear() empties the shared file."""
+        cache = SharedCache(path)
+        cache.set(_rate_key(), RATE)
+        SharedCache(path).clear()
+
+        assert cache.get(_rate_key()) is None
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_clients_share_responses(self, mock_get, path):
+        """Tests two clients on one file make a single API call."""
+        mock_get.return_value = mock_response(RATE)
+        first = AlphaVantageClient("KEY", cache=SharedCache(path))
+        second = AlphaVantageClient("KEY", cache=SharedCache(path))
+
+        first.get_currency_exchange_rate_response("USD", "EUR")
+        result = second.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert result == RATE["Realtime Currency Exchange Rate"]
+        assert mock_get.call_count == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_stale_while_revalidate(self, mock_get, path, clock):
+        """Tests SharedCache supports max_staleness."""
+        mock_get.return_value = mock_response(RATE)
+        client = AlphaVantageClient(
+            "KEY", cache=SharedCache(path, clock=clock), max_staleness=300)
+        client.get_currency_exchange_rate_response("USD", "EUR")
+
+        clock.now += 120
+        result = client.get_currency_exchange_rate_response("USD", "EUR")
+        client.close()
+
+        assert result.stale
+
+
+class TestSharedRateLimiter:
+    """Tests one quota shared by limiters and processes."""
+
+    def test_quota_shared_between_instances(self, path, clock):
+        """Tests two limiters on one name draw from the same buckets."""
+        first = SharedRateLimiter(path, "KEY", requests_per_minute=3,
+                                  requests_per_day=None, clock=clock)
+        second = SharedRateLimiter(path, "KEY", requests_per_minute=3,
+                                   requests_per_day=None, clock=clock)
+        other_key = SharedRateLimiter(path, "OTHER", requests_per_minute=3,
+                                      requests_per_day=None, clock=clock)
+
+        assert first.try_acquire()
+        assert second.try_acquire()
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        assert other_key.try_acquire()
+        assert second.queue_wait == pytest.approx(20)
+
+        clock.now += 20
+        assert second.try_acquire()
+
+    def test_throttle_backoff_shared(self, path, clock):
+        """Tests a throttle seen by one process pauses the others."""
+        first = SharedRateLimiter(path, "KEY", clock=clock)
+        second = SharedRateLimiter(path, "KEY", clock=clock)
+
+        first.on_throttle()
+
+        assert not second.try_acquire()
+        assert second.available == 0
+        assert second.throttled == 1
+        assert second.backoff == first.base_backoff
+
+    def test_quota_shared_between_processes(self, path):
+        """Tests worker processes together get exactly one quota."""
+        SharedRateLimiter(path, "KEY")  # Creates the schema up front.
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [context.Process(target=_grab_tokens, args=(path, results))
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        granted = sum(results.get(timeout=60) for _ in workers)
+        for worker in workers:
+            worker.join(60)
+
+        assert granted == 10
@@ -0,0 +1,124 @@
+""" tests/test_single_flight.py
+
+    Tests for request coalescing of identical in-flight calls.
+
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.single_flight import SingleFlight
+from tests.helpers import mock_response
+
+
+def _gated(result, release, started=None, error=None):
+    """Returns a function that blocks until `release` is set."""
+    def fn():
+        if started is not None:
+            started.set()
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+    return fn
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Tests followers receive the leader's result."""
+        flight = SingleFlight()
+        release, started = threading.Event(), threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "rate"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(flight.do, "key", fn)
+            started.wait(5)
+            followers = [executor.submit(flight.do, "key", fn)
+                         for _ in range(4)]
+            while flight.coalesced < 4:
+                time.sleep(0.001)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["rate"] * 5
+        assert calls == [1]
+        assert flight.coalesced == 4
+
+    def test_exception_is_shared(self):
+        """Tests followers receive the leader's exception."""
+        flight = SingleFlight()
+        release, started = threading.Event(), threading.Event()
+        error = ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(
+                flight.do, "key", _gated(None, release, started, error))
+            started.wait(5)
+            follower = executor.submit(flight.do, "key", lambda: "unused")
+            while flight.coalesced < 1:
+                time.sleep(0.001)
+            release.set()
+
+            for future in (leader, follower):
+                with pytest.raises(ValueError, match="boom"):
+                    future.result()
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Tests a finished call does not answer later calls."""
+        flight = SingleFlight()
+
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 2
+        assert flight.coalesced == 0
+
+
+class TestClientCoalescing:
+    """Tests AlphaVantageClient request coalescing."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_identical_requests_share_http_call(self, mock_get, api_key):
+        """Tests concurrent identical lookups issue one HTTP call."""
+        release, started = threading.Event(), threading.Event()
+        response = mock_response({
+            "Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}})
+
+        def side_effect(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return response
+        mock_get.side_effect = side_effect
+        client = AlphaVantageClient(api_key)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(
+                client.get_currency_exchange_rate_response, "USD", "EUR")]
+            started.wait(5)
+            futures += [executor.submit(
+                client.get_currency_exchange_rate_response, "USD", "EUR")
+                for _ in range(7)]
+            while client.coalesced_requests < 7:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        mock_get.assert_called_once()
+        assert results == [{"5. Exchange Rate": "0.9"}] * 8
+
+    def test_coalescing_can_be_disabled(self, api_key):
+        """Tests the counter stays at zero when coalescing is off."""
+        client = AlphaVantageClient(api_key, coalesce_requests=False)
+
+        assert client.coalesced_requests == 0
@@ -0,0 +1,120 @@
+""" tests/test_stand_in_server.py
+
+    End-to-end tests of AlphaVantageClient against the local stand-in server
+    over real HTTP, and of the load benchmark built on it.
+
+"""
+
+import pytest
+
+from benchmarks import bench_load
+from benchmarks.stand_in_server import StandInServer
+from client.alpha_vantage_client import AlphaVantageClient
+from client.exceptions import InvalidApiKeyError, ThrottleError
+from client.retry import RetryPolicy
+
+
+@pytest.fixture()
+def server():
+    """Provides a running stand-in server."""
+    with StandInServer(full_bars=300) as stand_in:
+        yield stand_in
+
+
+class TestStandInServer:
+    """Tests every function and injected failure over HTTP."""
+
+    def test_exchange_rate(self, server):
+        """Tests any pair is quoted, deterministically."""
+        with AlphaVantageClient("demo", base_url=server.url) as client:
+            first = client.get_currency_exchange_rate_response("USD", "JPY")
+            second = client.get_currency_exchange_rate_response("USD", "JPY")
+
+        assert first["3. To_Currency Code"] == "JPY"
+        assert float(first["5. Exchange Rate"]) > 0
+        assert first == second
+
+    def test_symbol_search(self, server):
+        """Tests the canned search response."""
+        with AlphaVantageClient("demo", base_url=server.url) as client:
+            matches = client.get_symbol_search_response("Tesla")
+
+        assert matches[0]["1. symbol"] == "TSLA"
+
+    def test_daily_series_sizes_and_csv(self, server):
+        """Tests compact and full series, and CSV matching JSON."""
+        with AlphaVantageClient("demo", base_url=server.url) as client:
+            compact = client.get_time_series_daily_response("IBM")
+            full = client.get_time_series_daily_response("IBM", "full")
+            fx = client.get_fx_daily_response("EUR", "USD")
+            csv_bars = list(client.iter_time_series_daily(
+                "IBM", datatype="csv"))
+
+        assert len(compact) == 100
+        assert len(full) == 300
+        assert list(full)[:100] == list(compact)
+        assert "5. volume" not in next(iter(fx.values()))
+        assert [bar.to_dict() for bar in csv_bars] == list(full.values())
+
+    def test_error_message_for_invalid_call(self, server):
+        """Tests a missing parameter gets an "Error Message"."""
+        with AlphaVantageClient("demo", base_url=server.url) as client:
+            with pytest.raises(ValueError, match="Invalid API call"):
+                client._send_request({"function": "SYMBOL_SEARCH",
+                                      "apikey": "demo"})
+
+    def test_invalid_key(self):
+        """Tests keys outside api_keys are rejected."""
+        with StandInServer(api_keys=["GOOD"]) as server:
+            with AlphaVantageClient("BAD", base_url=server.url) as client:
+                with pytest.raises(InvalidApiKeyError):
+                    client.get_symbol_search_response("Tesla")
+
+    def test_rate_limit(self, clock):
+        """Tests calls over the per-minute limit get an "Information"
+        throttle note until the window moves on.
+        """
+        with StandInServer(requests_per_minute=2, clock=clock) as server:
+            with AlphaVantageClient("demo", base_url=server.url) as client:
+                client.get_symbol_search_response("A")
+                client.get_symbol_search_response("B")
+                with pytest.raises(ThrottleError):
+                    client.get_symbol_search_response("C")
+                clock.now = 60
+                client.get_symbol_search_response("C")
+
+        assert server.stats["rate_limited"] == 1
+
+    def test_server_errors_retried(self):
+        """Tests injected 503s are retried by the retry policy."""
+        with StandInServer(error_rate=0.3, seed=1) as server:
+            with AlphaVantageClient(
+                    "demo", base_url=server.url,
+                    retry_policy=RetryPolicy(max_attempts=10, base_delay=0,
+                                             max_delay=0)) as client:
+                for index in range(5):
+                    client.get_currency_exchange_rate_response(
+                        "USD", f"X{index}")
+
+        assert server.stats["server_error"] > 0
+        assert server.stats["ok"] == 5
+
+    def test_latency_injected(self):
+        """Tests the configured latency is added to every response."""
+        with StandInServer(latency=0.05) as server:
+            results = bench_load.run(server.url, calls=4, workers=2)
+
+        assert set(results) == {"single", "batch", "concurrent"}
+        for summary in results.values():
+            assert summary["calls"] == 4
+            assert summary["p50"] >= 50
+            assert summary["p99"] >= summary["p95"] >= summary["p50"]
+
+    def test_nearest_rank_percentile(self):
+        """Tests percentiles pick the nearest rank, not one above it."""
+        latencies = list(range(1, 101))
+
+        assert bench_load.percentile(latencies, 0.50) == 50
+        assert bench_load.percentile(latencies, 0.99) == 99
+        assert bench_load.percentile(latencies, 1.0) == 100
+        assert bench_load.percentile([7], 0.5) == 7
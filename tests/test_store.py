@@ -0,0 +1,142 @@
+""" tests/test_store.py
+
+    Tests for the persistent on-disk response store.
+
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.cache import ResponseCache, make_cache_key
+from client.store import PersistentStore
+from tests.helpers import mock_response
+
+
+def _key(from_currency="USD"):
+    return make_cache_key({"function": "CURRENCY_EXCHANGE_RATE",
+                           "from_currency": from_currency,
+                           "to_currency": "EUR"})
+
+
+@pytest.fixture()
+def store_path(tmp_path):
+    return str(tmp_path / "responses.store")
+
+
+class TestPersistentStore:
+    """Tests for reads, restarts, ageing, compaction and size caps."""
+
+    def test_survives_reopen(self, store_path):
+        """Tests records written before a restart are served after it."""
+        with PersistentStore(store_path) as store:
+            store.put(_key(), {"rate": "0.9"})
+            store.put(_key(), {"rate": "0.8"})
+
+        with PersistentStore(store_path) as store:
+            assert store.get(_key())[0] == {"rate": "0.8"}
+            assert store.get(_key("GBP")) is None
+
+    def test_max_age(self, store_path, clock):
+        """Tests responses older than the function's max age are ignored."""
+        with PersistentStore(store_path, clock=clock,
+                             max_ages={"CURRENCY_EXCHANGE_RATE": 30}) as store:
+            store.put(_key(), {"rate": "0.9"})
+            clock.now += 31
+
+            assert store.get(_key()) is None
+            assert store.get(_key(), max_age=60) == ({"rate": "0.9"}, 0.0)
+
+    def test_get_returns_write_time(self, store_path, clock):
+        """Tests get() returns the write time of the stored record."""
+        with PersistentStore(store_path, clock=clock) as store:
+            clock.now = 100.0
+            store.put(_key(), {"rate": "0.9"})
+            clock.now += 10
+
+            assert store.get(_key()) == ({"rate": "0.9"}, 100.0)
+            assert store.age(store.get(_key())[1]) == 10
+
+    def test_compact_keeps_latest(self, store_path, tmp_path):
+        """Tests compaction drops superseded records."""
+        with PersistentStore(store_path) as store:
+            for rate in range(50):
+                store.put(_key(), {"rate": rate})
+            before = (tmp_path / "responses.store").stat().st_size
+            store.compact()
+            after = (tmp_path / "responses.store").stat().st_size
+
+            assert after < before / 10
+            assert store.get(_key())[0] == {"rate": 49}
+
+    def test_size_cap_drops_oldest(self, store_path, tmp_path, clock):
+        """Tests the file stays under max_bytes, keeping recent records."""
+        with PersistentStore(store_path, max_bytes=2000,
+                             clock=clock) as store:
+            for index in range(100):
+                clock.now += 1
+                store.put(_key(f"C{index:02d}"), {"rate": "x" * 20})
+
+            assert (tmp_path / "responses.store").stat().st_size <= 2000
+            assert store.get(_key("C99"))[0] == {"rate": "x" * 20}
+            assert store.get(_key("C00")) is None
+
+    def test_truncated_tail_is_discarded(self, store_path):
+        """Tests a partially written last record is dropped on open."""
+        with PersistentStore(store_path) as store:
+            store.put(_key("USD"), {"rate": 1})
+            store.put(_key("GBP"), {"rate": 2})
+        with open(store_path, "r+b") as raw:
+            raw.truncate(raw.seek(0, 2) - 3)
+
+        with PersistentStore(store_path) as store:
+            assert len(store) == 1
+            assert store.get(_key("USD"))[0] == {"rate": 1}
+            store.put(_key("GBP"), {"rate": 3})
+            assert store.get(_key("GBP"))[0] == {"rate": 3}
+
+
+class TestClientStore:
+    """Tests AlphaVantageClient with a PersistentStore."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_restarted_client_serves_from_store(self, mock_get, api_key,
+                                                store_path):
+        """Tests a new client reuses responses stored by a previous one."""
+        mock_get.return_value = mock_response({
+            "Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}})
+
+        with PersistentStore(store_path) as store:
+            client = AlphaVantageClient(api_key, store=store)
+            client.get_currency_exchange_rate_response("USD", "EUR")
+        with PersistentStore(store_path) as store:
+            restarted = AlphaVantageClient(api_key, store=store)
+            result = restarted.get_currency_exchange_rate_response(
+                "USD", "EUR")
+
+        mock_get.assert_called_once()
+        assert result == {"5. Exchange Rate": "0.9"}
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_store_hit_cached_for_remaining_lifetime(self, mock_get, api_key,
+                                                     store_path, clock):
+        """Tests a stored response is cached only until it would expire."""
+        mock_get.return_value = mock_response({
+            "Realtime Currency Exchange Rate": {"5. Exchange Rate": "0.9"}})
+        ttls = {"CURRENCY_EXCHANGE_RATE": 60}
+        with PersistentStore(store_path, clock=clock, max_ages=ttls) as store:
+            store.put(_key(), {"Realtime Currency Exchange Rate": {
+                "5. Exchange Rate": "0.8"}})
+            clock.now += 50
+            client = AlphaVantageClient(
+                api_key, store=store,
+                cache=ResponseCache(ttls=ttls, clock=clock))
+
+            first = client.get_currency_exchange_rate_response("USD", "EUR")
+            clock.now += 11
+            second = client.get_currency_exchange_rate_response("USD", "EUR")
+
+        assert first == {"5. Exchange Rate": "0.8"}
+        assert second == {"5. Exchange Rate": "0.9"}
+        mock_get.assert_called_once()
@@ -0,0 +1,247 @@
+""" tests/test_streaming.py
+
+    Tests for the daily time series endpoints and their streaming parsers.
+
+"""
+
+import json
+from datetime import date
+from unittest.mock import patch, MagicMock, Mock
+
+import pytest
+import requests
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.exceptions import ThrottleError
+from client.instrumentation import Instrumentation, PrometheusHook
+from client.models import Bar
+from client.rate_limit import RateLimiter
+from client.retry import AdaptiveTimeout, RetryPolicy
+from client.streaming import iter_csv_bars, iter_json_bars
+from tests.helpers import mock_response
+
+SERIES = {
+    "Meta Data": {"1. Information": "Daily Prices", "2. Symbol": "IBM"},
+    "Time Series (Daily)": {
+        "2025-05-16": {"1. open": "266.0000", "2. high": "266.9000",
+                       "3. low": "264.1000", "4. close": "266.7600",
+                       "5. volume": "3813100"},
+        "2025-05-15": {"1. open": "258.0000", "2. high": "265.0000",
+                       "3. low": "257.5000", "4. close": "264.5000",
+                       "5. volume": "4101000"},
+        "2025-05-14": {"1. open": "257.0000", "2. high": "259.2200",
+                       "3. low": "255.0100", "4. close": "258.3800",
+                       "5. volume": "2887000"},
+    },
+}
+BODY = json.dumps(SERIES, indent=4).encode()
+CSV_BODY = [
+    b"timestamp,open,high,low,close,volume",
+    b"2025-05-16,266.0000,266.9000,264.1000,266.7600,3813100",
+    b"2025-05-15,258.0000,265.0000,257.5000,264.5000,4101000",
+]
+FIRST = Bar(date(2025, 5, 16), 266.0, 266.9, 264.1, 266.76, 3813100.0)
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def streamed_response(chunks=(), lines=()):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter(chunks)
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+class TestIterJsonBars:
+    """Tests the incremental JSON parser."""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, len(BODY)])
+    def test_bars_for_any_chunking(self, size):
+        """Tests chunk boundaries anywhere give the same bars."""
+        bars = list(iter_json_bars(chunked(BODY, size), "Time Series (Daily)"))
+
+        assert [bar.date for bar in bars] == [
+            date(2025, 5, 16), date(2025, 5, 15), date(2025, 5, 14)]
+        assert bars[0] == FIRST
+
+    def test_multibyte_character_split_across_chunks(self):
+        """Tests UTF-8 sequences split between chunks are decoded."""
+        data = dict(SERIES, **{"Meta Data": {"2. Symbol": "Zürich €"}})
+        body = json.dumps(data, ensure_ascii=False).encode()
+
+        bars = list(iter_json_bars(chunked(body, 3), "Time Series (Daily)"))
+
+        assert len(bars) == 3
+
+    def test_error_message_is_checked(self):
+        """Tests a body without the series goes through the check."""
+        body = json.dumps({"Error Message": "Invalid API call."}).encode()
+
+        with pytest.raises(ValueError, match="Invalid API call"):
+            list(iter_json_bars([body], "Time Series (Daily)",
+                                AlphaVantageClient._check_response_data))
+
+    def test_truncated_body_raises(self):
+        """Tests a body cut off inside the series is an error, after the
+        complete bars were yielded."""
+        bars = []
+        with pytest.raises(ValueError, match="Truncated"):
+            for bar in iter_json_bars([BODY[:len(BODY) // 2]],
+                                      "Time Series (Daily)"):
+                bars.append(bar)
+
+        assert bars[0] == FIRST
+
+    def test_unexpected_structure(self):
+        """Tests a valid body without the series key."""
+        with pytest.raises(ValueError, match="Unexpected response structure"):
+            list(iter_json_bars([b'{"foo": 1}'], "Time Series (Daily)",
+                                function="TIME_SERIES_DAILY"))
+
+
+class TestIterCsvBars:
+    """Tests the CSV parser."""
+
+    def test_bars(self):
+        """Tests rows become bars, FX rows without volume."""
+        bars = list(iter_csv_bars(CSV_BODY))
+        fx_bars = list(iter_csv_bars(
+            ["timestamp,open,high,low,close", "2025-05-16,1.1,1.2,1.0,1.15"]))
+
+        assert bars[0] == FIRST
+        assert fx_bars == [Bar(date(2025, 5, 16), 1.1, 1.2, 1.0, 1.15)]
+
+    def test_json_error_body(self):
+        """Tests the API's JSON error answer to a CSV request."""
+        lines = [b"{", b'    "Information": "Our standard API rate limit is '
+                 b'25 requests per day."', b"}"]
+
+        with pytest.raises(ThrottleError):
+            list(iter_csv_bars(lines, AlphaVantageClient._check_response_data))
+
+    def test_malformed_row(self):
+        """Tests a short row raises ValueError."""
+        with pytest.raises(ValueError, match="Malformed"):
+            list(iter_csv_bars(CSV_BODY[:1] + [b"2025-05-16,1.0"]))
+
+
+class TestTimeSeriesEndpoints:
+    """Tests the FX_DAILY and TIME_SERIES_DAILY methods of the client."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_get_time_series_daily(self, mock_get, api_key):
+        """Tests the non-streaming method and its typed result."""
+        mock_get.return_value = mock_response(SERIES)
+        client = AlphaVantageClient(api_key, typed_results=True)
+
+        bars = client.get_time_series_daily_response("IBM")
+
+        assert bars[0] == FIRST
+        mock_get.assert_called_once_with(
+            AlphaVantageClient.BASE_URL,
+            params={"function": "TIME_SERIES_DAILY", "symbol": "IBM",
+                    "outputsize": "compact", "apikey": api_key},
+            timeout=AlphaVantageClient.SHORT_TIMEOUT)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_iter_fx_daily_json(self, mock_get, client, api_key):
+        """Tests FX bars stream from the JSON body with stream=True."""
+        body = json.dumps({"Time Series FX (Daily)": {
+            "2025-05-16": {"1. open": "1.1180", "2. high": "1.1230",
+                           "3. low": "1.1130", "4. close": "1.1166"}}})
+        mock_get.return_value = streamed_response(chunked(body.encode(), 16))
+
+        bars = list(client.iter_fx_daily("EUR", "USD"))
+
+        assert bars == [Bar(date(2025, 5, 16), 1.118, 1.123, 1.113, 1.1166)]
+        mock_get.assert_called_once_with(
+            AlphaVantageClient.BASE_URL,
+            params={"function": "FX_DAILY", "from_symbol": "EUR",
+                    "to_symbol": "USD", "outputsize": "full",
+                    "apikey": api_key},
+            timeout=AlphaVantageClient.SHORT_TIMEOUT, stream=True)
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_iter_time_series_daily_csv(self, mock_get, client):
+        """Tests datatype=csv is requested and parsed line by line."""
+        mock_get.return_value = streamed_response(lines=CSV_BODY)
+
+        bars = list(client.iter_time_series_daily("IBM", datatype="csv"))
+
+        assert len(bars) == 2
+        assert mock_get.call_args.kwargs["params"]["datatype"] == "csv"
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_stream_closes_response_when_abandoned(self, mock_get, client):
+        """Tests stopping early releases the connection."""
+        response = streamed_response(chunked(BODY, 32))
+        mock_get.return_value = response
+
+        bars = client.iter_time_series_daily("IBM")
+        next(bars)
+        bars.close()
+
+        response.__exit__.assert_called_once()
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_stream_throttle_backs_off_limiter(self, mock_get, api_key):
+        """Tests a throttle answer to a stream reaches the rate limiter."""
+        body = json.dumps({"Information": "Thank you for using Alpha "
+                           "Vantage! Our standard API rate limit is 25 "
+                           "requests per day."}).encode()
+        mock_get.return_value = streamed_response([body])
+        limiter = RateLimiter(requests_per_minute=100, requests_per_day=1000)
+        client = AlphaVantageClient(api_key, rate_limiter=limiter)
+
+        with pytest.raises(ThrottleError):
+            list(client.iter_time_series_daily("IBM"))
+
+        assert limiter.throttled == 1
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_stream_retries_and_adaptive_timeout(self, mock_get, api_key):
+        """Tests a failed connect is retried with the adaptive timeout."""
+        mock_get.side_effect = [requests.exceptions.ConnectionError(),
+                                streamed_response(chunked(BODY, 64))]
+        client = AlphaVantageClient(
+            api_key, retry_policy=RetryPolicy(sleep=Mock()),
+            adaptive_timeout=AdaptiveTimeout(initial=2.5))
+
+        bars = list(client.iter_time_series_daily("IBM"))
+
+        assert len(bars) == 3
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["timeout"] == 2.5
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_stream_instrumentation(self, mock_get, api_key):
+        """Tests streamed calls report counters and phases."""
+        throttled = json.dumps({"Information": "API rate limit."}).encode()
+        mock_get.side_effect = [streamed_response(chunked(BODY, 64)),
+                                streamed_response([throttled])]
+        hook = PrometheusHook()
+        client = AlphaVantageClient(api_key,
+                                    instrumentation=Instrumentation(hook))
+
+        list(client.iter_time_series_daily("IBM"))
+        with pytest.raises(ThrottleError):
+            list(client.iter_time_series_daily("IBM"))
+
+        phases = {phase for _, phase in hook.histograms}
+        assert phases == {"connect_wait", "download", "total"}
+        assert hook.counters == {
+            ("TIME_SERIES_DAILY", "requests"): 2,
+            ("TIME_SERIES_DAILY", "throttles"): 1,
+        }
+
+    def test_invalid_parameters(self, client):
+        """Tests bad outputsize/datatype fail before any request."""
+        with pytest.raises(ValueError, match="outputsize"):
+            client.iter_time_series_daily("IBM", outputsize="huge")
+        with pytest.raises(ValueError, match="outputsize"):
+            client.get_fx_daily_response("EUR", "USD", outputsize="xml")
+        with pytest.raises(ValueError, match="datatype"):
+            client.iter_fx_daily("EUR", "USD", datatype="xml")
@@ -0,0 +1,119 @@
+""" tests/test_symbol_index.py
+
+    Tests for the local SymbolIndex and its use by AlphaVantageClient.
+
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from client.alpha_vantage_client import AlphaVantageClient
+from client.symbol_index import SymbolIndex
+from tests.helpers import mock_response
+
+
+MATCHES = [
+    {"1. symbol": "TSLA", "2. name": "Tesla Inc", "3. type": "Equity",
+     "4. region": "United States", "5. marketOpen": "09:30",
+     "6. marketClose": "16:00", "7. timezone": "UTC-04",
+     "8. currency": "USD", "9. matchScore": "1.0000"},
+    {"1. symbol": "TSCO.LON", "2. name": "Tesco PLC", "3. type": "Equity",
+     "4. region": "United Kingdom", "5. marketOpen": "08:00",
+     "6. marketClose": "16:30", "7. timezone": "Europe/London",
+     "8. currency": "GBX", "9. matchScore": "0.5714"},
+]
+
+LISTING = (
+    "symbol,name,exchange,assetType,ipoDate,delistingDate,status\n"
+    "AAPL,Apple Inc,NASDAQ,Stock,1980-12-12,null,Active\n"
+    "AAPLX,Old Apple Fund,NYSE,ETF,1990-01-01,2000-01-01,Delisted\n"
+    "MSFT,Microsoft Corporation,NASDAQ,Stock,1986-03-13,null,Active\n"
+)
+
+
+@pytest.fixture()
+def index():
+    symbol_index = SymbolIndex()
+    symbol_index.add_matches(MATCHES)
+    return symbol_index
+
+
+class TestSymbolIndex:
+    """Tests for prefix, name and fuzzy search."""
+
+    def test_exact_symbol(self, index):
+        """Tests an exact symbol scores 1.0 and ranks first."""
+        matches = index.search("tsla")
+
+        assert matches[0]["1. symbol"] == "TSLA"
+        assert matches[0]["9. matchScore"] == "1.0000"
+
+    def test_name_word_prefix(self, index):
+        """Tests prefixes of name words match, ranked by closeness."""
+        matches = index.search("Tes")
+
+        assert [m["1. symbol"] for m in matches] == ["TSCO.LON", "TSLA"]
+        assert matches[0]["9. matchScore"] == "0.6000"
+
+    def test_fuzzy_match(self, index):
+        """Tests misspellings fall back to similarity scores."""
+        matches = index.search("Telsa")
+
+        assert matches[0]["1. symbol"] == "TSLA"
+        assert 0 < float(matches[0]["9. matchScore"]) < 1
+
+    def test_lookup_requires_confidence(self, index):
+        """Tests weak matches are not answered locally."""
+        assert index.lookup("Tesla")[0]["1. symbol"] == "TSLA"
+        assert index.lookup("T") is None
+        assert index.lookup("") is None
+
+    def test_add_after_search_updates_terms(self, index):
+        """Tests entries added or replaced after a search are found without
+        rebuilding the term list.
+        """
+        index.search("Tes")
+        index.add(dict(MATCHES[0], **{"2. name": "Tesla Motors"}))
+        index.add(dict(MATCHES[1], **{"1. symbol": "TSLQ",
+                                      "2. name": "Tesla Short ETF"}))
+
+        assert not index._dirty
+        assert index.search("Tesla M")[0]["2. name"] == "Tesla Motors"
+        assert ("TESLA INC", "TSLA") not in index._terms
+        assert {m["1. symbol"] for m in index.search("TSL")} == {"TSLA",
+                                                                 "TSLQ"}
+        assert index._terms == sorted(index._terms)
+
+    def test_listing_csv_and_round_trip(self, tmp_path):
+        """Tests bulk loading and save/load of the on-disk index."""
+        listing = tmp_path / "listing_status.csv"
+        listing.write_text(LISTING, encoding="utf-8")
+        index = SymbolIndex()
+
+        assert index.load_listing_csv(listing) == 2
+        index.save(tmp_path / "symbols.tsv")
+        loaded = SymbolIndex.load(tmp_path / "symbols.tsv")
+
+        assert len(loaded) == 2
+        assert "AAPLX" not in loaded
+        assert loaded.search("micro")[0]["2. name"] == "Microsoft Corporation"
+        assert loaded.search("AAPL")[0]["8. currency"] == "USD"
+
+
+class TestClientSymbolIndex:
+    """Tests AlphaVantageClient with a SymbolIndex."""
+
+    @patch('client.alpha_vantage_client.requests.Session.get')
+    def test_api_results_fill_index(self, mock_get, api_key):
+        """Tests an index miss calls the API and a repeat is local."""
+        mock_get.return_value = mock_response({"bestMatches": MATCHES})
+        index = SymbolIndex()
+        client = AlphaVantageClient(api_key, symbol_index=index)
+
+        assert client.get_symbol_search_response("Tesla") == MATCHES
+        local = client.get_symbol_search_response("TSLA")
+
+        mock_get.assert_called_once()
+        assert local[0]["1. symbol"] == "TSLA"
+        assert len(index) == 2
@@ -16,7 +16,7 @@ from client.alpha_vantage_client import AlphaVantageClient
 class TestSymbolSearchEndpoint:
     """Test class for the AlphaVantageClient symbol search endpoint."""
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_success_multiple_matches(self, mock_get, client):
         """Test successful symbol search returning multiple matches."""
         mock_response = Mock()
@@ -61,13 +61,14 @@ class TestSymbolSearchEndpoint:
                 "keywords": keywords,
                 "apikey": client.api_key,
             },
+            timeout=AlphaVantageClient.SHORT_TIMEOUT,
         )
         assert result == expected_api_response_data["bestMatches"]
         assert len(result) == 2
         assert result[0]["1. symbol"] == "TSLA"
         assert result[1]["2. name"] == "Tesco PLC"
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_success_single_match(self, mock_get, client):
         """Test successful symbol search returning a single match."""
         mock_response = Mock()
@@ -101,12 +102,13 @@ class TestSymbolSearchEndpoint:
                 "keywords": keywords,
                 "apikey": client.api_key,
             },
+            timeout=AlphaVantageClient.SHORT_TIMEOUT,
         )
         assert result == expected_api_response_data["bestMatches"]
         assert len(result) == 1
         assert result[0]["1. symbol"] == "SMTK"
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_no_matches(self, mock_get, client):
         """Test symbol search successfully returning no matches."""
         mock_response = Mock()
@@ -127,10 +129,11 @@ class TestSymbolSearchEndpoint:
                 "keywords": keywords,
                 "apikey": client.api_key,
             },
+            timeout=AlphaVantageClient.SHORT_TIMEOUT,
         )
         assert result == []
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_api_error_message(self, mock_get, client):
         """Test handling of an API error message (e.g., invalid API key).
 
@@ -152,7 +155,7 @@ class TestSymbolSearchEndpoint:
         ):
             client.get_symbol_search_response("AnyKeyword")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_information_message_as_error(self,
                                                             mock_get, client):
         """Test handling of an "Information" message that indicates a problem.
@@ -183,7 +186,7 @@ class TestSymbolSearchEndpoint:
         ):
             client.get_symbol_search_response("AnyKeyword")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_network_error(self, mock_get, client):
         """Test handling of network errors."""
         mock_get.side_effect = requests.exceptions.ConnectionError(
@@ -196,7 +199,7 @@ class TestSymbolSearchEndpoint:
         ):
             client.get_symbol_search_response("AnyKeyword")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_malformed_json_response(self, mock_get, client):
         """Test handling of a response that is not valid JSON."""
         mock_response = Mock()
@@ -214,7 +217,7 @@ class TestSymbolSearchEndpoint:
         ):
             client.get_symbol_search_response("AnyKeyword")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_unexpected_success_structure(self,
                                                             mock_get, client):
         """Test handling of a 200 OK response with missing 'bestMatches' key."""
@@ -231,7 +234,7 @@ class TestSymbolSearchEndpoint:
         ):
             client.get_symbol_search_response("AnyKeyword")
 
-    @patch('client.alpha_vantage_client.requests.get')
+    @patch('client.alpha_vantage_client.requests.Session.get')
     def test_get_symbol_search_empty_keywords(self, mock_get, client):
         """Test behavior when empty keywords are provided."""
         mock_response = Mock()
@@ -251,5 +254,6 @@ class TestSymbolSearchEndpoint:
                 "keywords": keywords,
                 "apikey": client.api_key,
             },
+            timeout=AlphaVantageClient.SHORT_TIMEOUT,
         )
         assert result == []